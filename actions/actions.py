@@ -1,16 +1,24 @@
-import json
-import random
+import time as clock
+BOOT_STARTED = clock.perf_counter()  # module import ≈ action server boot, see action_readiness_probe
+
+import os
 import logging
 import inspect
-from typing import Any, Text, Dict, List
+import threading
+import numpy as np
+from typing import Any, Text, Dict, List, Tuple
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.forms import FormValidationAction 
 from rasa_sdk.types import DomainDict
 from rasa_sdk.events import SlotSet, FollowupAction, EventType, AllSlotsReset
-from sklearn.metrics.pairwise import cosine_similarity
-from datetime import datetime
-from joblib import load
+from datetime import date, datetime
+from .catalog import PROJECT_DIR, CatalogLoader
+from .bookings import BookingStore
+from .scorers import create_scorer, preference_text
+from .result_cache import RankingCache, preference_key
+from .restaurant_index import parse_slot_minutes
+from .timing import timed, report_timings
 
 
 # logging fallbacks
@@ -19,7 +27,9 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
 # 2) Create  file handler which logs WARNING (and above) to 'fallbacks.log'
-fh = logging.FileHandler("logs/fallbacks.log")
+#    (relative to the project, opened on the first fallback only)
+os.makedirs(os.path.join(PROJECT_DIR, "logs"), exist_ok=True)
+fh = logging.FileHandler(os.path.join(PROJECT_DIR, "logs", "fallbacks.log"), delay=True)
 fh.setLevel(logging.WARNING)
 
 # 3) Add a formatter to get timestamps, levels &d messages
@@ -30,6 +40,10 @@ fh.setFormatter(formatter)
 # 4) Attach handler to your logger
 logger.addHandler(fh)
 
+# boot timings go to the action server's normal log
+boot_logger = logging.getLogger("actions.boot")
+boot_logger.setLevel(logging.INFO)
+
 
 def check_turns(fn):
     async def wrapper(self, slot_value, dispatcher, tracker, domain):
@@ -167,6 +181,11 @@ class ValidateRestaurantForm(FormValidationAction):
         
         # check if there are any invalid cuisine preferences
         invalid = [v for v in (v.lower() for v in slot_value) if v not in self.cuisine_db()]
+        if invalid and get_scorer().name == "embedding":
+            # the embedding scorer matches words like "sushi" or "ramen" by meaning:
+            # they rank restaurants (cuisine_wishes) but don't filter them
+            known = [v for v in slot_value if v.lower() in self.cuisine_db()]
+            return {"cuisine_preferences": known, "cuisine_wishes": invalid}
         if invalid:
             dispatcher.utter_message(
                 f"Sorry, I don’t offer {', '.join(invalid)}. I only support: {', '.join(self.cuisine_db())}."
@@ -250,7 +269,7 @@ class ValidateRestaurantForm(FormValidationAction):
         except Exception:
             pass
 
-        # 2) Fallback: look for a Duckling number entity
+        # 2) Fallback: look for a number entity (LocalTimeNumberExtractor)
         for ent in tracker.latest_message.get("entities", []):
             if ent.get("entity") == "number":
                 try:
@@ -265,28 +284,114 @@ class ValidateRestaurantForm(FormValidationAction):
         return {"num_of_guests": None}
 
 
+# Heavy resources shared by the suggest & confirm actions. They are loaded on
+# first use (not at import), so the action server starts listening right away;
+# the lock makes sure concurrent first requests load them only once.
+_resources_lock = threading.Lock()
+_catalog_loader = None
+_booking_store  = None
+_scorer         = None
+boot_stats: Dict[Text, Any] = {"import_s": None, "resources_s": None, "first_request_s": None}
+# LRU cache: (cuisine set, diet set) -> ranked matching rows of the current index version
+ranking_cache = RankingCache(int(os.environ.get("ALICE_RANKING_CACHE_SIZE", "128")))
+
+
+def get_catalog_loader() -> CatalogLoader:
+    global _catalog_loader
+    if _catalog_loader is None:
+        with _resources_lock:
+            if _catalog_loader is None:
+                start = clock.perf_counter()
+                _catalog_loader = CatalogLoader()
+                boot_stats["resources_s"] = round(clock.perf_counter() - start, 4)
+    return _catalog_loader
+
+
+def get_booking_store() -> BookingStore:
+    global _booking_store
+    if _booking_store is None:
+        with _resources_lock:
+            if _booking_store is None:
+                default_path = os.path.join(PROJECT_DIR, "data", "bookings.db")
+                _booking_store = BookingStore(os.environ.get("ALICE_BOOKINGS_DB", default_path))
+    return _booking_store
+
+
+def get_scorer():
+    global _scorer
+    if _scorer is None:
+        with _resources_lock:
+            if _scorer is None:
+                _scorer = create_scorer()
+    return _scorer
+
+
+def mark_request_served() -> None:
+    """Remember when the first recommendation/booking request was answered."""
+    if boot_stats["first_request_s"] is None:
+        boot_stats["first_request_s"] = round(clock.perf_counter() - BOOT_STARTED, 4)
+        boot_logger.info(f"First request served {boot_stats['first_request_s']}s after boot")
+
+
+def split_date_and_time(dt_obj: datetime):
+    """datetime -> ('2025-04-25', '7:00 PM'), the format used by the availability data"""
+    day  = dt_obj.date().isoformat() # save date
+    time = dt_obj.time().strftime("%I:%M %p").lstrip("0") # save time in 12-hour format
+    return day, time
+
+
+def join_names(names: List[Text]) -> Text:
+    """['A', 'B', 'C'] -> 'A, B or C'"""
+    if len(names) <= 1:
+        return "".join(names)
+    return f"{', '.join(names[:-1])} or {names[-1]}"
+
+
 class ActionSuggestRestaurant(Action):
     """
       Suggests a restaurant by TF–IDF similarity on "cuisine + diet".
 
-    - Uses content-based filtering (TF–IDF encoding) and cosine similarity for ranking
-    - Filters strictly by dietary preference 
+    - Uses content-based filtering (TF–IDF encoding) and cosine similarity for ranking;
+      a sentence-embedding scorer can be selected instead (see scorers.py), which also
+      ranks by cuisine words outside the form's list ("sushi", slot cuisine_wishes)
+    - Filters strictly by cuisine, dietary preference and availability (RestaurantIndex masks)
+    - Returns the best-scoring restaurant that passes every filter, not just the global best,
+      and offers the next best ones as alternatives in the same reply (saves form turns)
+    - If the requested time is taken, offers the closest free slots (same day and
+      neighbouring days, binary search over the sorted slot times) in one reply
     - If no restaurant meets diet and availability, returns an apology
     """
 
+    # number of restaurants offered per reply (best match + alternatives)
+    TOP_K = 3
+    # nearest free slots offered when the requested time is taken (same day +/- SLOT_DAYS)
+    SLOT_LIMIT = 3
+    SLOT_DAYS  = 1
+
     def __init__(self):
         # ----------------------------------------------------------------
-        # One-time initialization: load restaurant data and TF–IDF resources
+        # Restaurant data and TF–IDF resources are loaded on first use, once
+        # per process (see the catalog/bookings/scorer properties); new index
+        # versions published by preprocess.py are hot-swapped in
         # ----------------------------------------------------------------
-        with open("data/restaurants.json") as f:
-            self.restaurants = json.load(f)
-        self.vectorizer      = load("vectorizer/vectorizer.joblib")
-        self.restaurant_vecs = load("vectorizer/restaurant_vectors.joblib")
-        # Simple in-memory cache to store TF–IDF vectors for preference strings
-        self.tf_cache = {}
+        self.rankings = ranking_cache
         # Synonyms interpreted as no dietary restriction (i.e., omnivore)
         self.omnivore_synonyms = {"omnivore", "none", "no preference", "anything", "no dietary restrictions"}
 
+    @property
+    def catalog(self) -> CatalogLoader:
+        return get_catalog_loader()
+
+    @property
+    def bookings(self) -> BookingStore:
+        # Live capacity calendar (seats already booked are not offered again)
+        return get_booking_store()
+
+    @property
+    def scorer(self):
+        # Ranking backend: TF–IDF or sentence embeddings (ALICE_SCORER)
+        return get_scorer()
+
     def name(self) -> Text:
         return "action_suggest_restaurant"
 
@@ -296,16 +401,29 @@ class ActionSuggestRestaurant(Action):
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
+        started = clock.perf_counter()
+        timings: Dict[Text, float] = {}
+        events = self._suggest(dispatcher, tracker, timings)
+        report_timings(dispatcher, tracker, self.name(), timings, clock.perf_counter() - started)
+        mark_request_served()
+        return events
+
+    def _suggest(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+                 timings: Dict[Text, float]) -> List[Dict[Text, Any]]:
         # ------------------------------
         # 1) Extract all relevant slots
         # ------------------------------
         past      = tracker.get_slot("past_bookings")
         past_name = tracker.get_slot("past_restaurant_name")
         cuisine   = [c.lower() for c in (tracker.get_slot("cuisine_preferences") or [])]
+        wishes    = [w.lower() for w in (tracker.get_slot("cuisine_wishes") or [])]
         raw_diet  = [d.lower() for d in (tracker.get_slot("dietary_preferences") or [])]
         dt    = tracker.get_slot("date_and_time")
         guests    = int(tracker.get_slot("num_of_guests") or 1)
     
+        # one consistent catalog version for the whole request
+        catalog = self.catalog.current()
+
         # normalize diet -> empty means “no restriction”
         diet = [d for d in raw_diet if d not in self.omnivore_synonyms]
 
@@ -326,73 +444,119 @@ class ActionSuggestRestaurant(Action):
                 FollowupAction("restaurant_form") # re‑activate the form so it asks for date_and_time again
             ]
         
-        day  = dt_obj.date().isoformat() # save date
-        time = dt_obj.time().strftime("%I:%M %p").lstrip("0") # save time in 12-hour format
+        day, time = split_date_and_time(dt_obj)
 
         # ------------------------------
         # 3) Rebooking path
         # ------------------------------
         if past and past_name:
-            restaurant = next(
-                (r for r in self.restaurants if r["name"].lower() == past_name.lower()),
-                None
-            )
+            row = catalog.index.row_for_name(past_name)
+            restaurant = catalog.index.restaurant(row) if row is not None else None
             # Check if named restaurant is available
-            if restaurant and self._is_available(restaurant, guests, day, time):
+            if restaurant and self._is_available(catalog, row, guests, day, time):
                 dispatcher.utter_message(
                     f"Great news! {restaurant['name']} is available for {guests} guests on {day} at {time}. Would you like to book it?"
                 )
+                return [SlotSet("suggested_restaurant", restaurant["name"])]
+            if not restaurant:
+                dispatcher.utter_message(f"Sorry, I couldn’t find a restaurant called {past_name}.")
                 return []
-            # Suggest an alternative from the same cuisine
-            alt_cuisine = restaurant.get("cuisine", "").lower() if restaurant else None
-            candidates = [
-                r for r in self.restaurants
-                if r.get("cuisine", "").lower() == alt_cuisine
-                   and self._is_available(r, guests, day, time)
-            ]
-            if candidates:
-                alt = random.choice(candidates)
-                dispatcher.utter_message(
-                    f"I'm sorry, {restaurant['name']} is not available at that time. How about {alt['name']} instead?"
-                )
-                return [SlotSet("past_restaurant_name", alt["name"])] # overwrite with new restaurant
-            else:
-                dispatcher.utter_message(
-                    f"Sorry, no {alt_cuisine.title()} restaurants are available at that time."
+            # Suggest the closest alternatives from the same cuisine
+            # (ranked by similarity to the requested restaurant)
+            alt_cuisine = restaurant.get("cuisine", "").lower()
+            with timed(timings, "availability"):
+                candidates = catalog.index.cuisine_mask([alt_cuisine]) & self.bookings.available_mask(catalog.index, guests, day, time)
+            with timed(timings, "ranking"):
+                alt_scores = self.scorer.similar(catalog, row)
+                top = catalog.index.top_k(alt_scores, candidates, k=self.TOP_K)
+            # closest free times of the requested restaurant itself
+            with timed(timings, "alternatives"):
+                slots = self._nearest_slots(catalog, row, guests, day, time)
+            if top:
+                alts = [catalog.index.restaurant(r) for r in top]
+                message = f"I'm sorry, {restaurant['name']} is not available at that time. How about {alts[0]['name']} instead?"
+                if len(alts) > 1:
+                    message += f" {join_names([a['name'] for a in alts[1:]])} would also be free then."
+                if slots:
+                    message += f" {restaurant['name']} itself has a table {self._describe_slots(slots, day)}."
+                dispatcher.utter_message(message)
+                return [
+                    SlotSet("past_restaurant_name", alts[0]["name"]), # overwrite with new restaurant
+                    SlotSet("suggested_restaurant", alts[0]["name"]),
+                ]
+            if slots:
+                # offer the closest slot directly, so "yes" books it
+                message = (
+                    f"I'm sorry, {restaurant['name']} is not available at that time, "
+                    f"but it has a table {self._describe_slots(slots[:1], day)}."
                 )
+                if len(slots) > 1:
+                    message += f" It would also be free {self._describe_slots(slots[1:], day)}."
+                dispatcher.utter_message(message + f" Shall I book it {self._describe_slots(slots[:1], day)}?")
+                return [
+                    SlotSet("suggested_restaurant", restaurant["name"]),
+                    SlotSet("date_and_time", self._slot_datetime(dt_obj, slots[0])),
+                ]
+            dispatcher.utter_message(
+                f"Sorry, no {alt_cuisine.title()} restaurants are available at that time."
+            )
             return []
 
         # --------------------------------------------------
         # 4) New booking: content-based filtering
         # --------------------------------------------------
-        # Build a preference string for TF–IDF vectorization, e.g. "italian vegetarian"
-        pref_text = " ".join(cuisine + diet).strip()
-        query_vec = self.vectorizer.transform([pref_text]) # TF–IDF vector 
-
-        # compute similarity score across all restaurants
-        sim_score      = cosine_similarity(query_vec, self.restaurant_vecs).flatten()
-        best_id  = int(sim_score.argmax()) # position of the highest score 
-        best_r = self.restaurants[best_id] # top scoring restaurant
-
-        # check if the diet is still correct
-        if diet:
-            r_options = [o.lower() for o in best_r.get("dietary_options", [])]
-            if any(d not in r_options for d in diet):
-                 # pick the first cuisine the user asked for (or fallback to “selected”)
-                user_cuisine = cuisine[0].title() if cuisine else "suitable"
+        # every restaurant passing the cuisine & diet filters, best score first
+        # (cached per preference combination, scored only on a miss)
+        key = preference_key(cuisine, diet, wishes)
+        with timed(timings, "ranking"):
+            ranked = self.rankings.get(catalog, key, lambda: self._rank(catalog, *key))
+        if ranked.size == 0:
+            # pick the first cuisine the user asked for (or fallback to “selected”)
+            user_cuisine = cuisine[0].title() if cuisine else "suitable"
+            if diet:
                 dispatcher.utter_message(
                     f"Sorry, I couldn’t find any {user_cuisine} restaurant that offers {', '.join(diet)} food."
                 )
-                return []
+            else:
+                dispatcher.utter_message(f"Sorry, I couldn’t find any {user_cuisine} restaurant.")
+            return []
 
-        # finally check availability
-        if self._is_available(best_r, guests, day, time):
-            dispatcher.utter_message(
+        # best k matches that are also available (not just the global best score)
+        with timed(timings, "availability"):
+            available = self.bookings.available_mask(catalog.index, guests, day, time)
+        top = [int(r) for r in ranked[available[ranked]][:self.TOP_K]]
+        if top:
+            best_r = catalog.index.restaurant(top[0])
+            message = (
                 f"Based on your preferences, I recommend {best_r['name']}. It offers {best_r['cuisine']} cuisine "
-                f"and can seat {guests} on {day} at {time}. Shall I book it?"
+                f"and can seat {guests} on {day} at {time}."
             )
-            return []
+            if len(top) > 1:
+                alt_names = [catalog.index.names[r] for r in top[1:]]
+                message += f" If you prefer, {join_names(alt_names)} would also work."
+            dispatcher.utter_message(message + " Shall I book it?")
+            return [SlotSet("suggested_restaurant", best_r["name"])]
         else:
+            # nothing free at the requested time: offer the closest free slots of the
+            # best matches instead of making the user guess another time
+            best_r = catalog.index.restaurant(int(ranked[0]))
+            with timed(timings, "alternatives"):
+                offers = [(int(r), self._nearest_slots(catalog, int(r), guests, day, time)) for r in ranked[:self.TOP_K]]
+            offers = [(r, slots) for r, slots in offers if slots]
+            if offers:
+                row, slots = offers[0]
+                name = catalog.index.names[row]
+                message = f"I'm sorry, {best_r['name']} meets your preferences but isn’t available then."
+                message += f" {name} has a free table {self._describe_slots(slots[:1], day)}."
+                if len(slots) > 1:
+                    message += f" It would also be free {self._describe_slots(slots[1:], day)}."
+                for other, other_slots in offers[1:]:
+                    message += f" {catalog.index.names[other]} has a table {self._describe_slots(other_slots[:1], day)}."
+                dispatcher.utter_message(message + f" Shall I book {name} {self._describe_slots(slots[:1], day)}?")
+                return [
+                    SlotSet("suggested_restaurant", name),
+                    SlotSet("date_and_time", self._slot_datetime(dt_obj, slots[0])),
+                ]
             dispatcher.utter_message(
                 f"I'm sorry, {best_r['name']} meets your preferences but isn’t available then. "
                  "Please provide another date and time slot."
@@ -402,17 +566,173 @@ class ActionSuggestRestaurant(Action):
                   SlotSet("date_and_time", None),
                   #FollowupAction("restaurant_form")
             ]
+    def _rank(self, catalog, cuisines: frozenset, diets: frozenset, wishes: frozenset = frozenset()) -> np.ndarray:
+        """Rows matching the requested cuisine(s) and every diet, by similarity to the preferences."""
+        # hard constraints as row masks: requested cuisine(s) and every diet
+        matches = catalog.index.diet_mask(diets)
+        if cuisines:
+            matches &= catalog.index.cuisine_mask(cuisines)
+        if not matches.any():
+            return np.zeros(0, dtype=np.int32)
+        # Build a preference string for the scorer, e.g. "italian vegetarian"
+        pref_text = preference_text(cuisines, diets, wishes)
+        # compute similarity score across all restaurants
+        sim_score = self.scorer.scores(catalog, pref_text)
+        return catalog.index.rank(sim_score, matches)
+
     #helper function
-    def _is_available(self, restaurant: Dict, guests: int, day: str, time: str) -> bool:
+    def _is_available(self, catalog, row: int, guests: int, day: str, time: str) -> bool:
         """
         Determine if a given restaurant has availability for the specified day, time, and guest count.
+        (slot-code lookup in the index + remaining seats from the booking store)
         """
-        try:
-            weekday = datetime.fromisoformat(day).strftime("%A")
-            slots   = restaurant.get("availability", {}).get(weekday, [])
-            return (time in slots) and (restaurant.get("max_guests", 0) >= guests)
-        except Exception:
-            return False
+        return self.bookings.is_available(catalog.index, row, guests, day, time)
+
+    def _nearest_slots(self, catalog, row: int, guests: int, day: str, time: str) -> List[Tuple[str, str]]:
+        """Closest free (date, time) slots of one restaurant around the requested time."""
+        return self.bookings.nearest_slots(
+            catalog.index, row, guests, day, time,
+            days=self.SLOT_DAYS, limit=self.SLOT_LIMIT, not_before=date.today(),
+        )
+
+    @staticmethod
+    def _describe_slots(slots: List[Tuple[str, str]], day: str) -> str:
+        """[('2025-04-25', '8:00 PM'), ('2025-04-26', '7:00 PM')] -> 'at 8:00 PM or on 2025-04-26 at 7:00 PM'"""
+        return join_names([f"at {t}" if d == day else f"on {d} at {t}" for d, t in slots])
+
+    @staticmethod
+    def _slot_datetime(dt_obj: datetime, slot: Tuple[str, str]) -> str:
+        """Requested datetime moved to an offered slot (keeps the timezone), as ISO string."""
+        slot_day = date.fromisoformat(slot[0])
+        minutes  = parse_slot_minutes(slot[1])
+        return dt_obj.replace(
+            year=slot_day.year, month=slot_day.month, day=slot_day.day,
+            hour=minutes // 60, minute=minutes % 60, second=0, microsecond=0,
+        ).isoformat()
+
+
+class ActionConfirmBooking(Action):
+    """
+    Reserves the suggested restaurant after the user said yes.
+    The reservation is atomic, so if someone else took the last seats in the
+    meantime, the user is told instead of double-booking the slot.
+    """
+
+    @property
+    def catalog(self) -> CatalogLoader:
+        return get_catalog_loader()
+
+    @property
+    def bookings(self) -> BookingStore:
+        return get_booking_store()
+
+    def name(self) -> Text:
+        return "action_confirm_booking"
+
+    async def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: Dict[Text, Any],
+    ) -> List[Dict[Text, Any]]:
+        started = clock.perf_counter()
+        timings: Dict[Text, float] = {}
+        events = self._confirm(dispatcher, tracker, timings)
+        report_timings(dispatcher, tracker, self.name(), timings, clock.perf_counter() - started)
+        return events
+
+    def _confirm(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+                 timings: Dict[Text, float]) -> List[Dict[Text, Any]]:
+        name   = tracker.get_slot("suggested_restaurant") or tracker.get_slot("past_restaurant_name")
+        dt     = tracker.get_slot("date_and_time")
+        guests = int(tracker.get_slot("num_of_guests") or 1)
+
+        catalog = self.catalog.current()
+        row = catalog.index.row_for_name(name) if name else None
+        if row is None or not dt:
+            dispatcher.utter_message("Sorry, I lost track of which restaurant to book. Let's start over.")
+            return []
+
+        day, time = split_date_and_time(datetime.fromisoformat(dt))
+        with timed(timings, "reserve"):
+            booking_id = self.bookings.reserve(catalog.index, row, guests, day, time, sender=tracker.sender_id)
+        if booking_id is None:
+            dispatcher.utter_message(
+                f"I'm sorry, {catalog.index.names[row]} was just booked up for {day} at {time}. "
+                "Let's start a new booking."
+            )
+            return []
+
+        dispatcher.utter_message(response="utter_submit")
+        mark_request_served()
+        # kept across action_clear_slots, so "cancel" can give the seats back
+        return [SlotSet("booking_id", booking_id)]
+
+
+class ActionCancelBooking(Action):
+    """
+    "Cancel" outside the form: releases the booking confirmed in this
+    conversation (slot booking_id), so its seats are free again. Without a
+    booking it only acknowledges, like utter_booking_canceled did before.
+    """
+
+    def name(self) -> Text:
+        return "action_cancel_booking"
+
+    async def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: Dict[Text, Any],
+    ) -> List[Dict[Text, Any]]:
+        booking_id = tracker.get_slot("booking_id")
+        if booking_id is None:
+            dispatcher.utter_message(response="utter_booking_canceled")
+            return []
+        if get_booking_store().release(int(booking_id)):
+            dispatcher.utter_message(response="utter_booking_released")
+        else:
+            # already released (e.g. "cancel" twice)
+            dispatcher.utter_message(response="utter_booking_canceled")
+        return [SlotSet("booking_id", None)]
+
+
+class ActionReadinessProbe(Action):
+    """
+    Readiness probe for the action server (not part of the dialogue).
+
+    rasa_sdk's /health answers as soon as the server listens; this action
+    additionally loads the catalog, booking store and scorer (if that hasn't
+    happened yet) and runs one ranking, then reports boot timings:
+
+        curl -s localhost:5055/webhook -H 'Content-Type: application/json' \
+             -d '{"next_action": "action_readiness_probe", "tracker": {"sender_id": "probe"}}'
+    """
+
+    def name(self) -> Text:
+        return "action_readiness_probe"
+
+    async def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: Dict[Text, Any],
+    ) -> List[Dict[Text, Any]]:
+        start = clock.perf_counter()
+        catalog = get_catalog_loader().current()
+        get_booking_store()
+        get_scorer().scores(catalog, "restaurant")  # warm-up (lazy imports, caches)
+        dispatcher.utter_message(json_message={
+            "ready": True,
+            "catalog_version": catalog.version,
+            "restaurants": len(catalog.index),
+            "scorer": get_scorer().name,
+            "warmup_s": round(clock.perf_counter() - start, 4),
+            "uptime_s": round(clock.perf_counter() - BOOT_STARTED, 4),
+            "boot": dict(boot_stats),
+            "ranking_cache": ranking_cache.stats(),
+        })
+        return []
 
 
 class ActionClearSlots(Action):
@@ -421,7 +741,9 @@ class ActionClearSlots(Action):
 
     async def run(self, dispatcher, tracker, domain):
         dispatcher.utter_message(response="utter_clear_slots")
-        return [AllSlotsReset()]
+        # a confirmed booking can still be cancelled after the slots are cleared
+        booking_id = tracker.get_slot("booking_id")
+        return [AllSlotsReset()] + ([SlotSet("booking_id", booking_id)] if booking_id is not None else [])
 
 # logging fallbacks
 class ActionLogAndFallback(Action):
@@ -443,4 +765,7 @@ class ActionLogAndFallback(Action):
         dispatcher.utter_message(response="utter_default")
 
         # 3)  reset slots to start fresh
-        return [AllSlotsReset()]
\ No newline at end of file
+        return [AllSlotsReset()]
+
+
+boot_stats["import_s"] = round(clock.perf_counter() - BOOT_STARTED, 4)
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Text, Tuple
+
+import numpy as np
+
+from .restaurant_index import RestaurantIndex, format_slot_minutes, parse_slot_minutes
+
+
+class BookingStore:
+    """
+    Real-time availability & bookings on top of the static availability template.
+
+    Capacity calendar: (restaurant, date, slot) -> remaining seats. The static
+    template in the restaurant index says which weekday slots exist; a slot
+    starts with `max_guests` seats and a row is only written to SQLite once the
+    slot is booked for the first time, so the table stays small.
+
+    Slots are stored as minutes since midnight (stable across index versions);
+    the index maps them to integer slot codes for O(1) lookups.
+
+    reserve() and release() run in a single IMMEDIATE transaction each, so two
+    users can never book the last seats of a slot twice. SQLite runs in WAL
+    mode, so availability reads never wait for a booking being written.
+    """
+
+    def __init__(self, path: Text = "data/bookings.db"):
+        self.path   = path
+        self._local = threading.local()  # one connection per thread
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS capacity (
+                    restaurant TEXT    NOT NULL,
+                    date       TEXT    NOT NULL,
+                    slot       INTEGER NOT NULL,
+                    remaining  INTEGER NOT NULL,
+                    PRIMARY KEY (date, slot, restaurant)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS bookings (
+                    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                    restaurant TEXT    NOT NULL,
+                    date       TEXT    NOT NULL,
+                    slot       INTEGER NOT NULL,
+                    guests     INTEGER NOT NULL,
+                    sender     TEXT,
+                    created_at TEXT    NOT NULL,
+                    released   INTEGER NOT NULL DEFAULT 0
+                );
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Availability
+    # ------------------------------------------------------------------
+    def remaining_seats(self, date: Text, minutes: int) -> Dict[Text, int]:
+        """Remaining seats of every restaurant already booked at (date, slot)."""
+        rows = self._connect().execute(
+            "SELECT restaurant, remaining FROM capacity WHERE date = ? AND slot = ?",
+            (date, minutes),
+        )
+        return {name: remaining for name, remaining in rows}
+
+    def available_mask(self, index: RestaurantIndex, guests: int, day: Text, time: Text) -> np.ndarray:
+        """Template availability minus seats that are already booked."""
+        mask = index.available_mask(guests, day, time)
+        minutes = parse_slot_minutes(time)
+        if minutes is None or not mask.any():
+            return mask
+        for name, remaining in self.remaining_seats(day, minutes).items():
+            if remaining < guests:
+                row = index.row_for_name(name)
+                if row is not None:
+                    mask[row] = False
+        return mask
+
+    def is_available(self, index: RestaurantIndex, row: int, guests: int, day: Text, time: Text) -> bool:
+        if not index.is_available(row, guests, day, time):
+            return False
+        remaining = self._connect().execute(
+            "SELECT remaining FROM capacity WHERE date = ? AND slot = ? AND restaurant = ?",
+            (day, parse_slot_minutes(time), index.names[row]),
+        ).fetchone()
+        return remaining is None or remaining[0] >= guests
+
+    def nearest_slots(self, index: RestaurantIndex, row: int, guests: int, day: Text, time: Text,
+                      days: int = 1, limit: int = 3, not_before: Optional[date] = None) -> List[Tuple[Text, Text]]:
+        """
+        Up to `limit` free (date, '7:00 PM') slots of one restaurant, closest
+        to the requested time first, on the same day and `days` around it.
+        """
+        try:
+            base = datetime.fromisoformat(day).date()
+        except ValueError:
+            return []
+        # slots of this restaurant that can't seat the party any more (one query)
+        full = set(self._connect().execute(
+            "SELECT date, slot FROM capacity WHERE restaurant = ? AND date BETWEEN ? AND ? AND remaining < ?",
+            (index.names[row], (base - timedelta(days=days)).isoformat(),
+             (base + timedelta(days=days)).isoformat(), guests),
+        ))
+        found = []
+        for slot_day, minutes in index.nearest_slots(row, guests, day, time, days=days, not_before=not_before):
+            if (slot_day, minutes) in full:
+                continue
+            found.append((slot_day, format_slot_minutes(minutes)))
+            if len(found) == limit:
+                break
+        return found
+
+    # ------------------------------------------------------------------
+    # Reserve / release
+    # ------------------------------------------------------------------
+    def reserve(self, index: RestaurantIndex, row: int, guests: int, day: Text, time: Text,
+                sender: Optional[Text] = None) -> Optional[int]:
+        """Atomically take `guests` seats; returns the booking id or None if the slot is full."""
+        if not index.is_available(row, guests, day, time):
+            return None
+        name, minutes = index.names[row], parse_slot_minutes(time)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO capacity (restaurant, date, slot, remaining) VALUES (?, ?, ?, ?)",
+                (name, day, minutes, int(index.max_guests[row])),
+            )
+            updated = conn.execute(
+                "UPDATE capacity SET remaining = remaining - ? "
+                "WHERE date = ? AND slot = ? AND restaurant = ? AND remaining >= ?",
+                (guests, day, minutes, name, guests),
+            ).rowcount
+            if not updated:
+                conn.execute("ROLLBACK")
+                return None
+            booking_id = conn.execute(
+                "INSERT INTO bookings (restaurant, date, slot, guests, sender, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, day, minutes, guests, sender, datetime.now().isoformat(timespec="seconds")),
+            ).lastrowid
+            conn.execute("COMMIT")
+            return booking_id
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, booking_id: int) -> bool:
+        """Give the seats of a booking back; returns False if it was unknown or already released."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            booking = conn.execute(
+                "SELECT restaurant, date, slot, guests FROM bookings WHERE id = ? AND released = 0",
+                (booking_id,),
+            ).fetchone()
+            if booking is None:
+                conn.execute("ROLLBACK")
+                return False
+            name, day, minutes, guests = booking
+            conn.execute(
+                "UPDATE capacity SET remaining = remaining + ? WHERE date = ? AND slot = ? AND restaurant = ?",
+                (guests, day, minutes, name),
+            )
+            conn.execute("UPDATE bookings SET released = 1 WHERE id = ?", (booking_id,))
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
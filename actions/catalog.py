@@ -0,0 +1,210 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Text
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .restaurant_index import RestaurantIndex
+
+logger = logging.getLogger(__name__)
+
+# repository root: paths don't depend on the directory the server is started from
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# TF–IDF vectors are stored as raw CSR arrays next to the columnar index
+CSR_ARRAYS = ["vec_data", "vec_indices", "vec_indptr"]
+
+
+def load_joblib(path: Text):
+    # joblib (and scikit-learn, for unpickling) is only needed for old builds
+    from joblib import load
+    return load(path)
+
+
+class QueryVectorizer:
+    """
+    TF–IDF transform of query strings without scikit-learn.
+
+    Reproduces TfidfVectorizer's defaults (lower-casing, tokens of 2+ word
+    characters, raw counts x smoothed IDF, L2 norm) from the vocabulary and
+    IDF weights saved by preprocess.py.
+    """
+
+    TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+    def __init__(self, terms: List[Text], idf: np.ndarray):
+        self.vocabulary: Dict[Text, int] = {t: i for i, t in enumerate(terms)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer) -> "QueryVectorizer":
+        vocabulary = getattr(vectorizer, "vocabulary_", None) or vectorizer.vocabulary  # fitted or fixed vocabulary
+        terms = sorted(vocabulary, key=vocabulary.get)
+        try:
+            idf = vectorizer.idf_
+        except AttributeError:
+            # pickled by scikit-learn < 1.2, which kept the IDF as a diagonal matrix
+            idf = vectorizer._tfidf._idf_diag.diagonal()
+        return cls(terms, idf)
+
+    def save(self, directory: Text) -> None:
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(os.path.join(directory, "vocabulary.json"), "w") as f:
+            json.dump(terms, f)
+        np.save(os.path.join(directory, "idf.npy"), self.idf)
+
+    @classmethod
+    def open(cls, directory: Text) -> "QueryVectorizer":
+        with open(os.path.join(directory, "vocabulary.json")) as f:
+            terms = json.load(f)
+        return cls(terms, np.load(os.path.join(directory, "idf.npy")))
+
+    def transform(self, texts: List[Text]) -> csr_matrix:
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = Counter(t for t in self.TOKEN_PATTERN.findall(text.lower()) if t in self.vocabulary)
+            cols = np.array(sorted(self.vocabulary[t] for t in counts), dtype=np.int32)
+            values = np.array([counts[t] for t in sorted(counts, key=self.vocabulary.get)],
+                              dtype=np.float64) * self.idf[cols]
+            norm = np.linalg.norm(values)
+            indices.extend(cols)
+            data.extend(values / norm if norm else values)
+            indptr.append(len(indices))
+        return csr_matrix((data, indices, indptr), shape=(len(texts), len(self.idf)))
+
+
+def save_vectors(vectors, directory: Text) -> None:
+    vectors = csr_matrix(vectors, dtype=np.float32)
+    vectors.sort_indices()
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "vec_data.npy"), vectors.data)
+    np.save(os.path.join(directory, "vec_indices.npy"), vectors.indices.astype(np.int32))
+    np.save(os.path.join(directory, "vec_indptr.npy"), vectors.indptr.astype(np.int32))
+    np.save(os.path.join(directory, "vec_shape.npy"), np.array(vectors.shape, dtype=np.int64))
+
+
+def open_vectors(directory: Text) -> csr_matrix:
+    """CSR matrix backed by memory-mapped arrays (no copy, shared pages)."""
+    data, indices, indptr = (
+        np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in CSR_ARRAYS
+    )
+    shape = tuple(int(x) for x in np.load(os.path.join(directory, "vec_shape.npy")))
+    return csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+class Catalog:
+    """One immutable version of the restaurant catalog and its TF–IDF index."""
+
+    def __init__(self, version: Text, index: RestaurantIndex, vectorizer, restaurant_vecs,
+                 directory: Optional[Text] = None):
+        self.version         = version
+        # where this version's files live (scorers cache derived data next to them)
+        self.directory       = directory
+        # Columnar lookups: names, cuisine/diet codes, availability bits, max guests
+        self.index           = index
+        # QueryVectorizer (transform() of preference strings)
+        self.vectorizer      = vectorizer
+        self.restaurant_vecs = restaurant_vecs
+
+    @classmethod
+    def from_version_dir(cls, version: Text, version_dir: Text) -> "Catalog":
+        columns_dir = os.path.join(version_dir, "columns")
+        if os.path.exists(os.path.join(columns_dir, "vocabulary.json")):
+            # memory-mapped columns: no JSON parsing, no unpickling, flat memory per worker
+            return cls(version, RestaurantIndex.open(columns_dir), QueryVectorizer.open(columns_dir),
+                       open_vectors(columns_dir), directory=version_dir)
+
+        vectorizer = QueryVectorizer.from_sklearn(load_joblib(os.path.join(version_dir, "vectorizer.joblib")))
+        if os.path.isdir(columns_dir):
+            return cls(version, RestaurantIndex.open(columns_dir), vectorizer, open_vectors(columns_dir),
+                       directory=version_dir)
+
+        with open(os.path.join(version_dir, "restaurants.json")) as f:
+            restaurants = json.load(f)
+        return cls(
+            version,
+            RestaurantIndex.from_restaurants(restaurants),
+            vectorizer,
+            load_joblib(os.path.join(version_dir, "restaurant_vectors.joblib")),
+            directory=version_dir,
+        )
+
+    @classmethod
+    def from_legacy_files(cls) -> "Catalog":
+        # flat files from before versioned builds (preprocess.py not re-run yet)
+        vectorizer_dir = os.path.join(PROJECT_DIR, "vectorizer")
+        with open(os.path.join(PROJECT_DIR, "data", "restaurants.json")) as f:
+            restaurants = json.load(f)
+        return cls(
+            "legacy",
+            RestaurantIndex.from_restaurants(restaurants),
+            QueryVectorizer.from_sklearn(load_joblib(os.path.join(vectorizer_dir, "vectorizer.joblib"))),
+            load_joblib(os.path.join(vectorizer_dir, "restaurant_vectors.joblib")),
+            directory=vectorizer_dir,
+        )
+
+
+class CatalogLoader:
+    """
+    Hands out the current Catalog and hot-swaps new versions published by
+    preprocess.py (vectorizer/index/CURRENT).
+
+    At most every `check_interval` seconds a request looks at CURRENT; if it
+    changed, the new version is loaded in a background thread while requests
+    keep using the old one, and then swapped in with a single assignment.
+    """
+
+    def __init__(self, index_dir: Text = os.path.join(PROJECT_DIR, "vectorizer", "index"),
+                 check_interval: float = 2.0):
+        self.index_dir      = index_dir
+        self.check_interval = check_interval
+        self._lock          = threading.Lock()
+        self._loading       = False
+        self._last_check    = 0.0
+        self._catalog       = self._load(self._read_current())
+
+    def current(self) -> Catalog:
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            version = self._read_current()
+            if version and version != self._catalog.version:
+                self._reload_in_background(version)
+        return self._catalog
+
+    def _read_current(self) -> Optional[Text]:
+        try:
+            with open(os.path.join(self.index_dir, "CURRENT")) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _load(self, version: Optional[Text]) -> Catalog:
+        if version is None:
+            return Catalog.from_legacy_files()
+        return Catalog.from_version_dir(version, os.path.join(self.index_dir, version))
+
+    def _reload_in_background(self, version: Text) -> None:
+        with self._lock:
+            if self._loading:
+                return
+            self._loading = True
+
+        def reload():
+            try:
+                catalog = self._load(version)
+                self._catalog = catalog  # atomic swap; in-flight requests keep the old one
+                logger.info(f"Restaurant index switched to version {version}")
+            except Exception as e:
+                logger.error(f"Could not load restaurant index {version}: {e}")
+            finally:
+                with self._lock:
+                    self._loading = False
+
+        threading.Thread(target=reload, name="catalog-reload", daemon=True).start()
@@ -0,0 +1,426 @@
+import os
+import json
+import heapq
+import bisect
+import hashlib
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Text, Tuple
+
+import numpy as np
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+@lru_cache(maxsize=1024)
+def parse_slot_minutes(time_text: Text) -> Optional[int]:
+    """'7:30 PM' -> minutes since midnight (1170), or None if unparsable."""
+    try:
+        t = datetime.strptime(time_text.strip().upper(), "%I:%M %p")
+    except (ValueError, AttributeError):
+        return None
+    return t.hour * 60 + t.minute
+
+
+def format_slot_minutes(minutes: int) -> Text:
+    """1170 -> '7:30 PM' (inverse of parse_slot_minutes)."""
+    hour, minute = divmod(int(minutes), 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def name_hash(name: Text) -> int:
+    """Stable 64-bit hash of a lower-cased restaurant name."""
+    digest = hashlib.blake2b(name.lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def code_table(values: Iterable[Text], field: Text) -> List[Text]:
+    """Sorted distinct values of a coded column (codes are int16)."""
+    table = sorted(set(values))
+    if len(table) > np.iinfo(np.int16).max + 1:
+        raise ValueError(f"{field} codes are int16: at most 32768 distinct values, got {len(table)}")
+    return table
+
+
+def diet_code_table(diets: Iterable[Text]) -> List[Text]:
+    """Sorted distinct dietary options (one bit each in diet_bits)."""
+    table = sorted(set(diets))
+    if len(table) > 32:
+        raise ValueError("diet_bits supports at most 32 distinct dietary options")
+    return table
+
+
+class StringTable:
+    """Strings stored as one UTF-8 blob plus an offsets array (memory-mappable)."""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self.offsets = offsets
+        self.blob    = blob
+
+    @classmethod
+    def from_strings(cls, strings: List[Text]) -> "StringTable":
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(e) for e in encoded])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+        return cls(offsets, blob)
+
+    def __getitem__(self, i: int) -> Text:
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class RestaurantIndex:
+    """
+    Precomputed, columnar view of the restaurant catalog.
+
+    Lets the suggest action filter and rank with a few NumPy mask operations
+    instead of scanning dicts in Python:
+    - names:              string table; name_hashes/name_rows give name -> row
+                          lookups by binary search
+    - cuisine_codes:      int codes into cuisine_table
+    - diet_bits:          bit i set = offers diet_table[i]
+    - availability:       (rows x 7 weekdays x slot bytes) packed bits; slots
+                          are the sorted distinct times in slot_minutes
+    - max_guests, rating, location/price codes
+
+    Built in memory with from_restaurants(), written by preprocess.py with
+    save() and opened by the action server with open(), which memory-maps
+    every column so all worker processes share the same pages.
+    """
+
+    COLUMNS = ["name_offsets", "name_blob", "name_hashes", "name_rows", "cuisine_codes",
+               "diet_bits", "location_codes", "price_codes", "rating", "max_guests",
+               "slot_minutes", "availability"]
+
+    def __init__(self, columns: Dict[Text, np.ndarray], tables: Dict[Text, List[Text]]):
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.names          = StringTable(self.name_offsets, self.name_blob)
+        self.cuisine_table  = tables["cuisine"]
+        self.diet_table     = tables["diet"]
+        self.location_table = tables["location"]
+        self.price_table    = tables["price"]
+        self._cuisine_lower = [c.lower() for c in self.cuisine_table]
+        self._diet_lower    = [d.lower() for d in self.diet_table]
+        self.slot_code      = {int(m): code for code, m in enumerate(self.slot_minutes)}
+
+    # ------------------------------------------------------------------
+    # Building & (de)serialization
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_restaurants(cls, restaurants: List[Dict[Text, Any]]) -> "RestaurantIndex":
+        n = len(restaurants)
+
+        def codes(values: List[Text], field: Text):
+            table = code_table(values, field)
+            lookup = {v: i for i, v in enumerate(table)}
+            return np.array([lookup[v] for v in values], dtype=np.int16), table
+
+        cuisine_codes, cuisine_table = codes([r.get("cuisine", "") for r in restaurants], "cuisine")
+        location_codes, location_table = codes([r.get("location", "") for r in restaurants], "location")
+        price_codes, price_table = codes([r.get("price_range", "") for r in restaurants], "price_range")
+
+        diet_table = diet_code_table(d for r in restaurants for d in r.get("dietary_options", []))
+        diet_bit = {d: 1 << i for i, d in enumerate(diet_table)}
+        diet_bits = np.array(
+            [sum(diet_bit[d] for d in set(r.get("dietary_options", []))) for r in restaurants],
+            dtype=np.uint32,
+        )
+
+        names = [r["name"] for r in restaurants]
+        name_table = StringTable.from_strings(names)
+        hashes = np.array([name_hash(name) for name in names], dtype=np.uint64)
+        order = np.argsort(hashes, kind="stable")
+
+        # integer slot codes: position in the sorted list of all distinct times
+        minutes = {
+            parse_slot_minutes(t)
+            for r in restaurants
+            for times in r.get("availability", {}).values()
+            for t in times
+        }
+        slot_minutes = np.array(sorted(m for m in minutes if m is not None), dtype=np.int32)
+        slot_code = {int(m): code for code, m in enumerate(slot_minutes)}
+
+        rows, days, slot_codes = [], [], []
+        for row, r in enumerate(restaurants):
+            for day_name, times in r.get("availability", {}).items():
+                if day_name not in WEEKDAYS:
+                    continue
+                day = WEEKDAYS.index(day_name)
+                for t in times:
+                    m = parse_slot_minutes(t)
+                    if m is not None:
+                        rows.append(row)
+                        days.append(day)
+                        slot_codes.append(slot_code[m])
+        unpacked = np.zeros((n, len(WEEKDAYS), max(len(slot_minutes), 1)), dtype=bool)
+        unpacked[rows, days, slot_codes] = True
+
+        columns = {
+            "name_offsets": name_table.offsets,
+            "name_blob": name_table.blob,
+            "name_hashes": hashes[order],
+            "name_rows": order.astype(np.int32),
+            "cuisine_codes": cuisine_codes,
+            "diet_bits": diet_bits,
+            "location_codes": location_codes,
+            "price_codes": price_codes,
+            "rating": np.array([r.get("rating", 0.0) for r in restaurants], dtype=np.float32),
+            "max_guests": np.array([r.get("max_guests", 0) for r in restaurants], dtype=np.int32),
+            "slot_minutes": slot_minutes,
+            "availability": np.packbits(unpacked, axis=2),
+        }
+        tables = {"cuisine": cuisine_table, "diet": diet_table,
+                  "location": location_table, "price": price_table}
+        return cls(columns, tables)
+
+    def updated(self, restaurants: List[Dict[Text, Any]], changed: Iterable[int]) -> "RestaurantIndex":
+        """
+        Index of `restaurants` that only builds the `changed` rows again.
+
+        Every other row must be the same restaurant as in this index (edited
+        rows in place, new ones appended); those rows are copied column by
+        column and their codes remapped to the new code tables. The result
+        equals from_restaurants(restaurants).
+        """
+        n = len(restaurants)
+        changed = np.unique(np.fromiter(changed, dtype=np.int64))
+        kept = np.setdiff1d(np.arange(n), changed)
+        if kept.size and kept[-1] >= len(self):
+            raise ValueError("rows beyond the old index must be listed as changed")
+        part = RestaurantIndex.from_restaurants([restaurants[row] for row in changed])
+
+        def merged_codes(old_codes, old_table, part_codes, part_table, field):
+            used = [old_table[code] for code in np.unique(old_codes[kept])]
+            table = code_table(used + list(part_table), field)
+            lookup = {v: i for i, v in enumerate(table)}
+            codes = np.empty(n, dtype=np.int16)
+            codes[kept] = np.array([lookup.get(v, 0) for v in old_table], dtype=np.int16)[old_codes[kept]]
+            codes[changed] = np.array([lookup[v] for v in part_table], dtype=np.int16)[part_codes]
+            return codes, table
+
+        cuisine_codes, cuisine_table = merged_codes(self.cuisine_codes, self.cuisine_table,
+                                                    part.cuisine_codes, part.cuisine_table, "cuisine")
+        location_codes, location_table = merged_codes(self.location_codes, self.location_table,
+                                                      part.location_codes, part.location_table, "location")
+        price_codes, price_table = merged_codes(self.price_codes, self.price_table,
+                                                part.price_codes, part.price_table, "price_range")
+
+        # diet bits: move every old/new bit to its position in the merged table
+        kept_bits = np.asarray(self.diet_bits)[kept]
+        used_bits = int(np.bitwise_or.reduce(kept_bits)) if kept.size else 0
+        diet_table = diet_code_table([d for i, d in enumerate(self.diet_table) if used_bits & (1 << i)]
+                                     + part.diet_table)
+        bit_of = {d: i for i, d in enumerate(diet_table)}
+
+        def moved_bits(bits, table):
+            out = np.zeros(len(bits), dtype=np.uint32)
+            for i, d in enumerate(table):
+                if d in bit_of:
+                    out |= ((bits >> np.uint32(i)) & np.uint32(1)) << np.uint32(bit_of[d])
+            return out
+
+        diet_bits = np.empty(n, dtype=np.uint32)
+        diet_bits[kept] = moved_bits(kept_bits, self.diet_table)
+        diet_bits[changed] = moved_bits(part.diet_bits, part.diet_table)
+
+        # availability: unpack, place the slots of both parts on the merged slot axis, repack
+        old_slots = np.unpackbits(np.asarray(self.availability)[kept], axis=2)[:, :, :len(self.slot_minutes)]
+        part_slots = np.unpackbits(part.availability, axis=2)[:, :, :len(part.slot_minutes)]
+        old_used = old_slots.any(axis=(0, 1)) if kept.size else np.zeros(len(self.slot_minutes), dtype=bool)
+        slot_minutes = np.union1d(np.asarray(self.slot_minutes)[old_used], part.slot_minutes).astype(np.int32)
+        unpacked = np.zeros((n, len(WEEKDAYS), max(len(slot_minutes), 1)), dtype=bool)
+        old_positions = np.searchsorted(slot_minutes, np.asarray(self.slot_minutes)[old_used])
+        unpacked[np.ix_(kept, np.arange(len(WEEKDAYS)), old_positions)] = old_slots[:, :, old_used]
+        part_positions = np.searchsorted(slot_minutes, part.slot_minutes)
+        unpacked[np.ix_(changed, np.arange(len(WEEKDAYS)), part_positions)] = part_slots.astype(bool)
+
+        # names: the string table is cheap to rebuild, the hashes are copied
+        name_table = StringTable.from_strings([r["name"] for r in restaurants])
+        old_hashes = np.empty(len(self), dtype=np.uint64)
+        old_hashes[self.name_rows] = self.name_hashes
+        part_hashes = np.empty(len(part), dtype=np.uint64)
+        part_hashes[part.name_rows] = part.name_hashes
+        hashes = np.empty(n, dtype=np.uint64)
+        hashes[kept] = old_hashes[kept]
+        hashes[changed] = part_hashes
+        order = np.argsort(hashes, kind="stable")
+
+        def merged(old_column, part_column):
+            column = np.empty(n, dtype=part_column.dtype)
+            column[kept] = np.asarray(old_column)[kept]
+            column[changed] = part_column
+            return column
+
+        columns = {
+            "name_offsets": name_table.offsets,
+            "name_blob": name_table.blob,
+            "name_hashes": hashes[order],
+            "name_rows": order.astype(np.int32),
+            "cuisine_codes": cuisine_codes,
+            "diet_bits": diet_bits,
+            "location_codes": location_codes,
+            "price_codes": price_codes,
+            "rating": merged(self.rating, part.rating),
+            "max_guests": merged(self.max_guests, part.max_guests),
+            "slot_minutes": slot_minutes,
+            "availability": np.packbits(unpacked, axis=2),
+        }
+        tables = {"cuisine": cuisine_table, "diet": diet_table,
+                  "location": location_table, "price": price_table}
+        return RestaurantIndex(columns, tables)
+
+    def save(self, directory: Text) -> None:
+        os.makedirs(directory, exist_ok=True)
+        for name in self.COLUMNS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "tables.json"), "w") as f:
+            json.dump({"rows": len(self), "cuisine": self.cuisine_table, "diet": self.diet_table,
+                       "location": self.location_table, "price": self.price_table}, f)
+
+    @classmethod
+    def open(cls, directory: Text) -> "RestaurantIndex":
+        """Memory-map a saved index (read-only, pages shared between processes)."""
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in cls.COLUMNS
+        }
+        with open(os.path.join(directory, "tables.json")) as f:
+            tables = json.load(f)
+        return cls(columns, tables)
+
+    def __len__(self) -> int:
+        return len(self.max_guests)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def restaurant(self, row: int) -> Dict[Text, Any]:
+        """Decode one row into the fields used in replies."""
+        bits = int(self.diet_bits[row])
+        return {
+            "name": self.names[row],
+            "cuisine": self.cuisine_table[self.cuisine_codes[row]],
+            "dietary_options": [d for i, d in enumerate(self.diet_table) if bits & (1 << i)],
+            "location": self.location_table[self.location_codes[row]],
+            "price_range": self.price_table[self.price_codes[row]],
+            "rating": float(self.rating[row]),
+            "max_guests": int(self.max_guests[row]),
+        }
+
+    def row_for_name(self, name: Text) -> Optional[int]:
+        if not name:
+            return None
+        h = np.uint64(name_hash(name))
+        i = int(np.searchsorted(self.name_hashes, h))
+        while i < len(self.name_hashes) and self.name_hashes[i] == h:
+            row = int(self.name_rows[i])
+            if self.names[row].lower() == name.lower():
+                return row
+            i += 1
+        return None
+
+    def cuisine_mask(self, cuisines: Iterable[Text]) -> np.ndarray:
+        """Rows offering any of the given cuisines."""
+        codes = [self._cuisine_lower.index(c.lower()) for c in cuisines if c.lower() in self._cuisine_lower]
+        return np.isin(self.cuisine_codes, codes)
+
+    def diet_mask(self, diets: Iterable[Text]) -> np.ndarray:
+        """Rows offering all of the given dietary options."""
+        required = 0
+        for d in diets:
+            if d.lower() not in self._diet_lower:
+                return np.zeros(len(self), dtype=bool)  # nobody offers it
+            required |= 1 << self._diet_lower.index(d.lower())
+        return (self.diet_bits & np.uint32(required)) == required
+
+    def _slot(self, day: Text, time: Text):
+        """(weekday, slot code) for an ISO date and a '7:00 PM' time, or None."""
+        try:
+            weekday = datetime.fromisoformat(day).weekday()
+        except ValueError:
+            return None
+        code = self.slot_code.get(parse_slot_minutes(time))
+        return None if code is None else (weekday, code)
+
+    def _slot_bits(self, weekday: int, code: int, rows=slice(None)) -> np.ndarray:
+        packed = self.availability[rows, weekday, code >> 3]
+        return ((packed >> (7 - (code & 7))) & 1).astype(bool)
+
+    def available_mask(self, guests: int, day: Text, time: Text) -> np.ndarray:
+        """Rows that have the (weekday, time) slot and seat `guests` people."""
+        slot = self._slot(day, time)
+        if slot is None:
+            return np.zeros(len(self), dtype=bool)
+        return self._slot_bits(*slot) & (self.max_guests >= guests)
+
+    def is_available(self, row: int, guests: int, day: Text, time: Text) -> bool:
+        slot = self._slot(day, time)
+        if slot is None:
+            return False
+        return bool(self._slot_bits(*slot, rows=row) and self.max_guests[row] >= guests)
+
+    def open_slot_minutes(self, row: int, weekday: int, guests: int) -> List[int]:
+        """Sorted minutes of the row's slots on a weekday (slot codes are sorted by time)."""
+        if self.max_guests[row] < guests:
+            return []
+        bits = np.unpackbits(self.availability[row, weekday])[:len(self.slot_minutes)].astype(bool)
+        return self.slot_minutes[bits].tolist()
+
+    def nearest_slots(self, row: int, guests: int, day: Text, time: Text, days: int = 1,
+                      not_before: Optional[date] = None) -> Iterator[Tuple[Text, int]]:
+        """
+        Yield (ISO date, minutes) of the row's slots on `day` +/- `days`, closest
+        to the requested date & time first. Each day's slots are binary searched
+        and walked outwards; the days are merged by distance. Neighbouring days
+        before `not_before` are skipped.
+        """
+        target = parse_slot_minutes(time)
+        try:
+            base = datetime.fromisoformat(day).date()
+        except ValueError:
+            return
+        if target is None:
+            return
+
+        def walk(offset: int):
+            current = base + timedelta(days=offset)
+            if offset and not_before and current < not_before:
+                return
+            slots = self.open_slot_minutes(row, current.weekday(), guests)
+            shifted = target - offset * 24 * 60  # requested time on that day's clock
+            hi = bisect.bisect_left(slots, shifted)
+            lo = hi - 1
+            while lo >= 0 or hi < len(slots):
+                if hi >= len(slots) or (lo >= 0 and shifted - slots[lo] <= slots[hi] - shifted):
+                    m, lo = slots[lo], lo - 1
+                else:
+                    m, hi = slots[hi], hi + 1
+                yield abs(m - shifted), current.isoformat(), m
+
+        merged = heapq.merge(*(walk(offset) for offset in range(-days, days + 1)))
+        for _, slot_day, minutes in merged:
+            yield slot_day, minutes
+
+    @staticmethod
+    def rank(scores: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """All rows of `mask`, best score first (ties keep row order)."""
+        rows = np.flatnonzero(mask)
+        return rows[np.argsort(-np.asarray(scores)[rows], kind="stable")].astype(np.int32)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, mask: np.ndarray, k: int) -> List[int]:
+        """Rows of the k best scores among `mask`, best first."""
+        rows = np.flatnonzero(mask)
+        if rows.size == 0 or k <= 0:
+            return []
+        candidate_scores = scores[rows]
+        if rows.size > k:
+            part = np.argpartition(-candidate_scores, k - 1)[:k]
+            rows, candidate_scores = rows[part], candidate_scores[part]
+        order = np.argsort(-candidate_scores, kind="stable")
+        return [int(r) for r in rows[order]]
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Text, Tuple
+
+import numpy as np
+
+from .catalog import Catalog
+
+
+def preference_key(cuisines: Iterable[Text], diets: Iterable[Text],
+                   wishes: Iterable[Text] = ()) -> Tuple[frozenset, frozenset, frozenset]:
+    """Normalized cache key: order and case of the slot values don't matter."""
+    return (frozenset(c.strip().lower() for c in cuisines),
+            frozenset(d.strip().lower() for d in diets),
+            frozenset(w.strip().lower() for w in wishes))
+
+
+class RankingCache:
+    """
+    Bounded LRU cache of ranked recommendation candidates.
+
+    Maps a normalized (cuisine set, diet set, wish set) to every row that
+    satisfies the cuisine and diet filters, best score first. Availability depends on the requested
+    date, time and party size, so it is applied afterwards as a mask on the
+    cached list. Preferences come from two small closed vocabularies, so
+    after warm-up almost every lookup is a hit.
+
+    The whole cache is dropped when the catalog version changes (hot-swapped
+    index), since rows and scores belong to one version.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[frozenset, frozenset], np.ndarray]" = OrderedDict()
+        self._version: Optional[Text] = None
+        self._lock = threading.Lock()
+
+        # counters exposed via stats()
+        self.hits          = 0
+        self.misses        = 0
+        self.evictions     = 0
+        self.invalidations = 0
+
+    def get(self, catalog: Catalog, key: Tuple[frozenset, frozenset],
+            rank: Callable[[], np.ndarray]) -> np.ndarray:
+        """Ranked rows for `key`; `rank()` computes them on a miss."""
+        with self._lock:
+            if catalog.version != self._version:
+                if self._version is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = catalog.version
+            ranked = self._entries.get(key)
+            if ranked is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return ranked
+            self.misses += 1
+
+        ranked = rank()
+        ranked.setflags(write=False)  # shared between requests
+        with self._lock:
+            if catalog.version == self._version:
+                self._entries[key] = ranked
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return ranked
+
+    def stats(self) -> Dict[Text, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,141 @@
+import os
+import re
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Text
+
+import numpy as np
+
+from .catalog import Catalog
+from .restaurant_index import RestaurantIndex
+
+logger = logging.getLogger(__name__)
+
+# Scorers rank every restaurant of a catalog against the user's preferences.
+#   scores(catalog, query)  -> one similarity per row for a preference text
+#   similar(catalog, row)   -> similarity of every row to one restaurant
+# Higher is better; the suggest action applies its hard filters (cuisine, diet,
+# availability) as masks on top and picks the top k.
+#
+# Backends (ALICE_SCORER):
+#   tfidf      TF–IDF over "name cuisine diets" (default, built by preprocess.py)
+#   embedding  sentence embeddings of an enriched description (needs the
+#              optional sentence-transformers package, falls back to tfidf)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def preference_text(cuisines: Iterable[Text], diets: Iterable[Text], wishes: Iterable[Text] = ()) -> Text:
+    """Query for scores() built from the form slots, e.g. "italian vegetarian" or "sushi"."""
+    return " ".join(sorted(cuisines) + sorted(wishes) + sorted(diets)).strip()
+
+
+class TfidfScorer:
+    """
+    Cosine similarity on TF–IDF vectors. Restaurant and query vectors are
+    L2-normalized, so this is a plain sparse dot product (no scikit-learn).
+    """
+
+    name = "tfidf"
+
+    def scores(self, catalog: Catalog, query: Text) -> np.ndarray:
+        query_vec = catalog.vectorizer.transform([query])  # TF–IDF vector
+        return np.asarray((catalog.restaurant_vecs @ query_vec.T).todense(), dtype=np.float64).ravel()
+
+    def similar(self, catalog: Catalog, row: int) -> np.ndarray:
+        row_vec = catalog.restaurant_vecs[row]
+        return np.asarray((catalog.restaurant_vecs @ row_vec.T).todense(), dtype=np.float64).ravel()
+
+
+def restaurant_description(index: RestaurantIndex, row: int) -> Text:
+    """Enriched text for embeddings, e.g. 'Sakura. Japanese restaurant in Downtown, ...'"""
+    r = index.restaurant(row)
+    diets = ", ".join(r["dietary_options"]) or "no special diets"
+    return (
+        f"{r['name']}. {r['cuisine']} restaurant in {r['location']}, price range {r['price_range']}, "
+        f"rated {r['rating']:.1f}. Dietary options: {diets}."
+    )
+
+
+class EmbeddingScorer:
+    """
+    Sentence-embedding scorer: restaurants and queries are embedded with a
+    small CPU model, so "ramen" or "sushi" also score Japanese restaurants.
+
+    Restaurant embeddings are L2-normalized and cached on disk next to the
+    catalog version (embeddings-<model>.npy), so they are computed once per
+    catalog and model; scoring is then one matrix-vector product.
+    """
+
+    name = "embedding"
+    MAX_CACHED_QUERIES = 1024
+
+    def __init__(self, model_name: Text = DEFAULT_EMBEDDING_MODEL, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer  # optional dependency
+
+        self.model_name  = model_name
+        self.batch_size  = batch_size
+        self.model       = SentenceTransformer(model_name, device="cpu")
+        self._lock       = threading.Lock()
+        self._embeddings = (None, None)  # (catalog version, matrix)
+        self._queries: Dict[Text, np.ndarray] = {}
+
+    def cache_path(self, catalog: Catalog) -> Text:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_name)
+        return os.path.join(catalog.directory, f"embeddings-{slug}.npy")
+
+    def encode(self, texts) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(list(texts), batch_size=self.batch_size, normalize_embeddings=True),
+            dtype=np.float32,
+        )
+
+    def restaurant_embeddings(self, catalog: Catalog) -> np.ndarray:
+        version, matrix = self._embeddings
+        if version == catalog.version:
+            return matrix
+        with self._lock:
+            version, matrix = self._embeddings
+            if version == catalog.version:
+                return matrix
+            path = self.cache_path(catalog)
+            if os.path.exists(path):
+                matrix = np.load(path, mmap_mode="r")
+            if matrix is None or len(matrix) != len(catalog.index):
+                texts = (restaurant_description(catalog.index, row) for row in range(len(catalog.index)))
+                matrix = self.encode(texts)
+                tmp_path = f"{path}.tmp.npy"
+                np.save(tmp_path, matrix)
+                os.replace(tmp_path, path)
+            self._embeddings = (catalog.version, matrix)
+            self._queries.clear()
+            return matrix
+
+    def scores(self, catalog: Catalog, query: Text) -> np.ndarray:
+        matrix = self.restaurant_embeddings(catalog)
+        query_vec = self._queries.get(query)
+        if query_vec is None:
+            query_vec = self.encode([query or "restaurant"])[0]
+            if len(self._queries) >= self.MAX_CACHED_QUERIES:
+                self._queries.clear()
+            self._queries[query] = query_vec
+        return matrix @ query_vec  # cosine similarity (rows are normalized)
+
+    def similar(self, catalog: Catalog, row: int) -> np.ndarray:
+        matrix = self.restaurant_embeddings(catalog)
+        return matrix @ np.asarray(matrix[row])
+
+
+def create_scorer(kind: Optional[Text] = None):
+    """Scorer selected by ALICE_SCORER ('tfidf' or 'embedding')."""
+    kind = (kind or os.environ.get("ALICE_SCORER", "tfidf")).lower()
+    if kind == "embedding":
+        model_name = os.environ.get("ALICE_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        try:
+            return EmbeddingScorer(model_name)
+        except Exception as e:
+            # e.g. sentence-transformers not installed or model not downloadable
+            logger.warning(f"Embedding scorer unavailable ({e}), using TF–IDF instead")
+    elif kind != "tfidf":
+        logger.warning(f"Unknown scorer '{kind}', using TF–IDF")
+    return TfidfScorer()
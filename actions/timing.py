@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Text
+
+from rasa_sdk import Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+
+def correlation_id(tracker: Tracker) -> Optional[Text]:
+    """Correlation ID the gateway attached to the user message (message metadata)."""
+    metadata = tracker.latest_message.get("metadata") or {}
+    return metadata.get("correlation_id")
+
+
+@contextmanager
+def timed(timings: Dict[Text, float], stage: Text) -> Iterator[None]:
+    """Adds the duration of the block (seconds) to timings[stage]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def report_timings(dispatcher: CollectingDispatcher, tracker: Tracker, action: Text,
+                   timings: Dict[Text, float], total: float) -> None:
+    """
+    Sends the action's timings back to the gateway as a custom message.
+
+    Only for turns that came with a correlation ID; the message carries no
+    text, so it is never spoken or shown. app.py turns it into the
+    action.<name> stages of the turn trace.
+    """
+    cid = correlation_id(tracker)
+    if not cid:
+        return
+    dispatcher.utter_message(json_message={"alice_timings": {
+        "action": action,
+        "correlation_id": cid,
+        "total_s": total,
+        "stages_s": timings,
+    }})
@@ -1,16 +1,159 @@
-from flask import Flask, request, jsonify, render_template
+import os
+import re
+import json
+import time
+import uuid
+import base64
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context, g
 import requests
+from requests.adapters import HTTPAdapter
 from kokoro import KPipeline
-import soundfile as sf
 import numpy as np
 from flask_cors import CORS
+from audio_store import AudioStore, encode_audio
+from tts_cache import TTSCache, AudioBundle, split_segments
+from tts_scheduler import TTSScheduler, TTSQueueFull
+from metrics import StageMetrics, TurnTrace, new_correlation_id, create_turn_log
+from fast_intents import FastIntentResolver
+try:
+    from flask_sock import Sock  # optional, only needed for the /stt WebSocket
+except ImportError:
+    Sock = None
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Allow all origins
 
-# Initialize Kokoro Text-to-Speech pipeline 
-pipeline = KPipeline(lang_code='a')  # 'a' = American English voice model
+# Kokoro Text-to-Speech settings
+TTS_VOICE = 'af_heart'
+TTS_SPEED = 0.9          # slower speed for clearer pronunciation
+TTS_SAMPLE_RATE = 24000  # Kokoro outputs 24kHz audio
+CROSSFADE_SAMPLES = int(TTS_SAMPLE_RATE * 0.01)  # 10 ms between segments
+
+# TTS scheduler: a bounded number of model workers, each with its own Kokoro
+# pipeline ('a' = American English voice model), fed from one queue.
+# Uncached segments of a reply are synthesized in parallel across workers.
+tts_scheduler = TTSScheduler(
+    pipeline_factory=lambda: KPipeline(lang_code='a'),
+    voice=TTS_VOICE,
+    speed=TTS_SPEED,
+    num_workers=int(os.environ.get('ALICE_TTS_WORKERS', 2)),
+    max_queue=int(os.environ.get('ALICE_TTS_MAX_QUEUE', 64)),
+    submit_timeout=float(os.environ.get('ALICE_TTS_SUBMIT_TIMEOUT', 2.0)),
+    # one inference per worker at startup ('' to skip), see gunicorn.conf.py
+    warmup_text=os.environ.get('ALICE_TTS_WARMUP_TEXT', "Hello, I'm Alice. How can I help you today?"),
+)
+
+# Phrase-level audio cache, keyed by (text, voice, speed)
+# - precomputed domain.yml responses are memory-mapped from the bundle built
+#   by precompute_tts.py (served with zero model inference)
+# - set ALICE_TTS_CACHE_DIR to also keep other phrases on disk across restarts
+tts_bundle = AudioBundle.load(os.environ.get('ALICE_TTS_BUNDLE', 'tts_bundle'))
+tts_cache = TTSCache(
+    max_bytes=int(os.environ.get('ALICE_TTS_CACHE_MAX_BYTES', 128 * 1024 * 1024)),
+    disk_dir=os.environ.get('ALICE_TTS_CACHE_DIR') or None,
+    bundle=tts_bundle,
+)
+
+# Per-request audio buffers (replaces the shared static/response.wav file)
+AUDIO_FORMAT = os.environ.get('ALICE_AUDIO_FORMAT', 'wav')  # 'wav' (16-bit PCM) or 'ogg' (Opus)
+audio_store = AudioStore(
+    ttl_seconds=int(os.environ.get('ALICE_AUDIO_TTL', 120)),
+    max_bytes=int(os.environ.get('ALICE_AUDIO_MAX_BYTES', 64 * 1024 * 1024)),
+)
+
+# Pooled, keep-alive HTTP client to Rasa: connections are reused across turns
+# and shared by all gateway threads (see gunicorn.conf.py)
+RASA_URL = os.environ.get('ALICE_RASA_URL', 'http://localhost:5005/webhooks/rest/webhook')
+RASA_TIMEOUT = (
+    float(os.environ.get('ALICE_RASA_CONNECT_TIMEOUT', 2.0)),  # connect
+    float(os.environ.get('ALICE_RASA_READ_TIMEOUT', 30.0)),    # read (NLU + actions)
+)
+RASA_POOL_SIZE = int(os.environ.get('ALICE_RASA_POOL_SIZE', 16))
+rasa_session = requests.Session()
+rasa_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=RASA_POOL_SIZE))
+rasa_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=RASA_POOL_SIZE))
+
+# Per-client session IDs: each browser gets its own Rasa tracker.
+# The ID comes from the X-Session-ID header (set by main.js) or a cookie.
+SESSION_HEADER = 'X-Session-ID'
+SESSION_COOKIE = 'alice_session'
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+class SessionLocks:
+    """
+    One lock per active session: turns of the same session reach Rasa in
+    order, while different sessions run in parallel. Locks are dropped once
+    no request of that session is in flight.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks = {}  # session_id -> [lock, number of waiting/running requests]
+
+    @contextmanager
+    def hold(self, session_id):
+        with self._guard:
+            entry = self._locks.setdefault(session_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[session_id]
+
+    def active(self):
+        with self._guard:
+            return len(self._locks)
+
+
+session_locks = SessionLocks()
+
+# Fast path (see fast_intents.py): "yes", "no", "cancel", "thanks", "four people"
+# are sent to Rasa as "/intent{...}" and skip NLU classification
+fast_intents = None
+if os.environ.get('ALICE_FAST_INTENTS', '1') == '1':
+    try:
+        fast_intents = FastIntentResolver.from_nlu(os.environ.get('ALICE_NLU_DATA', 'data/nlu.yml'))
+    except OSError as e:
+        print(f"Fast intent path disabled, could not read NLU data: {e}")
+
+# Optional server-side speech recognition (see stt.py): the browser streams
+# microphone audio over the /stt WebSocket and a local Vosk model transcribes
+# it with early endpointing. Needs flask-sock, vosk and ALICE_STT_MODEL
+# (an unpacked model directory, e.g. models/vosk-model-small-en-us-0.15).
+sock = Sock(app) if Sock else None
+speech_recognizer = None
+if sock and os.environ.get('ALICE_STT_MODEL'):
+    try:
+        from stt import SpeechRecognizer
+        speech_recognizer = SpeechRecognizer(
+            os.environ['ALICE_STT_MODEL'],
+            silence_ms=int(os.environ.get('ALICE_STT_SILENCE_MS', 600)),
+            min_silence_ms=int(os.environ.get('ALICE_STT_MIN_SILENCE_MS', 240)),
+            stable_ms=int(os.environ.get('ALICE_STT_STABLE_MS', 300)),
+        )
+    except Exception as e:
+        print(f"Server-side speech recognition disabled, could not load the model: {e}")
+
+RASA_ERROR_TEXT = "There was a problem processing your request. Please try again."
+
+# Latency instrumentation (see metrics.py): per-stage percentiles on /metrics
+# and one JSON record per turn in a size-rotated log
+REQUEST_ID_HEADER = 'X-Request-ID'
+stage_metrics = StageMetrics(window=int(os.environ.get('ALICE_METRICS_WINDOW', 2048)))
+turn_log = create_turn_log(
+    os.environ.get('ALICE_TURN_LOG', 'logs/turns.log'),
+    max_bytes=int(os.environ.get('ALICE_TURN_LOG_MAX_BYTES', 10 * 1024 * 1024)),
+    backups=int(os.environ.get('ALICE_TURN_LOG_BACKUPS', 5)),
+)
 
 # ---------------------------------------------
 # Route: Homepage - renders the frontend HTML
@@ -25,40 +168,299 @@ def home():
 # --------------------------------------------------------
 @app.route('/process', methods=['POST'])
 def process_request():
+    trace = start_trace()
     try:
-        response_data = process_input()
+        response_data = with_session_cookie(process_input(trace))
         return response_data  # Returns JSON response with text and audio
     except Exception as e:
         # Handles unexpected server-side errors
+        trace.fields["error"] = str(e)
         return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        trace.finish(stage_metrics, turn_log, session_id=get_session_id())
+
+
+# --------------------------------------------------------------------
+# Route: /process_stream (POST) - same as /process, but streams audio
+# --------------------------------------------------------------------
+@app.route('/process_stream', methods=['POST'])
+def process_stream_request():
+    """
+    Streams the reply as newline-delimited JSON (one object per line):
+      {"type": "text",  "response": "..."}            -> sent first
+      {"type": "audio", "data": "<base64 wav>"}       -> one per Kokoro segment
+      {"type": "end"}                                  -> no more audio
+    so the browser can start playing while later sentences are still synthesized.
+    """
+    trace = start_trace()
+    session_id = get_session_id()
+    data = request.get_json(silent=True) or {}
+    user_text = data.get('text', '').strip()
+    record_client_stt(trace, data)
+
+    def generate():
+        for message in stream_reply(user_text, session_id, trace):
+            yield json.dumps(message) + "\n"
+
+    return with_session_cookie(
+        Response(stream_with_context(generate()), mimetype='application/x-ndjson'))
+
+
+# ----------------------------------------------------------------------------
+# Route: /stt (WebSocket) - server-side speech recognition (optional, stt.py)
+# ----------------------------------------------------------------------------
+if sock:
+    @sock.route('/stt')
+    def stt_socket(ws):
+        """
+        The browser streams microphone audio; the reply comes back like /process_stream:
+          -> {"type": "start", "sample_rate": 48000, "session_id": "..."}
+          -> binary frames of 16-bit mono PCM
+          -> {"type": "stop"}                                     (optional)
+          <- {"type": "partial", "text": "..."}                   while talking
+          <- {"type": "final", "text": "...", "endpoint_ms": .., "decode_ms": ..}
+          <- the text / audio / end messages of the reply
+        After a final result, audio is ignored until the next "start" (the
+        client sends it once the reply has been played).
+        """
+        if speech_recognizer is None:
+            ws.send(json.dumps({"type": "error", "message": "Server-side speech recognition is not configured"}))
+            return
+        transcriber = None
+        while True:
+            message = ws.receive()
+            if message is None:
+                break
+            if isinstance(message, str):
+                control = json.loads(message)
+                if control.get("type") == "start":
+                    session_id = control.get("session_id")
+                    if session_id and SESSION_ID_PATTERN.match(session_id):
+                        g.session_id = session_id
+                    transcriber = speech_recognizer.transcriber(int(control.get("sample_rate", 16000)))
+                    events = []
+                elif control.get("type") == "stop" and transcriber:
+                    events = [transcriber.finish() or {"type": "final", "text": "", "endpoint_ms": 0}]
+                else:
+                    continue
+            elif transcriber is None:
+                continue  # not listening (the reply is still playing)
+            else:
+                events = transcriber.feed(message)
+
+            for event in events:
+                ws.send(json.dumps(event))
+                if event["type"] == "final":
+                    transcriber = None
+                    answer_transcript(ws, event)
+                    break
+
+
+def answer_transcript(ws, event):
+    """Sends the reply to a final /stt transcript over the WebSocket."""
+    trace = TurnTrace(new_correlation_id(), '/stt')
+    trace.add('stt.endpoint', event.get("endpoint_ms", 0) / 1000)
+    trace.add('stt.decode', event.get("decode_ms", 0) / 1000)
+    for message in stream_reply(event["text"].strip(), get_session_id(), trace):
+        ws.send(json.dumps(message))
+
+
+# ------------------------------------------------------------
+# Route: /audio/<id> (GET) - serves a synthesized reply once
+# ------------------------------------------------------------
+@app.route('/audio/<audio_id>')
+def get_audio(audio_id):
+    entry = audio_store.get(audio_id)
+    if entry is None:
+        return jsonify({"status": "error", "message": "Audio expired or not found"}), 404
+    data, mimetype = entry
+    return Response(data, mimetype=mimetype, headers={"Cache-Control": "no-store"})
+
+
+# ---------------------------------------------------------
+# Route: /audio_stats (GET) - audio store hits & evictions
+# ---------------------------------------------------------
+@app.route('/audio_stats')
+def get_audio_stats():
+    return jsonify(audio_store.stats())
+
+
+# -----------------------------------------------------------------------
+# Route: /tts_stats (GET) - phrase cache hit rate & scheduler queue depth
+# -----------------------------------------------------------------------
+@app.route('/tts_stats')
+def get_tts_stats():
+    return jsonify({"cache": tts_cache.stats(), "scheduler": tts_scheduler.stats()})
+
+
+# --------------------------------------------------------------------------
+# Route: /metrics (GET) - per-stage latency p50/p95/p99 (this worker process)
+# --------------------------------------------------------------------------
+@app.route('/metrics')
+def get_metrics():
+    return jsonify({
+        "pid": os.getpid(),
+        "stages": stage_metrics.snapshot(),
+        "fast_intents": fast_intents.stats() if fast_intents else None,
+    })
+
+
+# -------------------------------------------------------------------------
+# Route: /health (GET) - 200 once the TTS workers are warm (503 before that)
+# -------------------------------------------------------------------------
+@app.route('/health')
+def get_health():
+    stats = tts_scheduler.stats()
+    ready = tts_scheduler.wait_ready(timeout=0)
+    return jsonify({
+        "status": "ok" if ready else "warming",
+        "pid": os.getpid(),
+        "tts_workers_ready": stats["ready_workers"],
+        "tts_warmup_seconds": round(stats["warmup_seconds"], 3),
+    }), 200 if ready else 503
 
 
 # ----------------------------------------------------------------------
 # Logic: process_input() handles interaction with Rasa & Kokoro
 # ----------------------------------------------------------------------
-def process_input():
+def process_input(trace):
     # Extract user input from incoming request
     data = request.get_json()
     user_text = data.get('text', '').strip()
+    record_client_stt(trace, data)
 
     if not user_text:
         return jsonify({"response": "Sorry, I didn't catch anything.", "audioUrl": None})
 
+    combined_text = query_rasa(user_text, get_session_id(), trace)
+    if combined_text is None:
+        return jsonify({"response": RASA_ERROR_TEXT, "audioUrl": None})
+
+    # Convert response text to speech (TTS) using Kokoro
+    with trace.span('tts'):
+        audio = generate_tts_audio(combined_text)
+    if audio is None:
+        return jsonify({"response": combined_text, "audioUrl": None})
+
+    # Either return the audio inline (saves the second HTTP round-trip)
+    # or keep it in the short-lived store and return its URL
+    fmt = data.get('format', AUDIO_FORMAT)
+    if fmt not in ('wav', 'ogg'):
+        fmt = AUDIO_FORMAT
+    with trace.span('encode'):
+        encoded, mimetype = encode_audio(audio, TTS_SAMPLE_RATE, fmt)
+    if data.get('inline'):
+        return jsonify({
+            "response": combined_text,
+            "audioUrl": None,
+            "audioData": f"data:{mimetype};base64," + base64.b64encode(encoded).decode('ascii'),
+        })
+
+    audio_id = audio_store.put(encoded, mimetype)
+    return jsonify({
+        "response": combined_text,
+        "audioUrl": f"/audio/{audio_id}"
+    })
+
+
+# ----------------------------------------------------------------------
+# Sessions: get_session_id() / with_session_cookie()
+# ----------------------------------------------------------------------
+def get_session_id():
+    """Session ID sent by the client (header or cookie), or a new one."""
+    if 'session_id' not in g:
+        session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+        if not session_id or not SESSION_ID_PATTERN.match(session_id):
+            session_id = uuid.uuid4().hex
+        g.session_id = session_id
+    return g.session_id
+
+
+def with_session_cookie(response):
+    # Remember the session in a cookie and echo it back, so clients without
+    # the header (e.g. curl) keep talking to the same tracker
+    session_id = get_session_id()
+    response.headers[SESSION_HEADER] = session_id
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite='Lax')
+    return response
+
+
+# ----------------------------------------------------------------------
+# Tracing: start_trace() / record_client_stt() / record_action_timings()
+# ----------------------------------------------------------------------
+def start_trace():
+    """TurnTrace of the current request (correlation ID from X-Request-ID or new)."""
+    if 'trace' not in g:
+        correlation_id = new_correlation_id(request.headers.get(REQUEST_ID_HEADER))
+        g.trace = TurnTrace(correlation_id, request.path)
+    return g.trace
+
+
+@app.after_request
+def add_request_id(response):
+    # echo the correlation ID so clients can find the turn in logs/turns.log
+    if 'trace' in g:
+        response.headers[REQUEST_ID_HEADER] = g.trace.correlation_id
+    return response
+
+
+def record_client_stt(trace, data):
+    # speech recognition runs in the browser; main.js reports how long it took
+    try:
+        stt_ms = float(data.get('stt_ms'))
+    except (TypeError, ValueError):
+        return
+    if 0 <= stt_ms < 600000:
+        trace.add('stt', stt_ms / 1000)
+
+
+def record_action_timings(trace, rasa_response):
+    """Action timings reported by the action server (custom messages, not spoken)."""
+    in_actions = 0.0
+    for msg in rasa_response:
+        timings = (msg.get("custom") or {}).get("alice_timings")
+        if not timings or timings.get("correlation_id") != trace.correlation_id:
+            continue
+        action = timings.get("action", "unknown")
+        in_actions += timings.get("total_s", 0.0)
+        trace.add(f"action.{action}", timings.get("total_s", 0.0))
+        for stage, seconds in (timings.get("stages_s") or {}).items():
+            trace.add(f"action.{action}.{stage}", seconds)
+    if 'rasa' in trace.stages:
+        trace.add('rasa.nlu_core', max(0.0, trace.stages['rasa'] - in_actions))
+
+
+# ----------------------------------------------------------------------
+# Rasa: query_rasa() sends the user text and joins all bot replies
+# ----------------------------------------------------------------------
+def query_rasa(user_text, session_id, trace):
+    """Returns Rasa's combined reply text, or None if Rasa could not be reached."""
     # Send input to Rasa server for NLU and dialog management
-    rasa_url = 'http://localhost:5005/webhooks/rest/webhook'
     rasa_payload = {
-        "sender": "user1",  # Unique user session ID
-        "message": user_text
+        "sender": session_id,  # Unique user session ID -> own Rasa tracker
+        "message": user_text,
+        # travels with the message to the action server (tracker.latest_message)
+        "metadata": {"correlation_id": trace.correlation_id},
     }
+    fast_message = fast_intents.message(user_text) if fast_intents else None
+    if fast_message:
+        # resolved without NLU; the spoken text stays in the metadata
+        rasa_payload["message"] = fast_message
+        rasa_payload["metadata"]["text"] = user_text
+        trace.fields["fast_intent"] = fast_message
 
     try:
-        rasa_response = requests.post(rasa_url, json=rasa_payload).json()
+        # one turn at a time per session, so the tracker sees turns in order
+        waiting = time.perf_counter()
+        with session_locks.hold(session_id):
+            trace.add('session_wait', time.perf_counter() - waiting)
+            with trace.span('rasa'):
+                rasa_response = rasa_session.post(RASA_URL, json=rasa_payload, timeout=RASA_TIMEOUT).json()
     except Exception as e:
         print("Error contacting Rasa:", e)
-        return jsonify({
-            "response": "There was a problem processing your request. Please try again.",
-            "audioUrl": None
-        })
+        trace.fields["error"] = f"rasa: {e}"
+        return None
+    record_action_timings(trace, rasa_response)
 
     # ----------------------------------------------------------------
     # Collect all of Rasa's text replies in this turn & in order:
@@ -66,45 +468,128 @@ def process_input():
     texts = [msg.get("text") for msg in rasa_response if msg.get("text")]
     if not texts:
         # Fallback if no text at all
-        combined_text = "Sorry, I did not understand that. What did you say?"
-    else:
-        # Join with newline for better readibility
-        combined_text = "\n".join(texts)
+        return "Sorry, I did not understand that. What did you say?"
+    # Join with newline for better readibility
+    # (Kokoro also splits on newlines, so each reply becomes its own audio segment)
+    return "\n".join(texts)
 
-    # Convert response text to speech (TTS) using Kokoro
-    audio_url = generate_tts_audio(combined_text)
 
-    # Return JSON with both text and audio file path
-    return jsonify({
-        "response": combined_text,
-        "audioUrl": audio_url if audio_url else None
-    })
+# ----------------------------------------------------------------------
+# TTS: synthesize_chunks() yields Kokoro audio segments as they are ready
+# ----------------------------------------------------------------------
+def synthesize_chunks(text):
+    """
+    Yields the reply audio segment by segment (in order), with short
+    crossfades between segments. The last few ms of each segment are held
+    back and blended into the start of the next one.
+    """
+    tail = None
+    for audio in synthesize_segments(text):
+        if tail is not None:
+            audio = crossfade(tail, audio)
+        fade = min(CROSSFADE_SAMPLES, len(audio))
+        if len(audio) > fade:
+            yield audio[:len(audio) - fade]
+        tail = audio[len(audio) - fade:]
+    if tail is not None and len(tail):
+        yield tail
+
+
+def synthesize_segments(text):
+    # Replies are split into sentences/clauses: cached segments (fixed
+    # template parts, restaurant names, "Shall I book it?") cost nothing,
+    # the rest is queued on the TTS scheduler and synthesized in parallel
+    pending = []
+    for segment in split_segments(text):
+        cached = tts_cache.get(segment, TTS_VOICE, TTS_SPEED)
+        if cached is not None:
+            pending.append(cached)
+        else:
+            pending.append(submit_segment(segment))
+
+    for item in pending:
+        audio = item.result() if isinstance(item, Future) else item
+        if audio is not None and len(audio):
+            yield audio
+
+
+def submit_segment(segment):
+    """Queue one segment on the scheduler; the result is stored in the phrase cache."""
+    future = tts_scheduler.submit(segment)
+
+    def remember(done):
+        if not done.cancelled() and done.exception() is None and done.result() is not None:
+            tts_cache.put(segment, TTS_VOICE, TTS_SPEED, done.result())
+
+    future.add_done_callback(remember)
+    return future
+
+
+def crossfade(tail, audio):
+    """Blend the held-back tail of the previous segment into the start of `audio`."""
+    n = min(len(tail), len(audio))
+    if n == 0:
+        return np.concatenate([tail, audio])
+    ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    head = tail[:n] * (1.0 - ramp) + audio[:n] * ramp
+    return np.concatenate([tail[n:], head, audio[n:]])
 
 
 # ----------------------------------------------------------------------
-# TTS: generate_tts_audio() uses Kokoro to generate a WAV audio file
+# Streaming: stream_reply() yields the messages of /process_stream & /stt
 # ----------------------------------------------------------------------
-def generate_tts_audio(text):
+def stream_reply(user_text, session_id, trace):
+    """Queries Rasa and yields the text, audio and end messages; finishes `trace` at the end."""
+    chunks = iter(())  # no audio unless Rasa answered
+    if not user_text:
+        combined_text = "Sorry, I didn't catch anything."
+    else:
+        combined_text = query_rasa(user_text, session_id, trace)
+        if combined_text is None:
+            combined_text = RASA_ERROR_TEXT
+        else:
+            chunks = synthesize_chunks(combined_text)
+
+    yield {"type": "text", "response": combined_text}
     try:
-        # Voice parameters: slower speed for clearer pronunciation
-        generator = pipeline(text, voice='af_heart', speed=0.9)
+        while True:
+            # time only the synthesis, not sending the previous segment
+            start = time.perf_counter()
+            audio = next(chunks, None)
+            if audio is None:
+                break
+            trace.add('tts', time.perf_counter() - start)
+            trace.mark('tts.first_audio')
+            wav, _ = encode_audio(audio, TTS_SAMPLE_RATE, 'wav')
+            yield {"type": "audio", "data": base64.b64encode(wav).decode('ascii')}
+    except Exception as e:
+        print(f"Error streaming TTS audio: {e}")
+        trace.fields["error"] = str(e)
+    finally:
+        trace.finish(stage_metrics, turn_log, session_id=session_id)
+    yield {"type": "end"}
 
-        audio_filename = 'static/response.wav'
-        all_audio_chunks = []
 
+# ----------------------------------------------------------------------
+# TTS: generate_tts_audio() uses Kokoro to synthesize the whole reply
+# ----------------------------------------------------------------------
+def generate_tts_audio(text):
+    """Returns the reply as one float32 array (24kHz), or None on failure."""
+    try:
         # Collect all audio chunks generated
-        for _, _, audio in generator:
-            all_audio_chunks.append(audio)
+        all_audio_chunks = list(synthesize_chunks(text))
 
-        # Combine all chunks into one wav file
+        # Combine all chunks into one clip (kept in memory, no file on disk)
         if all_audio_chunks:
-            full_audio = np.concatenate(all_audio_chunks)
-            sf.write(audio_filename, full_audio, 24000)  # Save with 24kHz sample rate
-            return '/static/response.wav'
+            return np.concatenate(all_audio_chunks)
         else:
             print("TTS returned no audio.")
             return None
 
+    except TTSQueueFull as e:
+        # Backpressure: answer with text only instead of queueing forever
+        print(f"TTS busy, sending text only: {e}")
+        return None
     except Exception as e:
         print(f"Error generating TTS audio: {e}")
         return None
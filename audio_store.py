@@ -0,0 +1,106 @@
+import io
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import soundfile as sf
+
+# Short-lived, in-memory store for synthesized replies.
+# Each /process call gets its own key, so concurrent users never overwrite each
+# other's audio (unlike the old shared static/response.wav file).
+
+# Supported encodings: name -> (soundfile format, subtype, mimetype)
+AUDIO_FORMATS = {
+    "wav": ("WAV", "PCM_16", "audio/wav"),   # 16-bit PCM, plays everywhere
+    "ogg": ("OGG", "OPUS", "audio/ogg"),     # compact Opus in an OGG container
+}
+
+
+def encode_audio(audio, sample_rate, fmt="wav"):
+    """
+    Encode a float32 audio array in memory.
+    Returns (bytes, mimetype). Falls back to OGG/Vorbis if the installed
+    libsndfile was built without Opus support.
+    """
+    sf_format, subtype, mimetype = AUDIO_FORMATS[fmt]
+    buffer = io.BytesIO()
+    try:
+        sf.write(buffer, np.asarray(audio, dtype=np.float32), sample_rate,
+                 format=sf_format, subtype=subtype)
+    except Exception:
+        if fmt != "ogg":
+            raise
+        buffer = io.BytesIO()
+        sf.write(buffer, np.asarray(audio, dtype=np.float32), sample_rate,
+                 format="OGG", subtype="VORBIS")
+    return buffer.getvalue(), mimetype
+
+
+class AudioStore:
+    """
+    Keyed audio buffers with TTL eviction and a total memory cap.
+    Oldest entries are evicted first once the cap is reached.
+    """
+
+    def __init__(self, ttl_seconds=120, max_bytes=64 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes   = max_bytes
+        self._entries    = OrderedDict()  # id -> (expires_at, data, mimetype)
+        self._bytes      = 0
+        self._lock       = threading.Lock()
+        # counters exposed via stats()
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    def put(self, data, mimetype):
+        """Store an encoded clip and return its id."""
+        audio_id = uuid.uuid4().hex
+        with self._lock:
+            self._evict_expired()
+            self._entries[audio_id] = (time.monotonic() + self.ttl_seconds, data, mimetype)
+            self._bytes += len(data)
+            # enforce the memory cap (never evicts the clip we just stored)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._pop_oldest()
+        return audio_id
+
+    def get(self, audio_id):
+        """Return (data, mimetype) or None if unknown or expired."""
+        with self._lock:
+            self._evict_expired()
+            entry = self._entries.get(audio_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # --- helpers (caller holds the lock) ---
+    def _evict_expired(self):
+        now = time.monotonic()
+        # entries are stored in insertion order with the same TTL, so the
+        # oldest ones expire first
+        while self._entries:
+            expires_at = next(iter(self._entries.values()))[0]
+            if expires_at > now:
+                break
+            self._pop_oldest()
+
+    def _pop_oldest(self):
+        _, (_, data, _) = self._entries.popitem(last=False)
+        self._bytes -= len(data)
+        self.evictions += 1
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Hit rate, accuracy and saved latency of the fast intent path (fast_intents.py).
+
+Every example of data/test_nlu.yml is looked up in the table built from
+data/nlu.yml. Reported: how many turns the fast path answers, how many of
+those have the expected intent (and guest count), and the lookup latency.
+With --rasa-url, the same examples are also parsed by a running Rasa server
+(POST /model/parse), once as text and once in slash syntax, which measures
+the NLU time the fast path saves per hit.
+
+    python3 benchmarks/bench_fast_intents.py
+    python3 benchmarks/bench_fast_intents.py --rasa-url http://localhost:5005
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from fast_intents import FastIntentResolver, load_nlu_examples, slash_message, strip_annotations  # noqa: E402
+from components.datetime_parser import parse_numbers  # noqa: E402
+
+# the short guest-count answers the form expects after utter_ask_num_of_guests
+EXTRA_EXAMPLES = [
+    ("inform_booking_details", "two people"),
+    ("inform_booking_details", "four people"),
+    ("inform_booking_details", "We are five"),
+    ("inform_booking_details", "for 3"),
+]
+
+
+def load_examples(path):
+    """(intent, plain text) of every example in a Rasa NLU yaml file."""
+    return [(intent, strip_annotations(example)) for intent, example in load_nlu_examples(path)]
+
+
+def expected_number(text):
+    numbers = parse_numbers(text, [])
+    return numbers[0]["value"] if len(numbers) == 1 else None
+
+
+def rasa_parse_ms(http, url, text, repeats):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        http.post(f"{url.rstrip('/')}/model/parse", json={"text": text}, timeout=10).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nlu", default=os.path.join(PROJECT_DIR, "data", "nlu.yml"))
+    parser.add_argument("--test-data", default=os.path.join(PROJECT_DIR, "data", "test_nlu.yml"))
+    parser.add_argument("--rasa-url", help="also measure /model/parse of a running Rasa server")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--out", default=os.path.join(PROJECT_DIR, "results", "benchmarks", "fast_intents.json"),
+                        help="path for the JSON report ('' to skip)")
+    args = parser.parse_args()
+
+    resolver = FastIntentResolver.from_nlu(args.nlu)
+    examples = load_examples(args.test_data) + EXTRA_EXAMPLES
+
+    hits, correct, errors, lookups = [], 0, [], []
+    for intent, text in examples:
+        start = time.perf_counter()
+        result = resolver.resolve(text)
+        lookups.append(time.perf_counter() - start)
+        if result is None:
+            continue
+        hits.append((intent, text, result))
+        fast_intent, entities = result
+        ok = fast_intent == intent and entities.get("number", expected_number(text)) == expected_number(text)
+        correct += ok
+        if not ok:
+            errors.append({"text": text, "expected": intent, "got": slash_message(*result)})
+
+    report = {
+        "table_examples": len(resolver.table),
+        "examples": len(examples),
+        "hits": len(hits),
+        "hit_rate": round(len(hits) / len(examples), 3),
+        "hit_accuracy": round(correct / len(hits), 3) if hits else None,
+        "lookup_mean_us": round(statistics.mean(lookups) * 1e6, 2),
+        "hits_by_intent": resolver.stats()["hits_by_intent"],
+        "errors": errors,
+    }
+
+    if args.rasa_url:
+        import requests
+
+        http = requests.Session()
+        text_ms = [rasa_parse_ms(http, args.rasa_url, text, args.repeats) for _, text, _ in hits]
+        slash_ms = [rasa_parse_ms(http, args.rasa_url, slash_message(*result), args.repeats)
+                    for _, _, result in hits]
+        all_ms = [rasa_parse_ms(http, args.rasa_url, text, args.repeats) for _, text in examples]
+        report["rasa"] = {
+            "parse_text_ms": round(statistics.mean(text_ms), 3) if hits else None,
+            "parse_slash_ms": round(statistics.mean(slash_ms), 3) if hits else None,
+            "saved_per_hit_ms": round(statistics.mean(text_ms) - statistics.mean(slash_ms), 3) if hits else None,
+            # expected NLU time saved per turn of this test set
+            "saved_per_turn_ms": round((sum(text_ms) - sum(slash_ms)) / len(examples), 3) if hits else None,
+            "parse_all_mean_ms": round(statistics.mean(all_ms), 3),
+        }
+
+    print(f"fast path: {report['hits']}/{report['examples']} examples "
+          f"(hit rate {report['hit_rate']}), accuracy {report['hit_accuracy']}, "
+          f"lookup {report['lookup_mean_us']} µs")
+    for error in errors:
+        print(f"  {error['text']!r}: expected {error['expected']}, got {error['got']}")
+    if "rasa" in report:
+        rasa = report["rasa"]
+        print(f"rasa /model/parse: text {rasa['parse_text_ms']} ms vs. slash {rasa['parse_slash_ms']} ms "
+              f"-> {rasa['saved_per_hit_ms']} ms saved per hit, {rasa['saved_per_turn_ms']} ms per turn")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
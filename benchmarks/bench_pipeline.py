@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks of the pipeline stages on synthetic catalogs of 10^2 to 10^5 restaurants.
+
+For every catalog size a synthetic data/restaurants.json is generated
+(fixed seed) and measured in a temporary directory:
+  preprocess       preprocess.build() from scratch, then rebuilds after one
+                   restaurant changed: its availability (incremental_s) or its
+                   name (renamed_s) in the same process, like --watch, and its
+                   availability in a fresh process (restart_s, no rows to copy)
+  suggest          ActionSuggestRestaurant.run() for random preferences, with
+                   an empty ranking cache (cold) and a filled one (warm)
+  is_available     ActionSuggestRestaurant._is_available() for random rows
+generate_tts_audio() of app.py is measured once (independent of the catalog;
+skipped if Kokoro is not installed).
+
+The report goes to results/benchmarks/pipeline.json; with --baseline the
+run is compared with an earlier report and exits with status 1 if a median
+got more than --tolerance slower.
+
+    python3 benchmarks/bench_pipeline.py
+    python3 benchmarks/bench_pipeline.py --sizes 100 1000 --no-tts
+    python3 benchmarks/bench_pipeline.py --baseline results/benchmarks/pipeline.json --out /tmp/pipeline.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from datetime import date, datetime, timedelta
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from rasa_sdk import Tracker  # noqa: E402
+from rasa_sdk.executor import CollectingDispatcher  # noqa: E402
+
+import preprocess  # noqa: E402
+from actions.actions import ActionSuggestRestaurant, split_date_and_time  # noqa: E402
+from actions.bookings import BookingStore  # noqa: E402
+from actions.catalog import CatalogLoader  # noqa: E402
+from actions.result_cache import RankingCache  # noqa: E402
+
+CUISINES  = ["Italian", "Japanese", "Mexican", "Indian", "Chinese", "Thai", "French", "German",
+             "Greek", "Spanish", "Korean", "Vietnamese", "Lebanese", "Turkish", "American"]
+DIETS     = ["Vegetarian", "Vegan", "Gluten-Free", "Halal", "Kosher", "Omnivore"]
+LOCATIONS = ["Downtown", "Old Town", "Riverside", "Uptown", "Harbor", "University", "Station"]
+PRICES    = ["$", "$$", "$$$", "$$$$"]
+WEEKDAYS  = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TIMES     = [f"{h}:{m:02d} PM" for h in range(5, 11) for m in (0, 30)]
+WORDS     = ["Golden", "Little", "Blue", "Old", "Green", "Royal", "Happy", "Silver", "Red", "Lucky",
+             "Garden", "Table", "Kitchen", "House", "Corner", "Bistro", "Spoon", "Fork", "Oven", "Lantern"]
+
+# TTS texts: a short question, a typical suggestion and a long reply
+TTS_TEXTS = [
+    "How many guests?",
+    "Based on your preferences, I recommend La Bella Italia. It offers Italian cuisine "
+    "and can seat 2 on 2025-04-25 at 7:00 PM. Shall I book it?",
+    "I'm sorry, Bella Roma meets your preferences but isn't available then. Bella Roma has a "
+    "free table at 8:00 PM. It would also be free at 6:00 PM or on 2025-04-26 at 7:00 PM. "
+    "La Bella Italia has a table at 9:00 PM. Shall I book Bella Roma at 8:00 PM?",
+]
+
+
+def synthetic_restaurants(n, seed=0):
+    rng = random.Random(seed)
+    restaurants = []
+    for i in range(n):
+        days = rng.sample(WEEKDAYS, rng.randint(2, 7))
+        restaurants.append({
+            "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            "cuisine": rng.choice(CUISINES),
+            "dietary_options": sorted(rng.sample(DIETS, rng.randint(1, 4))),
+            "location": rng.choice(LOCATIONS),
+            "price_range": rng.choice(PRICES),
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "availability": {day: sorted(rng.sample(TIMES, rng.randint(2, 8)),
+                                         key=TIMES.index) for day in days},
+            "max_guests": rng.randint(2, 12),
+        })
+    return restaurants
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+    }
+
+
+class BenchSuggestRestaurant(ActionSuggestRestaurant):
+    """The real action, bound to a benchmark catalog, booking store and ranking cache."""
+
+    def __init__(self, loader, bookings, rankings):
+        super().__init__()
+        self._loader   = loader
+        self._bookings = bookings
+        self.rankings  = rankings
+
+    @property
+    def catalog(self):
+        return self._loader
+
+    @property
+    def bookings(self):
+        return self._bookings
+
+
+def booking_requests(count, seed=1):
+    """Random form results (slots) for a date in the coming week."""
+    rng = random.Random(seed)
+    today = date.today()
+    requests = []
+    for _ in range(count):
+        day = today + timedelta(days=rng.randint(1, 7))
+        hour, minute = rng.choice([(h, m) for h in range(17, 23) for m in (0, 30)])
+        requests.append({
+            "cuisine_preferences": [rng.choice(CUISINES).lower()],
+            "dietary_preferences": [rng.choice(DIETS).lower()],
+            "date_and_time": f"{day.isoformat()}T{hour:02d}:{minute:02d}:00+02:00",
+            "num_of_guests": rng.randint(1, 6),
+        })
+    return requests
+
+
+def tracker(slots):
+    return Tracker("bench", slots, {"intent": {"name": "inform_booking_details"}, "entities": [], "text": ""},
+                   [], False, None, None, "action_listen")
+
+
+def bench_preprocess(catalog_path, vectorizer_dir, restaurants):
+    def rebuild(change=None, fresh_process=False):
+        if change:
+            change(restaurants[len(restaurants) // 2])  # one changed row
+            with open(catalog_path, "w") as f:
+                json.dump(restaurants, f)
+        if fresh_process:
+            preprocess._last_build.clear()
+        start = time.perf_counter()
+        preprocess.build(catalog_path, vectorizer_dir=vectorizer_dir)
+        return round(time.perf_counter() - start, 3)
+
+    def toggle_slot(r):
+        day = next(iter(r["availability"]), "Monday")
+        times = r["availability"].setdefault(day, [])
+        if TIMES[0] in times:
+            times.remove(TIMES[0])
+        else:
+            times.insert(0, TIMES[0])
+
+    def rename(r):
+        r["name"] += " Renamed"
+
+    return {
+        "full_s": rebuild(),
+        "incremental_s": rebuild(toggle_slot),
+        "renamed_s": rebuild(rename),
+        "restart_s": rebuild(toggle_slot, fresh_process=True),
+    }
+
+
+def timed_run(action, slots):
+    start = time.perf_counter()
+    action.run(CollectingDispatcher(), tracker(slots), {})
+    return time.perf_counter() - start
+
+
+def bench_suggest(action_for, requests):
+    # cold: a fresh ranking cache for every call
+    cold = [timed_run(action_for(RankingCache()), slots) for slots in requests]
+    warm_action = action_for(RankingCache())
+    for slots in requests:  # fill the cache
+        timed_run(warm_action, slots)
+    warm = [timed_run(warm_action, slots) for slots in requests]
+    return {"cold": summarize(cold), "warm": summarize(warm),
+            "warm_cache_hit_rate": round(warm_action.rankings.stats()["hit_rate"], 3)}
+
+
+def bench_is_available(action, catalog, requests, calls, seed=2):
+    rng = random.Random(seed)
+    n = len(catalog.index)
+    queries = []
+    for _ in range(calls):
+        slots = rng.choice(requests)
+        day, time_ = split_date_and_time(datetime.fromisoformat(slots["date_and_time"]))
+        queries.append((rng.randrange(n), slots["num_of_guests"], day, time_))
+    latencies = []
+    for row, guests, day, time_ in queries:
+        start = time.perf_counter()
+        action._is_available(catalog, row, guests, day, time_)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def bench_size(n, workdir, requests_per_size, availability_calls):
+    size_dir = os.path.join(workdir, str(n))
+    os.makedirs(size_dir)
+    catalog_path = os.path.join(size_dir, "restaurants.json")
+    vectorizer_dir = os.path.join(size_dir, "vectorizer")
+    restaurants = synthetic_restaurants(n)
+    with open(catalog_path, "w") as f:
+        json.dump(restaurants, f)
+
+    result = {"restaurants": n, "preprocess": bench_preprocess(catalog_path, vectorizer_dir, restaurants)}
+
+    loader = CatalogLoader(index_dir=os.path.join(vectorizer_dir, "index"))
+    bookings = BookingStore(os.path.join(size_dir, "bookings.db"))
+    requests = booking_requests(requests_per_size)
+    result["suggest"] = bench_suggest(lambda cache: BenchSuggestRestaurant(loader, bookings, cache), requests)
+    action = BenchSuggestRestaurant(loader, bookings, RankingCache())
+    result["is_available"] = bench_is_available(action, loader.current(), requests, availability_calls)
+    return result
+
+
+def bench_tts(repeats):
+    try:
+        import app  # loads the Kokoro pipeline
+    except ImportError as e:
+        print(f"generate_tts_audio: skipped ({e})")
+        return None
+    results = []
+    for text in TTS_TEXTS:
+        start = time.perf_counter()
+        audio = app.generate_tts_audio(text)
+        first = time.perf_counter() - start
+        repeated = []
+        for _ in range(repeats):  # served from the TTS cache
+            start = time.perf_counter()
+            app.generate_tts_audio(text)
+            repeated.append(time.perf_counter() - start)
+        results.append({
+            "characters": len(text),
+            "audio_s": round(len(audio) / app.TTS_SAMPLE_RATE, 2) if audio is not None else None,
+            "first_ms": round(first * 1000, 3),
+            "repeat": summarize(repeated),
+        })
+    return results
+
+
+def medians(report):
+    """Flat {metric: value} of the medians (and one-shot timings) in a report, for comparisons."""
+    values = {}
+    for size in report.get("sizes", []):
+        n = size["restaurants"]
+        values[f"{n}.preprocess.full_s"] = size["preprocess"]["full_s"]
+        values[f"{n}.preprocess.incremental_s"] = size["preprocess"]["incremental_s"]
+        values[f"{n}.suggest.cold.p50_ms"] = size["suggest"]["cold"]["p50_ms"]
+        values[f"{n}.suggest.warm.p50_ms"] = size["suggest"]["warm"]["p50_ms"]
+        values[f"{n}.is_available.p50_ms"] = size["is_available"]["p50_ms"]
+    for tts in report.get("tts") or []:
+        values[f"tts.{tts['characters']}.repeat.p50_ms"] = tts["repeat"]["p50_ms"]
+    return values
+
+
+def regressions(report, baseline, tolerance, noise_floor_ms=1.0):
+    """
+    Metrics present in both reports that got more than `tolerance` (0.2 = 20%) slower.
+    Sub-millisecond timings jitter by more than that, so they only count above `noise_floor_ms`.
+    """
+    now, before = medians(report), medians(baseline)
+
+    def ms(metric, value):
+        return value * 1000 if metric.endswith("_s") else value
+
+    return [
+        (metric, before[metric], value)
+        for metric, value in sorted(now.items())
+        if metric in before and before[metric] > 0 and value > before[metric] * (1 + tolerance)
+        and ms(metric, value) >= noise_floor_ms
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=50, help="suggest calls per catalog size")
+    parser.add_argument("--availability-calls", type=int, default=2000)
+    parser.add_argument("--tts-repeats", type=int, default=5)
+    parser.add_argument("--no-tts", action="store_true", help="skip generate_tts_audio")
+    parser.add_argument("--out", default=os.path.join(PROJECT_DIR, "results", "benchmarks", "pipeline.json"),
+                        help="path for the JSON report ('' to skip)")
+    parser.add_argument("--baseline", help="earlier report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+    # read it first, --out may point at the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    workdir = tempfile.mkdtemp(prefix="alice-bench-")
+    report = {"sizes": [], "tts": None}
+    try:
+        for n in args.sizes:
+            result = bench_size(n, workdir, args.requests, args.availability_calls)
+            report["sizes"].append(result)
+            print(f"{n:>7} restaurants: preprocess {result['preprocess']['full_s']}s "
+                  f"(incremental {result['preprocess']['incremental_s']}s, "
+                  f"renamed {result['preprocess']['renamed_s']}s, restart {result['preprocess']['restart_s']}s), "
+                  f"suggest cold p50 {result['suggest']['cold']['p50_ms']} ms / "
+                  f"warm p50 {result['suggest']['warm']['p50_ms']} ms, "
+                  f"is_available p50 {result['is_available']['p50_ms']} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if not args.no_tts:
+        report["tts"] = bench_tts(args.tts_repeats)
+        for result in report["tts"] or []:
+            print(f"{result['characters']:>7} characters: generate_tts_audio first {result['first_ms']} ms, "
+                  f"repeat p50 {result['repeat']['p50_ms']} ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        slower = regressions(report, baseline, args.tolerance)
+        for metric, before, now in slower:
+            print(f"REGRESSION {metric}: {before} -> {now}")
+        if slower:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Compare the restaurant scorers (TF–IDF vs. sentence embeddings): latency and quality.
+
+Every query is built from form slots the way the suggest action builds it
+(preference_text(), with the same cuisine & diet masks) and has the cuisine
+a good recommender should rank first. Free-text cuisine words ("sushi") only
+reach a scorer with ALICE_SCORER=embedding, where the form keeps them in
+cuisine_wishes; with TF–IDF the form rejects them and asks again, so the
+TF–IDF numbers of those queries only show what it would rank.
+Quality is reported as hit@1 (best restaurant has that cuisine) and
+precision@3, for all queries and for the free-text ones; latency is measured
+per scores() call on the current catalog.
+Embedding scoring needs the optional sentence-transformers package.
+
+Run it from the repository root after `python3 preprocess.py`:
+    python3 benchmarks/bench_scorers.py --scorers tfidf embedding
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from actions.catalog import CatalogLoader  # noqa: E402
+from actions.scorers import TfidfScorer, EmbeddingScorer, DEFAULT_EMBEDDING_MODEL, preference_text  # noqa: E402
+
+# (cuisine_preferences, cuisine_wishes, dietary_preferences, expected cuisine);
+# "no" to the diet question means no diet filter
+QUERIES = [
+    (["italian"], [], ["vegetarian"], "Italian"),
+    (["japanese"], [], ["vegan"], "Japanese"),
+    (["mexican"], [], ["gluten-free"], "Mexican"),
+    (["indian"], [], ["halal"], "Indian"),
+    ([], ["sushi"], [], "Japanese"),
+    ([], ["ramen"], [], "Japanese"),
+    ([], ["pasta", "pizza"], [], "Italian"),
+    ([], ["tacos"], [], "Mexican"),
+    ([], ["curry"], ["vegetarian"], "Indian"),
+    ([], ["dim sum"], [], "Chinese"),
+    ([], ["pad thai"], [], "Thai"),
+    ([], ["croissants"], [], "French"),
+    ([], ["bratwurst"], [], "German"),
+    (["italian"], ["pizza"], [], "Italian"),
+]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def evaluate(scorer, catalog, repeats):
+    hits, free_text_hits, precision, latencies = 0, 0, 0.0, []
+    for cuisines, wishes, diets, cuisine in QUERIES:
+        query = preference_text(cuisines, diets, wishes)
+        scorer.scores(catalog, query)  # warm-up (query embedding cache, lazy loads)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            scores = scorer.scores(catalog, query)
+            latencies.append(time.perf_counter() - start)
+
+        # the suggest action's hard filters: named cuisines and every diet
+        mask = catalog.index.diet_mask(diets)
+        if cuisines:
+            mask &= catalog.index.cuisine_mask(cuisines)
+        top = catalog.index.top_k(np.asarray(scores), mask, k=3)
+        found = [catalog.index.restaurant(row)["cuisine"] for row in top]
+        hit = found[:1] == [cuisine]
+        hits += hit
+        free_text_hits += hit and bool(wishes)
+        precision += sum(c == cuisine for c in found) / len(found) if found else 0.0
+
+    free_text = sum(bool(wishes) for _, wishes, _, _ in QUERIES)
+    return {
+        "scorer": scorer.name,
+        "queries": len(QUERIES),
+        "restaurants": len(catalog.index),
+        "hit_at_1": round(hits / len(QUERIES), 3),
+        "free_text_hit_at_1": round(free_text_hits / free_text, 3),
+        "precision_at_3": round(precision / len(QUERIES), 3),
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scorers", nargs="+", default=["tfidf", "embedding"],
+                        choices=["tfidf", "embedding"])
+    parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--out", help="optional path for a JSON report")
+    args = parser.parse_args()
+
+    catalog = CatalogLoader().current()
+    report = []
+    for kind in args.scorers:
+        if kind == "embedding":
+            try:
+                start = time.perf_counter()
+                scorer = EmbeddingScorer(args.model)
+                scorer.restaurant_embeddings(catalog)  # computed once, then cached on disk
+                print(f"embedding: model + restaurant embeddings ready in {time.perf_counter() - start:.2f}s")
+            except ImportError:
+                print("embedding: skipped (pip install sentence-transformers)")
+                continue
+        else:
+            scorer = TfidfScorer()
+
+        result = evaluate(scorer, catalog, args.repeats)
+        report.append(result)
+        print(f"{result['scorer']:>9}: hit@1 {result['hit_at_1']} (free text {result['free_text_hit_at_1']}), "
+              f"P@3 {result['precision_at_3']}, "
+              f"mean {result['latency_mean_ms']} ms, p95 {result['latency_p95_ms']} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"catalog": catalog.version, "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+End-of-speech latency of server-side speech recognition (stt.py).
+
+Every WAV fixture (16-bit, mono or first channel, any sample rate; an
+optional <name>.txt next to it holds the expected transcript) is streamed
+through a StreamingTranscriber in 20 ms chunks, like the browser does, once
+with early endpointing and once with fixed-silence endpointing only.
+Reported per mode:
+  endpoint_ms   end of speech in the file -> final result ready
+                (silence waited + final decoding)
+  decode_ms     final decoding alone
+  rtf           processing time / audio duration
+  wer           word error rate against the transcripts
+
+Fixtures are recorded WAVs in benchmarks/fixtures/stt/ (not in git); with
+--make-fixtures the test_nlu.yml examples are synthesized with Kokoro instead.
+
+    ALICE_STT_MODEL=models/vosk-model-small-en-us-0.15 python3 benchmarks/bench_stt.py
+    python3 benchmarks/bench_stt.py --make-fixtures --model models/vosk-model-small-en-us-0.15
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import wave
+import argparse
+import statistics
+
+import numpy as np
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from stt import SAMPLE_RATE, SpeechRecognizer  # noqa: E402
+
+CHUNK_MS      = 20
+SPEECH_LEVEL  = 500    # int16 amplitude that counts as speech when locating its end
+TRAILING_S    = 1.5    # silence appended to synthesized fixtures
+
+
+def read_wav(path):
+    """(int16 samples of the first channel, sample rate)"""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        return samples[::f.getnchannels()], f.getframerate()
+
+
+def write_wav(path, samples, sample_rate):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.astype(np.int16).tobytes())
+
+
+def speech_end_ms(samples, sample_rate):
+    loud = np.flatnonzero(np.abs(samples.astype(np.int32)) > SPEECH_LEVEL)
+    return (loud[-1] + 1) * 1000 / sample_rate if loud.size else 0.0
+
+
+def words(text):
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        current = [i]
+        for j, hyp in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref != hyp)))
+        previous = current
+    return previous[-1]
+
+
+def make_fixtures(directory, test_data, limit):
+    """Synthesizes the test_nlu.yml examples with Kokoro as 16 kHz WAVs + transcripts."""
+    from kokoro import KPipeline
+    from fast_intents import load_nlu_examples, strip_annotations
+
+    os.makedirs(directory, exist_ok=True)
+    pipeline = KPipeline(lang_code="a")
+    examples = [(intent, strip_annotations(text)) for intent, text in load_nlu_examples(test_data)][:limit]
+    for i, (intent, text) in enumerate(examples):
+        audio = np.concatenate([np.asarray(chunk) for _, _, chunk in pipeline(text, voice="af_heart")
+                                if chunk is not None and len(chunk)])
+        audio = np.interp(np.arange(0, len(audio), 24000 / SAMPLE_RATE), np.arange(len(audio)), audio)
+        padded = np.concatenate([np.zeros(SAMPLE_RATE // 4), audio, np.zeros(int(SAMPLE_RATE * TRAILING_S))])
+        name = os.path.join(directory, f"{i:03d}_{intent}")
+        write_wav(name + ".wav", np.clip(padded * 32767, -32768, 32767), SAMPLE_RATE)
+        with open(name + ".txt", "w") as f:
+            f.write(text + "\n")
+    print(f"Wrote {len(examples)} fixtures to {directory}")
+
+
+def run_fixture(recognizer, samples, sample_rate):
+    """Streams one file; returns (first final event, audio ms at which it was emitted, processing s)."""
+    transcriber = recognizer.transcriber(sample_rate)
+    chunk = sample_rate * CHUNK_MS // 1000
+    processing = 0.0
+    for start in range(0, len(samples), chunk):
+        begin = time.perf_counter()
+        events = transcriber.feed(samples[start:start + chunk].tobytes())
+        processing += time.perf_counter() - begin
+        for event in events:
+            if event["type"] == "final" and event["text"]:
+                return event, transcriber.audio_ms, processing
+    begin = time.perf_counter()
+    event = transcriber.finish()
+    processing += time.perf_counter() - begin
+    return event, transcriber.audio_ms, processing
+
+
+def summarize(rows):
+    endpoints = [row["endpoint_ms"] for row in rows if row["endpoint_ms"] is not None]
+    errors = sum(row["word_errors"] for row in rows if row["word_errors"] is not None)
+    reference_words = sum(row["reference_words"] for row in rows if row["word_errors"] is not None)
+    return {
+        "files": len(rows),
+        "no_result": sum(row["endpoint_ms"] is None for row in rows),
+        "endpoint_p50_ms": round(statistics.median(endpoints), 1) if endpoints else None,
+        "endpoint_p95_ms": round(float(np.percentile(endpoints, 95)), 1) if endpoints else None,
+        "endpoint_mean_ms": round(statistics.mean(endpoints), 1) if endpoints else None,
+        "decode_mean_ms": round(statistics.mean(row["decode_ms"] for row in rows), 2) if rows else None,
+        "rtf": round(sum(row["processing_s"] for row in rows) / sum(row["audio_s"] for row in rows), 4),
+        "wer": round(errors / reference_words, 3) if reference_words else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=os.environ.get("ALICE_STT_MODEL"),
+                        help="Vosk model directory (default: $ALICE_STT_MODEL)")
+    parser.add_argument("--fixtures", default=os.path.join(PROJECT_DIR, "benchmarks", "fixtures", "stt"))
+    parser.add_argument("--make-fixtures", action="store_true",
+                        help="synthesize fixtures from --test-data with Kokoro first")
+    parser.add_argument("--test-data", default=os.path.join(PROJECT_DIR, "data", "test_nlu.yml"))
+    parser.add_argument("--limit", type=int, default=40, help="number of fixtures to synthesize")
+    parser.add_argument("--silence-ms", type=int, default=600)
+    parser.add_argument("--min-silence-ms", type=int, default=240)
+    parser.add_argument("--stable-ms", type=int, default=300)
+    parser.add_argument("--out", default=os.path.join(PROJECT_DIR, "results", "benchmarks", "stt.json"),
+                        help="path for the JSON report ('' to skip)")
+    args = parser.parse_args()
+
+    if args.make_fixtures:
+        make_fixtures(args.fixtures, args.test_data, args.limit)
+    if not args.model:
+        parser.error("no Vosk model: pass --model or set ALICE_STT_MODEL")
+    paths = sorted(glob.glob(os.path.join(args.fixtures, "*.wav")))
+    if not paths:
+        parser.error(f"no WAV fixtures in {args.fixtures} (record some or use --make-fixtures)")
+
+    modes = {
+        "early": SpeechRecognizer(args.model, silence_ms=args.silence_ms,
+                                  min_silence_ms=args.min_silence_ms, stable_ms=args.stable_ms),
+        # stable partials never end the utterance: only silence_ms does
+        "fixed_silence": SpeechRecognizer(args.model, silence_ms=args.silence_ms,
+                                          min_silence_ms=args.silence_ms, stable_ms=10 ** 9),
+    }
+
+    report = {"fixtures": len(paths), "chunk_ms": CHUNK_MS, "silence_ms": args.silence_ms,
+              "min_silence_ms": args.min_silence_ms, "stable_ms": args.stable_ms, "modes": {}}
+    for mode, recognizer in modes.items():
+        rows = []
+        for path in paths:
+            samples, sample_rate = read_wav(path)
+            event, emitted_ms, processing = run_fixture(recognizer, samples, sample_rate)
+            transcript_path = os.path.splitext(path)[0] + ".txt"
+            reference = None
+            if os.path.exists(transcript_path):
+                with open(transcript_path) as f:
+                    reference = words(f.read())
+            hypothesis = words(event["text"]) if event else []
+            rows.append({
+                "file": os.path.basename(path),
+                "text": event["text"] if event else None,
+                # audio after the end of speech the recognizer consumed, plus the final decoding
+                "endpoint_ms": (round(emitted_ms - speech_end_ms(samples, sample_rate) + event["decode_ms"], 1)
+                                if event else None),
+                "decode_ms": event["decode_ms"] if event else 0.0,
+                "processing_s": processing,
+                "audio_s": len(samples) / sample_rate,
+                "word_errors": word_errors(reference, hypothesis) if reference is not None else None,
+                "reference_words": len(reference) if reference is not None else 0,
+            })
+        report["modes"][mode] = dict(summarize(rows), files_detail=rows)
+        summary = report["modes"][mode]
+        print(f"{mode:>13}: endpoint p50 {summary['endpoint_p50_ms']} ms, p95 {summary['endpoint_p95_ms']} ms, "
+              f"decode {summary['decode_mean_ms']} ms, RTF {summary['rtf']}, WER {summary['wer']} "
+              f"({summary['no_result']} without result)")
+
+    early, fixed = report["modes"]["early"], report["modes"]["fixed_silence"]
+    if early["endpoint_mean_ms"] is not None and fixed["endpoint_mean_ms"] is not None:
+        report["saved_mean_ms"] = round(fixed["endpoint_mean_ms"] - early["endpoint_mean_ms"], 1)
+        print(f"early endpointing saves {report['saved_mean_ms']} ms per utterance on average")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
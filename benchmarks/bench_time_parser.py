@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Accuracy and latency of the local time/number parser (optionally vs. Duckling).
+
+Runs every example of data/test_nlu.yml (plus a few booking phrasings from
+data/nlu.yml) through components/datetime_parser.py with a fixed reference
+time and compares the time & number entities with the expected values:
+examples without a date, time or guest count must not produce any.
+
+    python3 benchmarks/bench_time_parser.py
+    python3 benchmarks/bench_time_parser.py --duckling-url http://localhost:8000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from components.datetime_parser import DEFAULT_TIMEZONE, parse_entities  # noqa: E402
+from fast_intents import load_nlu_examples, strip_annotations  # noqa: E402
+
+# Thursday afternoon: "7 PM" is still today, "10 am" already means tomorrow
+REFERENCE_TIME = "2025-04-24T15:30:00"
+
+# expected (entity, value) pairs for REFERENCE_TIME; every other example expects none
+EXPECTED = {
+    "I need a table for 2 people": [("number", 2)],
+    "Book a table for five people": [("number", 5)],
+    "I want to eat at 7 PM": [("time", "2025-04-24T19:00:00+02:00")],
+    "Tomorrow at 6pm": [("time", "2025-04-25T18:00:00+02:00")],
+    # booking phrasings from data/nlu.yml
+    "I need a table for tomorrow": [("time", "2025-04-25T00:00:00+02:00")],
+    "I will book a table for 5 people": [("number", 5)],
+    "I want to eat at 10 am": [("time", "2025-04-25T10:00:00+02:00")],
+    "I need a table on April 6th": [("time", "2026-04-06T00:00:00+02:00")],
+    "I want to book a table for two people": [("number", 2)],
+    # "X to H" resolves H before going back an hour (noon, not midnight)
+    "A table at quarter to 12": [("time", "2025-04-25T11:45:00+02:00")],
+    "Quarter to 12 tomorrow": [("time", "2025-04-25T11:45:00+02:00")],
+    "Tomorrow at 12": [("time", "2025-04-25T12:00:00+02:00")],
+}
+EXTRA_EXAMPLES = [
+    "I need a table for tomorrow",
+    "I will book a table for 5 people",
+    "I want to eat at 10 am",
+    "I need a table on April 6th",
+    "I want to book a table for two people",
+    "A table at quarter to 12",
+    "Quarter to 12 tomorrow",
+    "Tomorrow at 12",
+]
+
+def load_examples(path):
+    """Plain example texts of a Rasa NLU yaml file (entity annotations removed)."""
+    return [strip_annotations(example) for _, example in load_nlu_examples(path)]
+
+
+def normalize(entity, value):
+    if entity == "time":
+        return datetime.fromisoformat(value).isoformat()
+    return float(value)
+
+
+def local_parser(now, timezone):
+    def parse(text):
+        return [(e["entity"], e["value"]) for e in parse_entities(text, now=now, timezone=timezone)]
+    return parse
+
+
+def duckling_parser(url, now, timezone):
+    import requests
+
+    http = requests.Session()
+
+    def parse(text):
+        response = http.post(f"{url.rstrip('/')}/parse", timeout=5, data={
+            "text": text, "locale": "en_US", "tz": timezone,
+            "dims": json.dumps(["time", "number"]), "reftime": int(now.timestamp() * 1000),
+        })
+        response.raise_for_status()
+        found = []
+        for match in response.json():
+            value = match["value"]
+            # intervals ("tonight") -> start, like Rasa's DucklingEntityExtractor
+            value = value.get("value") if value.get("type") == "value" else (value.get("from") or {}).get("value")
+            if value is not None:
+                found.append((match["dim"], value))
+        return found
+    return parse
+
+
+def evaluate(name, parse, examples):
+    tp = fp = fn = 0
+    errors, latencies = [], []
+    for text in examples:
+        start = time.perf_counter()
+        found = parse(text)
+        latencies.append(time.perf_counter() - start)
+
+        got = {(entity, normalize(entity, value)) for entity, value in found}
+        want = {(entity, normalize(entity, value)) for entity, value in EXPECTED.get(text, [])}
+        tp += len(got & want)
+        fp += len(got - want)
+        fn += len(want - got)
+        if got != want:
+            errors.append({"text": text, "expected": sorted(want), "got": sorted(got)})
+
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    latencies.sort()
+    return {
+        "parser": name,
+        "examples": len(examples),
+        "precision": round(precision, 3),
+        "recall": round(recall, 3),
+        "exact_examples": len(examples) - len(errors),
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "latency_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--test-data", default=os.path.join(PROJECT_DIR, "data", "test_nlu.yml"))
+    parser.add_argument("--duckling-url", help="also benchmark a running Duckling server")
+    parser.add_argument("--timezone", default=DEFAULT_TIMEZONE)
+    parser.add_argument("--out", help="optional path for a JSON report")
+    args = parser.parse_args()
+
+    now = datetime.fromisoformat(REFERENCE_TIME).replace(tzinfo=ZoneInfo(args.timezone))
+    examples = load_examples(args.test_data) + EXTRA_EXAMPLES
+
+    parsers = [("local", local_parser(now, args.timezone))]
+    if args.duckling_url:
+        parsers.append(("duckling", duckling_parser(args.duckling_url, now, args.timezone)))
+
+    report = []
+    for name, parse in parsers:
+        result = evaluate(name, parse, examples)
+        report.append(result)
+        print(f"{name:>8}: precision {result['precision']}, recall {result['recall']}, "
+              f"{result['exact_examples']}/{result['examples']} examples exact, "
+              f"mean {result['latency_mean_ms']} ms, p95 {result['latency_p95_ms']} ms")
+        for error in result["errors"]:
+            print(f"          {error['text']!r}: expected {error['expected']}, got {error['got']}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"reference_time": REFERENCE_TIME, "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
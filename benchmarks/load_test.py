@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Load test for the /process endpoint with many concurrent sessions.
+
+Each simulated user gets its own session ID (X-Session-ID header) and sends
+a short booking conversation turn by turn. The test is repeated for
+increasing numbers of concurrent sessions and reports how throughput scales.
+With --stories, the sessions replay the conversations of data/stories.yml
+instead (round robin; user turns are rendered from their intent & entities).
+
+Run it against a running gateway (./start_bot.sh), or against one that talks
+to benchmarks/stub_rasa.py to measure the gateway and TTS alone:
+    python3 benchmarks/load_test.py --sessions 1 2 4 8 16
+    python3 benchmarks/load_test.py --stories data/stories.yml --sessions 4 16
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import statistics
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import yaml
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from fast_intents import load_nlu_examples, strip_annotations  # noqa: E402
+
+# One typical booking conversation (new booking path)
+DEFAULT_CONVERSATION = [
+    "hi",
+    "I want to book a table",
+    "no",
+    "italian",
+    "vegetarian",
+    "tomorrow at 7pm",
+    "two people",
+    "yes",
+]
+
+
+def intent_examples(nlu_path):
+    """First plain example text of every intent in a Rasa NLU yaml file."""
+    examples = {}
+    for intent, example in load_nlu_examples(nlu_path):
+        examples.setdefault(intent, strip_annotations(example))
+    return examples
+
+
+def render_entities(entities):
+    """Story entities -> a user utterance, e.g. 'I want vegetarian Italian food for 2 people at 7 PM'."""
+    values = {}
+    for entity in entities:
+        if isinstance(entity, dict):
+            values.update(entity)
+    parts = []
+    if "dietary_preferences" in values:
+        parts.append(str(values.pop("dietary_preferences")))
+    if "cuisine_preferences" in values:
+        parts.append(f"{values.pop('cuisine_preferences')} food")
+    if "number" in values:
+        parts.append(f"for {values.pop('number')} people")
+    if "time" in values:
+        when = str(values.pop("time"))
+        try:
+            dt = datetime.fromisoformat(when)
+            when = dt.strftime("on %B %d") + ("" if dt.hour == dt.minute == 0 else dt.strftime(" at %I:%M %p"))
+        except ValueError:
+            when = f"at {when}"
+        parts.append(when)
+    if values:
+        parts.extend(str(v) for v in values.values())  # e.g. a restaurant name
+    elif not parts or parts[0].startswith(("for ", "on ", "at ")):
+        parts.insert(0, "a table")
+    return "I want " + " ".join(parts)
+
+
+def story_conversations(stories_path, nlu_path):
+    """User turns of every story: its `user` text, or rendered from intent & entities."""
+    with open(stories_path) as f:
+        stories = yaml.safe_load(f).get("stories", [])
+    examples = intent_examples(nlu_path)
+    conversations = []
+    for story in stories:
+        turns = []
+        for step in story.get("steps", []):
+            if "user" in step:
+                turns.append(strip_annotations(step["user"]))
+            elif "intent" in step:
+                entities = step.get("entities") or []
+                turns.append(render_entities(entities) if entities else examples.get(step["intent"], step["intent"]))
+        if turns:
+            conversations.append(turns)
+    return conversations
+
+
+def run_session(base_url, conversation, endpoint="/process"):
+    """Plays one conversation with its own session; returns per-turn latencies (s)."""
+    session_id = uuid.uuid4().hex
+    latencies, errors = [], 0
+    with requests.Session() as http:
+        for text in conversation:
+            start = time.perf_counter()
+            try:
+                response = http.post(base_url + endpoint, json={"text": text},
+                                     headers={"X-Session-ID": session_id}, timeout=120)
+                response.raise_for_status()
+                if endpoint == "/process_stream":
+                    response.content  # wait for the whole stream
+                else:
+                    response.json()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_level(base_url, conversations, sessions, endpoint):
+    """Runs `sessions` conversations concurrently (round robin) and summarizes them."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda i: run_session(base_url, conversations[i % len(conversations)], endpoint),
+                                range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [lat for lats, _ in results for lat in lats]
+    errors = sum(err for _, err in results)
+    return {
+        "sessions": sessions,
+        "turns": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_turns_per_s": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "latency_mean_s": statistics.mean(latencies) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--endpoint", default="/process", choices=["/process", "/process_stream"])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--stories", help="replay the conversations of a Rasa stories file")
+    parser.add_argument("--nlu", default=os.path.join(PROJECT_DIR, "data", "nlu.yml"),
+                        help="example texts for story turns without entities")
+    parser.add_argument("--out", default=os.path.join(PROJECT_DIR, "results", "benchmarks", "load_test.json"),
+                        help="path for the JSON report ('' to skip)")
+    args = parser.parse_args()
+
+    conversations = story_conversations(args.stories, args.nlu) if args.stories else [DEFAULT_CONVERSATION]
+    report = []
+    for sessions in args.sessions:
+        level = run_level(args.url, conversations, sessions, args.endpoint)
+        report.append(level)
+        print(f"{sessions:>4} sessions: {level['throughput_turns_per_s']} turns/s, "
+              f"p50 {level['latency_p50_s']}, p95 {level['latency_p95_s']}, "
+              f"errors {level['errors']}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump({
+                "endpoint": args.endpoint,
+                "conversations": args.stories or "default",
+                "levels": report,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Stub Rasa server, so app.py can be benchmarked without Rasa, actions and NLU.
+
+Answers POST /webhooks/rest/webhook like Rasa's REST channel: every sender
+walks through a typical booking dialogue (the texts of domain.yml), one bot
+reply per user message, after an optional artificial delay. GET / and
+GET /conversations/<sender>/tracker are answered as well.
+
+    python3 benchmarks/stub_rasa.py --port 5006 --delay-ms 50
+    ALICE_RASA_URL=http://localhost:5006/webhooks/rest/webhook \\
+        gunicorn -c gunicorn.conf.py app:app
+"""
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# bot replies of a new booking, in order (the suggestion comes from the action server)
+DIALOGUE = [
+    "utter_greet",
+    "utter_ask_past_bookings",
+    "utter_ask_cuisine_preferences",
+    "utter_ask_dietary_preferences",
+    "utter_ask_date_and_time",
+    "utter_ask_num_of_guests",
+    "Based on your preferences, I recommend La Bella Italia. It offers Italian cuisine "
+    "and can seat 2 on 2025-04-25 at 7:00 PM. Shall I book it?",
+    "utter_submit",
+]
+
+TRACKER_PATH = re.compile(r"^/conversations/([^/]+)/tracker")
+
+
+def load_replies(domain_path):
+    """DIALOGUE with every response name replaced by its first text in domain.yml."""
+    with open(domain_path) as f:
+        responses = yaml.safe_load(f).get("responses", {})
+    return [responses[step][0]["text"] if step in responses else step for step in DIALOGUE]
+
+
+class StubRasa:
+    def __init__(self, replies, delay):
+        self.replies = replies
+        self.delay   = delay
+        self._turns  = {}  # sender -> number of messages so far
+        self._lock   = threading.Lock()
+
+    def reply(self, sender, message):
+        with self._lock:
+            turn = self._turns.get(sender, 0)
+            self._turns[sender] = turn + 1
+        if self.delay:
+            time.sleep(self.delay)
+        return [{"recipient_id": sender, "text": self.replies[turn % len(self.replies)]}]
+
+    def tracker(self, sender):
+        with self._lock:
+            turn = self._turns.get(sender, 0)
+        return {"sender_id": sender, "slots": {}, "latest_message": {}, "events": [],
+                "active_loop": {}, "latest_action_name": "action_listen", "turns": turn}
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            match = TRACKER_PATH.match(self.path)
+            if match:
+                self._send_json(stub.tracker(match.group(1)))
+            elif self.path == "/":
+                self._send_json({"status": "ok", "stub": True})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                data = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json({"error": "invalid json"}, status=400)
+                return
+            if self.path.rstrip("/") != "/webhooks/rest/webhook":
+                self._send_json({"error": "not found"}, status=404)
+                return
+            self._send_json(stub.reply(data.get("sender", "default"), data.get("message", "")))
+
+        def log_message(self, format, *args):
+            pass  # one line per request would dominate the benchmark
+
+    return Handler
+
+
+def serve(port, delay, domain_path=os.path.join(PROJECT_DIR, "domain.yml")):
+    """Starts the stub in a background thread; returns the server (call .shutdown())."""
+    stub = StubRasa(load_replies(domain_path), delay)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(stub))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=5006)
+    parser.add_argument("--delay-ms", type=float, default=0.0,
+                        help="artificial NLU/dialogue latency per message")
+    parser.add_argument("--domain", default=os.path.join(PROJECT_DIR, "domain.yml"))
+    args = parser.parse_args()
+
+    server = serve(args.port, args.delay_ms / 1000, args.domain)
+    print(f"Stub Rasa listening on http://127.0.0.1:{args.port}/webhooks/rest/webhook")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Text, Tuple
+from zoneinfo import ZoneInfo
+
+# Local replacement for the Duckling "time" and "number" dimensions.
+#
+# Covers the expressions of the booking flow: relative days (today, tonight,
+# tomorrow, the day after tomorrow, in 3 days, (next) friday), calendar dates
+# (April 6th, 6 April, the 6th, 4/6, 2025-04-06, 06.04.2025), clock times
+# (7pm, 7:30 pm, 19:00, at 7, 7 o'clock, half past 7, noon) and guest counts
+# (2, two, twenty one).
+#
+# Entities use Duckling's format, so validate_date_and_time and
+# validate_num_of_guests work unchanged:
+#   time   -> "2025-04-26T18:00:00.000+02:00" (a date without a time is 00:00)
+#   number -> 2
+#
+# Like Duckling, expressions are resolved into the future: a time that has
+# already passed today means tomorrow, a date that has passed means next year.
+# A bare hour from 1 to 11 ("at 7") is read as PM, unless the user says
+# "morning" or "am" - people book restaurants for lunch or dinner.
+
+DEFAULT_TIMEZONE = "Europe/Luxembourg"
+
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50}
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_WEEKDAY = "|".join(WEEKDAYS)
+_UNIT = "|".join(sorted(UNITS, key=len, reverse=True))
+_TEN = "|".join(TENS)
+_NUMBER_WORD = rf"(?:(?:{_TEN})(?:[\s-](?:{_UNIT}))?|{_UNIT})"
+_HOUR = rf"(?:\d{{1,2}}|{_UNIT})"
+_AMPM = r"(?:a\.?m\.?|p\.?m\.?)(?![a-z])"
+_ORD = r"(?:st|nd|rd|th)?"
+
+
+def _rx(pattern: Text):
+    return re.compile(pattern, re.IGNORECASE)
+
+
+DATE_PATTERNS = [
+    ("iso", _rx(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")),
+    ("dotted", _rx(r"\b(\d{1,2})\.(\d{1,2})\.(\d{2,4})\b")),
+    ("slash", _rx(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b")),  # en_US: month/day
+    ("month_day", _rx(rf"\b({_MONTH})\.?\s+(?:the\s+)?(\d{{1,2}}){_ORD}\b(?:,?\s+(\d{{4}})\b)?")),
+    ("day_month", _rx(rf"\b(?:the\s+)?(\d{{1,2}}){_ORD}\s+(?:of\s+)?({_MONTH})\b\.?(?:,?\s+(\d{{4}})\b)?")),
+    ("after_tomorrow", _rx(r"\b(?:the\s+)?day\s+after\s+tomorrow\b")),
+    ("tomorrow", _rx(r"\btomorrow\b")),
+    ("today", _rx(r"\btoday\b")),
+    ("tonight", _rx(r"\b(?:tonight|this\s+evening)\b")),
+    ("in_days", _rx(rf"\bin\s+(\d{{1,2}}|{_NUMBER_WORD}|a|one)\s+(days?|weeks?)\b")),
+    ("weekday", _rx(rf"\b(?:(this|next|coming)\s+)?({_WEEKDAY})\b")),
+    ("ordinal", _rx(r"\bthe\s+(\d{1,2})(?:st|nd|rd|th)\b")),
+]
+
+TIME_PATTERNS = [
+    ("clock", _rx(rf"\b(\d{{1,2}})[:.](\d{{2}})\s*({_AMPM})?")),
+    ("past", _rx(rf"\b(half|quarter)\s+past\s+({_HOUR})\b\s*({_AMPM})?")),
+    ("to", _rx(rf"\bquarter\s+to\s+({_HOUR})\b\s*({_AMPM})?")),
+    ("ampm", _rx(rf"\b({_HOUR})\s*({_AMPM})")),
+    ("oclock", _rx(rf"\b({_HOUR})\s*o['’]?\s?clock\b")),
+    ("noon", _rx(r"\b(?:noon|midday)\b")),
+    ("at_hour", _rx(rf"\bat\s+({_HOUR})\b(?!\s*(?:people|persons|guests|of\s+us)\b)")),
+]
+
+PART_OF_DAY = [
+    (_rx(r"\b(?:in\s+the\s+)?morning\b"), "am"),
+    (_rx(r"\b(?:in\s+the\s+)?(?:afternoon|evening)\b|\btonight\b"), "pm"),
+]
+
+NUMBER_PATTERN = _rx(rf"(?<![\w.:/-])(\d{{1,3}})(?![\w.:/])|\b({_NUMBER_WORD})\b")
+
+Span = Tuple[int, int]
+
+
+def number_value(token: Text) -> Optional[int]:
+    """'7' / 'seven' / 'twenty-one' -> int."""
+    token = token.lower().strip()
+    if token.isdigit():
+        return int(token)
+    if token in ("a", "one"):
+        return 1
+    parts = re.split(r"[\s-]+", token)
+    if len(parts) == 1:
+        return UNITS.get(parts[0], TENS.get(parts[0]))
+    if len(parts) == 2 and parts[0] in TENS and parts[1] in UNITS:
+        return TENS[parts[0]] + UNITS[parts[1]]
+    return None
+
+
+def _overlaps(span: Span, taken: List[Span]) -> bool:
+    return any(span[0] < end and start < span[1] for start, end in taken)
+
+
+def _future_date(year: Optional[int], month: int, day: int, today: date) -> Optional[date]:
+    try:
+        if year is not None:
+            return date(year + 2000 if year < 100 else year, month, day)
+        candidate = date(today.year, month, day)
+        return candidate if candidate >= today else date(today.year + 1, month, day)
+    except ValueError:
+        return None
+
+
+def _next_day_of_month(day: int, today: date) -> Optional[date]:
+    """'the 6th': this month, or the next month that has that day if it has passed."""
+    year, month = today.year, today.month
+    for _ in range(12):
+        try:
+            candidate = date(year, month, day)
+            if candidate >= today:
+                return candidate
+        except ValueError:
+            pass
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return None
+
+
+def _find_date(text: Text, today: date) -> Optional[Tuple[date, Span, bool]]:
+    """(date, span, is evening) of the first date expression."""
+    for kind, pattern in DATE_PATTERNS:
+        m = pattern.search(text)
+        if not m:
+            continue
+        g = m.groups()
+        found = None
+        if kind == "iso":
+            found = _future_date(int(g[0]), int(g[1]), int(g[2]), today)
+        elif kind == "dotted":
+            found = _future_date(int(g[2]), int(g[1]), int(g[0]), today)
+        elif kind == "slash":
+            found = _future_date(int(g[2]) if g[2] else None, int(g[0]), int(g[1]), today)
+        elif kind == "month_day":
+            found = _future_date(int(g[2]) if g[2] else None, MONTHS[g[0].lower()], int(g[1]), today)
+        elif kind == "day_month":
+            found = _future_date(int(g[2]) if g[2] else None, MONTHS[g[1].lower()], int(g[0]), today)
+        elif kind == "after_tomorrow":
+            found = today + timedelta(days=2)
+        elif kind == "tomorrow":
+            found = today + timedelta(days=1)
+        elif kind in ("today", "tonight"):
+            found = today
+        elif kind == "in_days":
+            count = number_value(g[0])
+            if count is not None:
+                found = today + timedelta(days=count * (7 if g[1].lower().startswith("week") else 1))
+        elif kind == "weekday":
+            ahead = (WEEKDAYS.index(g[1].lower()) - today.weekday()) % 7
+            if g[0] and g[0].lower() == "next" and ahead == 0:
+                ahead = 7
+            found = today + timedelta(days=ahead)
+        elif kind == "ordinal":
+            found = _next_day_of_month(int(g[0]), today)
+        if found is not None:
+            return found, m.span(), kind == "tonight"
+    return None
+
+
+def _hour_24(hour: int, ampm: Optional[Text], part_of_day: Optional[Text]) -> Optional[int]:
+    marker = (ampm or "").lower().replace(".", "") or part_of_day
+    if hour > 23:
+        return None
+    if marker == "am":
+        return 0 if hour == 12 else hour if hour <= 12 else None
+    if marker == "pm":
+        return 12 if hour == 12 else hour + 12 if hour < 12 else hour
+    # no am/pm: 24h clock for 0 and 12-23, otherwise lunch/dinner time
+    return hour if hour == 0 or hour >= 12 else hour + 12
+
+
+def _find_time(text: Text, taken: List[Span]) -> Optional[Tuple[time, Span, Text]]:
+    """(time, span, grain) of the first clock time expression outside `taken` (the date)."""
+    part_of_day = next((value for pattern, value in PART_OF_DAY if pattern.search(text)), None)
+    for kind, m in ((kind, m) for kind, pattern in TIME_PATTERNS for m in pattern.finditer(text)):
+        if _overlaps(m.span(), taken):
+            continue
+        g = m.groups()
+        hour, minute, ampm, grain = None, 0, None, "hour"
+        if kind == "clock":
+            hour, minute, ampm, grain = int(g[0]), int(g[1]), g[2], "minute"
+            if not ampm and hour > 23:
+                continue
+        elif kind == "past":
+            hour, minute, ampm, grain = number_value(g[1]), 30 if g[0].lower() == "half" else 15, g[2], "minute"
+        elif kind == "to":
+            # resolve H first ("quarter to 12" is 11:45, not 23:45), then go back an hour
+            value = number_value(g[0])
+            target = _hour_24(value, g[1], part_of_day) if value else None
+            if target is None:
+                continue
+            return time((target - 1) % 24, 45), (m.start(), m.start() + len(m.group(0).rstrip())), "minute"
+        elif kind == "ampm":
+            hour, ampm = number_value(g[0]), g[1]
+        elif kind in ("oclock", "at_hour"):
+            hour = number_value(g[0])
+        elif kind == "noon":
+            hour, ampm = 12, "pm"
+        if hour is None or minute > 59:
+            continue
+        hour = _hour_24(hour, ampm, part_of_day)
+        if hour is None:
+            continue
+        return time(hour, minute), (m.start(), m.start() + len(m.group(0).rstrip())), grain
+    return None
+
+
+def parse_time(text: Text, now: datetime) -> Tuple[Optional[Dict[Text, Any]], List[Span]]:
+    """
+    One Duckling-style 'time' entity (date and clock time merged) or None,
+    plus the text spans it was built from.
+    """
+    found_date = _find_date(text, now.date())
+    found_time = _find_time(text, [found_date[1]] if found_date else [])
+    if not found_date and not found_time:
+        return None, []
+
+    if found_time:
+        clock, time_span, grain = found_time
+    if found_date:
+        day, date_span, evening = found_date
+    else:
+        # a time only: today, or tomorrow if that time has passed
+        day = now.date() if clock > now.time().replace(tzinfo=None) else now.date() + timedelta(days=1)
+        date_span, evening = time_span, False
+
+    if not found_time:
+        # a date only -> midnight (day grain); "tonight" starts at 6 PM like Duckling's interval
+        clock, time_span, grain = (time(18, 0), date_span, "hour") if evening else (time(0, 0), date_span, "day")
+
+    value = datetime.combine(day, clock, tzinfo=now.tzinfo)
+    start, end = min(date_span[0], time_span[0]), max(date_span[1], time_span[1])
+    iso = value.isoformat(timespec="milliseconds")
+    return {
+        "entity": "time",
+        "start": start,
+        "end": end,
+        "text": text[start:end],
+        "value": iso,
+        "confidence": 1.0,
+        "additional_info": {"value": iso, "grain": grain, "type": "value"},
+    }, [date_span, time_span]
+
+
+def parse_numbers(text: Text, taken: List[Span]) -> List[Dict[Text, Any]]:
+    """Duckling-style 'number' entities outside the spans already used by dates/times."""
+    entities = []
+    for m in NUMBER_PATTERN.finditer(text):
+        if _overlaps(m.span(), taken):
+            continue
+        value = number_value(m.group(0))
+        if value is None:
+            continue
+        entities.append({
+            "entity": "number",
+            "start": m.start(),
+            "end": m.end(),
+            "text": m.group(0),
+            "value": value,
+            "confidence": 1.0,
+            "additional_info": {"value": value, "type": "value"},
+        })
+    return entities
+
+
+def parse_entities(text: Text, now: Optional[datetime] = None, timezone: Text = DEFAULT_TIMEZONE,
+                   dimensions=("time", "number")) -> List[Dict[Text, Any]]:
+    """All time & number entities of one user message, resolved relative to `now`."""
+    now = now or datetime.now(ZoneInfo(timezone))
+    entities = []
+    time_entity, taken = parse_time(text, now) if "time" in dimensions else (None, [])
+    if time_entity:
+        entities.append(time_entity)
+    if "number" in dimensions:
+        entities.extend(parse_numbers(text, taken))
+    return sorted(entities, key=lambda e: e["start"])
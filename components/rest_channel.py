@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional, Text
+
+from rasa.core.channels.rest import RestInput
+from sanic.request import Request
+
+
+class MetadataRestInput(RestInput):
+    """
+    The REST channel, but keeping the "metadata" of the incoming message.
+
+    Rasa's RestInput drops it, so the correlation ID app.py sends with every
+    turn would never reach tracker.latest_message in the action server.
+    Registered under the same name, so the webhook stays /webhooks/rest/webhook.
+    """
+
+    @classmethod
+    def name(cls) -> Text:
+        return "rest"
+
+    def get_metadata(self, request: Request) -> Optional[Dict[Text, Any]]:
+        metadata = (request.json or {}).get("metadata")
+        return metadata if isinstance(metadata, dict) else None
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Any, Dict, List, Text
+from zoneinfo import ZoneInfo
+
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.nlu.extractors.extractor import EntityExtractorMixin
+from rasa.shared.nlu.constants import ENTITIES, TEXT
+from rasa.shared.nlu.training_data.message import Message
+
+from .datetime_parser import DEFAULT_TIMEZONE, parse_entities
+
+
+@DefaultV1Recipe.register(DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR, is_trainable=False)
+class LocalTimeNumberExtractor(GraphComponent, EntityExtractorMixin):
+    """
+    In-process replacement for DucklingEntityExtractor (time & number only).
+
+    Emits entities in Duckling's format, so slot mappings and the form
+    validation actions don't change, but needs no Duckling server: no HTTP
+    round-trip per message and no Docker container that can be down.
+    """
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            "dimensions": ["time", "number"],
+            "timezone": DEFAULT_TIMEZONE,
+        }
+
+    def __init__(self, config: Dict[Text, Any]) -> None:
+        self.component_config = config
+        self.dimensions = config.get("dimensions") or ["time", "number"]
+        self.timezone = ZoneInfo(config.get("timezone") or DEFAULT_TIMEZONE)
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "LocalTimeNumberExtractor":
+        return cls(config)
+
+    def _reference_time(self, message: Message) -> datetime:
+        # like Duckling: the message timestamp (seconds) if the channel set one, else now
+        if getattr(message, "time", None) is not None:
+            try:
+                return datetime.fromtimestamp(float(message.time), self.timezone)
+            except (TypeError, ValueError):
+                pass
+        return datetime.now(self.timezone)
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            text = message.get(TEXT)
+            if not text:
+                continue
+            extracted = parse_entities(text, now=self._reference_time(message), dimensions=self.dimensions)
+            extracted = self.add_extractor_name(extracted)
+            message.set(ENTITIES, message.get(ENTITIES, []) + extracted, add_to_output=True)
+        return messages
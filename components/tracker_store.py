@@ -0,0 +1,251 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Text, Tuple
+
+from rasa.core.brokers.broker import EventBroker
+from rasa.core.tracker_store import TrackerStore
+from rasa.shared.core.constants import ACTION_LISTEN_NAME, ACTION_SESSION_START_NAME
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import ActionExecuted, ActiveLoop, AllSlotsReset, SessionStarted, SlotSet
+from rasa.shared.core.trackers import DialogueStateTracker, get_trackers_for_conversation_sessions
+
+logger = logging.getLogger(__name__)
+
+
+class CompactingSQLiteTrackerStore(TrackerStore):
+    """
+    Tracker store for long-running deployments: conversations live in a local
+    SQLite file instead of the Rasa process, so memory stays flat.
+
+    - compaction: once a booking ends (AllSlotsReset from action_clear_slots
+      or action_log_and_fallback), the events before it are replaced by a
+      session start and a snapshot of the slots and active loop at that
+      point; trackers longer than `max_events` are cut the same way at a
+      user turn. Policies only look at the last few turns (TEDPolicy
+      max_history 5), so loading a tracker stays constant-time.
+    - eviction: conversations idle for longer than `ttl_seconds` are deleted
+    - batched writes: saves are buffered (the latest tracker per sender) and
+      written in one transaction every `flush_interval` seconds or once
+      `batch_size` senders are pending. A crash loses at most that window.
+    - event broker: compaction changes the number of stored events, so new
+      events are found by timestamp (newer than the last saved event), not
+      by counting the stored ones like TrackerStore.stream_events does.
+
+    Not smoke-tested against Rasa 3.6 yet, so endpoints.yml keeps it commented out:
+        tracker_store:
+          type: components.tracker_store.CompactingSQLiteTrackerStore
+          db: data/trackers.db
+    """
+
+    def __init__(
+        self,
+        domain: Optional[Domain] = None,
+        event_broker: Optional[EventBroker] = None,
+        db: Text = "data/trackers.db",
+        ttl_seconds: float = 24 * 60 * 60,
+        max_events: int = 200,
+        flush_interval: float = 1.0,
+        batch_size: int = 32,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(domain, event_broker, **kwargs)
+        self.db_path        = db
+        self.ttl_seconds    = float(ttl_seconds)
+        self.max_events     = int(max_events)
+        self.flush_interval = float(flush_interval)
+        self.batch_size     = int(batch_size)
+
+        # sender -> (events json, saved at, timestamp of the last event)
+        self._pending: Dict[Text, Tuple[Text, float, float]] = {}
+        self._last_flush   = time.monotonic()
+        self._last_evict   = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+
+        directory = os.path.dirname(db)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS trackers (
+                sender_id     TEXT PRIMARY KEY,
+                events        TEXT NOT NULL,
+                updated_at    REAL NOT NULL,
+                last_event_at REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(trackers)")]
+        if "last_event_at" not in columns:  # file written before events were streamed
+            self._conn.execute("ALTER TABLE trackers ADD COLUMN last_event_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS trackers_updated_at ON trackers (updated_at)")
+
+        # counters (logged at debug level on every flush)
+        self.saves       = 0
+        self.writes      = 0
+        self.compactions = 0
+        self.evictions   = 0
+
+    # ------------------------------------------------------------------
+    # TrackerStore interface
+    # ------------------------------------------------------------------
+    async def save(self, tracker: DialogueStateTracker) -> None:
+        if self.event_broker:
+            await self.stream_events(tracker)
+        events = self._compacted_events(tracker)
+        last_event_at = tracker.events[-1].timestamp if tracker.events else self._last_event_at(tracker.sender_id)
+        self._pending[tracker.sender_id] = (json.dumps(events), time.time(), last_event_at)
+        self.saves += 1
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_periodically())
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    async def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        tracker = self._load(sender_id)
+        if tracker is None:
+            return None
+        sessions = get_trackers_for_conversation_sessions(tracker)
+        return sessions[-1] if len(sessions) > 1 else tracker
+
+    async def retrieve_full_tracker(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        return self._load(sender_id)
+
+    async def stream_events(self, tracker: DialogueStateTracker) -> None:
+        """Publish the events added since the last save to the event broker."""
+        last_event_at = self._last_event_at(tracker.sender_id)
+        for event in tracker.events:
+            if event.timestamp > last_event_at:
+                body = {"sender_id": tracker.sender_id}
+                body.update(event.as_dict())
+                self.event_broker.publish(body)
+
+    async def keys(self) -> Iterable[Text]:
+        self._flush()
+        return [row[0] for row in self._conn.execute("SELECT sender_id FROM trackers")]
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _load(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        pending = self._pending.get(sender_id)
+        if pending is not None:
+            serialised, updated_at, _ = pending
+        else:
+            row = self._conn.execute(
+                "SELECT events, updated_at FROM trackers WHERE sender_id = ?", (sender_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            serialised, updated_at = row
+        if time.time() - updated_at > self.ttl_seconds:
+            return None  # expired, deleted with the next eviction
+        return DialogueStateTracker.from_dict(
+            sender_id, json.loads(serialised), self.domain.slots, self.max_event_history
+        )
+
+    def _last_event_at(self, sender_id: Text) -> float:
+        """Timestamp of the newest event saved for `sender_id` (0 if none)."""
+        pending = self._pending.get(sender_id)
+        if pending is not None:
+            return pending[2]
+        row = self._conn.execute(
+            "SELECT last_event_at FROM trackers WHERE sender_id = ?", (sender_id,)
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def _flush(self) -> None:
+        """Write all pending trackers in one transaction (and evict idle ones now and then)."""
+        self._last_flush = time.monotonic()
+        if self._pending:
+            batch = [(sender, *pending) for sender, pending in self._pending.items()]
+            self._pending.clear()
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO trackers (sender_id, events, updated_at, last_event_at) "
+                    "VALUES (?, ?, ?, ?)", batch
+                )
+            self.writes += 1
+        if time.monotonic() - self._last_evict >= min(self.ttl_seconds, 60.0):
+            self._last_evict = time.monotonic()
+            deleted = self._conn.execute(
+                "DELETE FROM trackers WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self.evictions += max(deleted, 0)
+        logger.debug(
+            f"Tracker store: {self.saves} saves in {self.writes} writes, "
+            f"{self.compactions} compactions, {self.evictions} evicted."
+        )
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                try:
+                    self._flush()
+                except sqlite3.Error as e:
+                    logger.error(f"Could not write trackers to {self.db_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+    def _compacted_events(self, tracker: DialogueStateTracker) -> List[Dict[Text, Any]]:
+        events = list(tracker.events)
+        cut = self._cut_index(events)
+        if cut <= 0:
+            return [event.as_dict() for event in events]
+        self.compactions += 1
+        before = DialogueStateTracker.from_events(tracker.sender_id, events[:cut], self.domain.slots)
+        snapshot = self._snapshot(before)
+        for event in snapshot:
+            # as old as the events it replaces, so stream_events never publishes it
+            event.timestamp = events[cut - 1].timestamp
+        return [event.as_dict() for event in snapshot + events[cut:]]
+
+    def _cut_index(self, events: List[Any]) -> int:
+        """Index of the first event to keep (0 = keep everything)."""
+        cut = 0
+        # the booking ended: drop everything before the action that reset the slots
+        for i in range(len(events) - 1, -1, -1):
+            if isinstance(events[i], AllSlotsReset):
+                cut = next((j for j in range(i, -1, -1) if isinstance(events[j], ActionExecuted)), i)
+                break
+        # still too long: start at the first user turn that keeps it below max_events
+        if len(events) - cut > self.max_events:
+            for j in range(len(events) - self.max_events, len(events)):
+                if isinstance(events[j], ActionExecuted) and events[j].action_name == ACTION_LISTEN_NAME:
+                    cut = j
+                    break
+        # a tracker that is nothing but a snapshot already is not cut again
+        return cut if cut > len(self._snapshot_prefix(events)) else 0
+
+    def _snapshot(self, tracker: DialogueStateTracker) -> List[Any]:
+        """Session start + the slot values and active loop of `tracker`."""
+        snapshot: List[Any] = [ActionExecuted(ACTION_SESSION_START_NAME), SessionStarted()]
+        for name, slot in tracker.slots.items():
+            if slot.value != slot.initial_value:
+                snapshot.append(SlotSet(name, slot.value))
+        if tracker.active_loop_name:
+            snapshot.append(ActiveLoop(tracker.active_loop_name))
+        return snapshot
+
+    @staticmethod
+    def _snapshot_prefix(events: List[Any]) -> List[Any]:
+        """Leading session start and SlotSet/ActiveLoop events."""
+        prefix = []
+        for event in events:
+            if isinstance(event, (SessionStarted, SlotSet, ActiveLoop)) or (
+                isinstance(event, ActionExecuted) and event.action_name == ACTION_SESSION_START_NAME
+            ):
+                prefix.append(event)
+            else:
+                break
+        return prefix
@@ -0,0 +1,136 @@
+import re
+import json
+import threading
+
+import yaml
+
+from components.datetime_parser import UNITS, TENS, number_value
+
+# Fast path for short, frequent answers ("yes", "no", "cancel", "thanks",
+# "four people").
+#
+# These turns make up a large share of a booking conversation, yet each one
+# runs through the whole NLU pipeline (featurizers, DIETClassifier, fallback,
+# entity extraction). The gateway looks the normalized text up in a table
+# built from the data/nlu.yml examples of a few unambiguous intents and, on a
+# match, sends Rasa the intent directly in its slash syntax
+# ("/affirm", '/inform_booking_details{"number": 4}'), which Rasa's
+# RegexMessageHandler resolves with confidence 1.0 instead of classifying.
+#
+# Only exact matches after normalization (case, punctuation, apostrophes,
+# whitespace) are taken; an example that appears under two intents is left to
+# the classifier. Everything else goes to Rasa as before.
+
+FAST_INTENTS = ("affirm", "deny", "cancel", "thank_you", "goodbye")
+
+# intent that carries a guest count (slot num_of_guests <- entity number)
+GUESTS_INTENT = "inform_booking_details"
+MAX_GUESTS    = 50
+
+ANNOTATION = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\[[^\]]*\]|\{[^}]*\})")
+
+_NUMBER = "|".join(sorted(list(UNITS) + list(TENS), key=len, reverse=True))
+# "four people", "for 2", "we are five", "two guests" (a bare number is left to Rasa)
+GUESTS_PATTERN = re.compile(
+    rf"^(?:(?:we are|we're|there are|there will be|(?:a )?table for|for|just) )?"
+    rf"(?P<number>\d{{1,2}}|(?:{_NUMBER})(?:[ -](?:{_NUMBER}))?)"
+    rf"(?P<unit> (?:people|persons|guests|adults|of us|pax))?$"
+)
+
+
+def load_nlu_examples(path):
+    """(intent, example) of every intent example in a Rasa NLU yaml file, entity annotations kept."""
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    examples = []
+    for block in data.get("nlu", []):
+        if "intent" not in block:
+            continue
+        for line in (block.get("examples") or "").splitlines():
+            line = line.strip()
+            if line.startswith("- "):
+                examples.append((block["intent"], line[2:]))
+    return examples
+
+
+def strip_annotations(text):
+    """'for [two](number) people' -> 'for two people'."""
+    return ANNOTATION.sub(r"\1", text).strip()
+
+
+def normalize_utterance(text):
+    """'Yes, please!' -> 'yes please', 'I’m' -> 'i'm'."""
+    text = text.lower().replace("’", "'").replace("`", "'")
+    text = re.sub(r"[^a-z0-9' -]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip(" -'")
+
+
+def slash_message(intent, entities=None):
+    """Rasa's slash syntax, e.g. '/inform_booking_details{"number": 4}'."""
+    return f"/{intent}{json.dumps(entities)}" if entities else f"/{intent}"
+
+
+class FastIntentResolver:
+    """Lookup table of normalized examples -> intent, plus guest counts."""
+
+    def __init__(self, table, guest_numbers=True):
+        self.table         = table  # normalized text -> intent
+        self.guest_numbers = guest_numbers
+        self._lock         = threading.Lock()
+
+        # counters exposed via stats()
+        self.lookups = 0
+        self.hits    = {}  # intent -> count
+
+    @classmethod
+    def from_nlu(cls, path, intents=FAST_INTENTS, guest_numbers=True):
+        """Table from the plain (entity-free) examples of `intents` in a Rasa NLU file."""
+        owners = {}  # normalized text -> intents it is an example of (all intents)
+        for intent, example in load_nlu_examples(path):
+            if ANNOTATION.search(example):
+                continue
+            key = normalize_utterance(example)
+            if key:
+                owners.setdefault(key, set()).add(intent)
+        table = {
+            key: next(iter(found))
+            for key, found in owners.items()
+            if len(found) == 1 and next(iter(found)) in intents
+        }
+        return cls(table, guest_numbers)
+
+    def resolve(self, text):
+        """(intent, entities) for a confident match, else None."""
+        key = normalize_utterance(text)
+        result = None
+        intent = self.table.get(key)
+        if intent is not None:
+            result = (intent, {})
+        elif self.guest_numbers:
+            match = GUESTS_PATTERN.match(key)
+            # "for two" / "two people" but not a lone "two" (could answer anything)
+            if match and (match.group("unit") or key != match.group("number")):
+                guests = number_value(match.group("number"))
+                if guests is not None and 1 <= guests <= MAX_GUESTS:
+                    result = (GUESTS_INTENT, {"number": guests})
+        with self._lock:
+            self.lookups += 1
+            if result is not None:
+                self.hits[result[0]] = self.hits.get(result[0], 0) + 1
+        return result
+
+    def message(self, text):
+        """The slash-syntax message to send instead of `text`, or None."""
+        result = self.resolve(text)
+        return slash_message(*result) if result else None
+
+    def stats(self):
+        with self._lock:
+            hits = sum(self.hits.values())
+            return {
+                "examples": len(self.table),
+                "lookups": self.lookups,
+                "hits": hits,
+                "hit_rate": hits / self.lookups if self.lookups else 0.0,
+                "hits_by_intent": dict(self.hits),
+            }
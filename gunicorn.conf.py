@@ -0,0 +1,24 @@
+import os
+
+# Gunicorn settings for the Flask gateway (app.py).
+# Gunicorn picks this file up automatically when started from the project root.
+#
+# The default sync worker handles one request at a time, so one slow Kokoro
+# call blocked every other user. The threaded worker lets Rasa I/O and TTS
+# for different users overlap; TTS itself runs on the bounded pool in app.py.
+
+bind         = os.environ.get("ALICE_GATEWAY_BIND", "127.0.0.1:5000")
+worker_class = "gthread"
+workers      = int(os.environ.get("ALICE_GATEWAY_WORKERS", 1))   # each worker loads its own Kokoro model
+threads      = int(os.environ.get("ALICE_GATEWAY_THREADS", 16))  # concurrent requests per worker
+timeout      = int(os.environ.get("ALICE_GATEWAY_TIMEOUT", 120))
+keepalive    = 5  # keep browser connections open between turns
+
+
+def post_worker_init(worker):
+    # Don't take requests before the TTS workers have loaded Kokoro and run
+    # one inference (see TTSScheduler.warmup_text); stays below `timeout`.
+    from app import tts_scheduler
+
+    if not tts_scheduler.wait_ready(timeout=timeout * 0.75):
+        worker.log.warning("TTS warm-up did not finish in time, serving anyway")
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+# Per-turn latency instrumentation for the gateway.
+#
+# Every request gets a correlation ID (X-Request-ID) that is sent to Rasa as
+# message metadata and reaches the action server, which reports its own
+# timings back with the reply. A TurnTrace collects the stages of one turn:
+#   stt              client-reported speech recognition time (stt_ms)
+#   stt.endpoint     silence waited before finishing an utterance (/stt)
+#   stt.decode       final decoding of an utterance (/stt)
+#   session_wait     waiting for an earlier turn of the same session
+#   rasa             HTTP round-trip to Rasa (NLU + policies + actions)
+#   rasa.nlu_core    rasa minus the time spent in custom actions
+#   action.<name>    time spent in a custom action (and its sub-stages)
+#   tts              speech synthesis of the reply (all segments)
+#   tts.first_audio  request start -> first audio segment ready (streaming)
+#   total            the whole request
+# StageMetrics keeps a sliding window of samples per stage for the
+# p50/p95/p99 on /metrics; each finished turn is written as one JSON line to a
+# size-rotated log (logs/turns.log).
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class StageMetrics:
+    """Latency samples per stage (last `window` turns) with percentiles."""
+
+    def __init__(self, window=2048):
+        self.window  = window
+        self._lock   = threading.Lock()
+        self._stages = {}  # stage -> [deque of seconds, total count]
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [deque(maxlen=self.window), 0]
+            entry[0].append(seconds)
+            entry[1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            stages = {stage: (sorted(samples), count) for stage, (samples, count) in self._stages.items()}
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            stage: {
+                "count": count,
+                "window": len(samples),
+                "mean_ms": ms(sum(samples) / len(samples)),
+                "p50_ms": ms(percentile(samples, 50)),
+                "p95_ms": ms(percentile(samples, 95)),
+                "p99_ms": ms(percentile(samples, 99)),
+                "max_ms": ms(samples[-1]),
+            }
+            for stage, (samples, count) in sorted(stages.items())
+        }
+
+
+class TurnTrace:
+    """Timing spans of one user turn, tagged with a correlation ID."""
+
+    def __init__(self, correlation_id, endpoint):
+        self.correlation_id = correlation_id
+        self.endpoint       = endpoint
+        self.started        = time.perf_counter()
+        self.stages         = {}  # stage -> seconds (repeated spans add up)
+        self.fields         = {}  # extra fields for the turn log
+        self._lock          = threading.Lock()  # TTS callbacks may add from other threads
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def mark(self, stage):
+        """Record the time from request start until now (once, e.g. first audio)."""
+        with self._lock:
+            if stage not in self.stages:
+                self.stages[stage] = time.perf_counter() - self.started
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def finish(self, metrics, turn_log, **fields):
+        """Record all stages (+ total) in `metrics` and write one JSON line to `turn_log`."""
+        total = time.perf_counter() - self.started
+        with self._lock:
+            stages = dict(self.stages, total=total)
+            record = dict(self.fields, **fields)
+        for stage, seconds in stages.items():
+            metrics.observe(stage, seconds)
+        record.update({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime()),
+            "correlation_id": self.correlation_id,
+            "endpoint": self.endpoint,
+            "stages_ms": {stage: round(seconds * 1000, 2) for stage, seconds in stages.items()},
+        })
+        turn_log.info(json.dumps(record, ensure_ascii=False))
+
+
+def new_correlation_id(incoming=None):
+    """Reuse a sane incoming X-Request-ID, otherwise create one."""
+    if incoming and 8 <= len(incoming) <= 64 and incoming.replace("-", "").replace("_", "").isalnum():
+        return incoming
+    return uuid.uuid4().hex
+
+
+def create_turn_log(path, max_bytes, backups):
+    """Logger writing one JSON record per line to a size-rotated file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    turn_log = logging.getLogger("alice.turns")
+    turn_log.setLevel(logging.INFO)
+    turn_log.propagate = False
+    if not turn_log.handlers:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                      encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        turn_log.addHandler(handler)
+    return turn_log
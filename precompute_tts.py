@@ -0,0 +1,104 @@
+import os
+import json
+import argparse
+
+import yaml
+import numpy as np
+from kokoro import KPipeline
+
+from tts_cache import AudioBundle, cache_key, split_segments
+
+# Precomputes TTS audio for every response text in domain.yml, so canned
+# utterances are served from a memory-mapped bundle without running Kokoro.
+# Only responses whose (text, voice, speed) hash is not in the existing
+# manifest are synthesized again.
+#
+# Run it whenever domain.yml changes:
+#   python3 precompute_tts.py
+
+
+def load_response_texts(domain_path):
+    """
+    Collect every text variant under responses: in domain.yml, split into
+    the same sentence/clause segments app.py looks up in the cache.
+    """
+    with open(domain_path) as f:
+        domain = yaml.safe_load(f)
+
+    texts = []
+    for variants in (domain.get("responses") or {}).values():
+        for variant in variants or []:
+            for segment in split_segments(variant.get("text", "")):
+                if segment not in texts:
+                    texts.append(segment)
+    return texts
+
+
+def load_existing(bundle_dir):
+    """Returns (entries, audio) of a previous build, or empty ones."""
+    bundle = AudioBundle.load(bundle_dir)
+    if bundle is None:
+        return {}, np.zeros(0, dtype=np.float32)
+    return bundle.entries, bundle.audio
+
+
+def build_bundle(domain_path, bundle_dir, voice, speed, sample_rate):
+    texts = load_response_texts(domain_path)
+    old_entries, old_audio = load_existing(bundle_dir)
+    pipeline = None  # only loaded if something actually needs synthesizing
+
+    entries, clips, offset = {}, [], 0
+    reused = synthesized = 0
+    for text in texts:
+        key = cache_key(text, voice, speed)
+        old = old_entries.get(key)
+        if old is not None:
+            audio = np.array(old_audio[old["offset"]:old["offset"] + old["length"]])
+            reused += 1
+        else:
+            if pipeline is None:
+                pipeline = KPipeline(lang_code='a')
+            chunks = [np.asarray(a, dtype=np.float32)
+                      for _, _, a in pipeline(text, voice=voice, speed=speed)
+                      if a is not None and len(a)]
+            if not chunks:
+                print(f"TTS returned no audio for: {text!r}")
+                continue
+            audio = np.concatenate(chunks)
+            synthesized += 1
+
+        entries[key] = {"text": text, "offset": offset, "length": int(len(audio))}
+        clips.append(audio)
+        offset += len(audio)
+
+    # write to temp files first and swap them in, so a running app never
+    # memory-maps a half-written bundle
+    os.makedirs(bundle_dir, exist_ok=True)
+    audio_path    = os.path.join(bundle_dir, AudioBundle.AUDIO_FILE)
+    manifest_path = os.path.join(bundle_dir, AudioBundle.MANIFEST_FILE)
+    full_audio = np.concatenate(clips) if clips else np.zeros(0, dtype=np.float32)
+    full_audio.astype(np.float32).tofile(audio_path + ".tmp")
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump({
+            "voice": voice,
+            "speed": speed,
+            "sample_rate": sample_rate,
+            "entries": entries,
+        }, f, indent=2)
+    os.replace(audio_path + ".tmp", audio_path)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    print(f"TTS bundle written to {bundle_dir}: {len(entries)} phrases "
+          f"({synthesized} synthesized, {reused} reused).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute TTS audio for domain.yml responses.")
+    parser.add_argument("--domain", default="domain.yml")
+    parser.add_argument("--out", default=os.environ.get("ALICE_TTS_BUNDLE", "tts_bundle"))
+    parser.add_argument("--voice", default="af_heart")
+    parser.add_argument("--speed", type=float, default=0.9)
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    args = parser.parse_args()
+
+    build_bundle(args.domain, args.out, args.voice, args.speed, args.sample_rate)
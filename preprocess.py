@@ -1,30 +1,296 @@
-from joblib import dump
-from sklearn.feature_extraction.text import TfidfVectorizer
+import os
 import json
+import glob
+import time
+import shutil
+import hashlib
+import argparse
+
+import numpy as np
+from joblib import dump
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from actions.catalog import Catalog, QueryVectorizer, save_vectors
+from actions.restaurant_index import RestaurantIndex
+
+# Preprocessed restaurant vectors to reduce computation time
+#
+# The index is built incrementally from the version currently published:
+#   - every restaurant text is hashed and its raw term counts are saved with
+#     the version, so only added or changed texts are analyzed again; IDF and
+#     vectors are then recomputed from the counts, which gives exactly the
+#     vectors TfidfVectorizer.fit_transform would produce
+#   - if no text changed (e.g. only availability was edited) the vector files
+#     are hard-linked from the previous version instead of being rebuilt
+#   - the columnar index copies the rows that did not change from the last
+#     build of this process (--watch) and only builds the changed rows
+#
+# Each build is written to its own version directory and published by
+# atomically replacing vectorizer/index/CURRENT, so the action server can
+# swap in the new index without dropping requests:
+#   vectorizer/index/<version>/restaurants.json
+#   vectorizer/index/<version>/columns/*.npy   (memory-mapped by the action server:
+#       CSR arrays of the vectors, integer-coded cuisine/diet/location/price
+#       columns, packed weekday x slot availability bits, name string table;
+#       vocabulary.json + idf.npy let it vectorize queries without scikit-learn;
+#       text_hashes.npy + tf_*.npy are the term counts reused by the next build)
+#
+#   python3 preprocess.py                # build once
+#   python3 preprocess.py --watch        # rebuild whenever restaurants.json changes
+#   python3 preprocess.py --embeddings   # also precompute sentence embeddings
+#                                        # for ALICE_SCORER=embedding
+
+CATALOG_PATH   = "data/restaurants.json"
+VECTORIZER_DIR = "vectorizer"
+INDEX_DIR      = os.path.join(VECTORIZER_DIR, "index")
+KEEP_VERSIONS  = 3  # older version directories are removed
+
+# files of a version that only depend on the restaurant texts
+COUNT_ARRAYS = ["tf_data", "tf_indices", "tf_indptr"]
+VECTOR_FILES = ["vec_data.npy", "vec_indices.npy", "vec_indptr.npy", "vec_shape.npy", "vocabulary.json",
+                "idf.npy", "text_hashes.npy"] + [f"{name}.npy" for name in COUNT_ARRAYS]
+
+# index_dir -> (version, restaurants, RestaurantIndex) of this process's last build
+_last_build = {}
+
+
+def restaurant_text(r):
+    # creates a query string for each restaurant e.g. "La Bella Italia Italian Vegetarian Gluten-Free Omnivore..."
+    return f"{r['name']} {r['cuisine']} {' '.join(r.get('dietary_options', []))}"
+
+
+def text_hashes(texts):
+    """Stable 64-bit hash of every text."""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little") for t in texts),
+        dtype=np.uint64, count=len(texts),
+    )
+
+
+def current_version(index_dir=INDEX_DIR):
+    try:
+        with open(os.path.join(index_dir, "CURRENT")) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def load_term_counts(columns_dir):
+    """(text hashes, terms, raw term counts) saved with a build, or None for older builds."""
+    try:
+        hashes = np.load(os.path.join(columns_dir, "text_hashes.npy"))
+        data, indices, indptr = (
+            np.load(os.path.join(columns_dir, f"{name}.npy"), mmap_mode="r") for name in COUNT_ARRAYS
+        )
+        with open(os.path.join(columns_dir, "vocabulary.json")) as f:
+            terms = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return hashes, terms, csr_matrix((data, indices, indptr), shape=(len(hashes), len(terms)))
+
+
+def save_term_counts(hashes, counts, columns_dir):
+    np.save(os.path.join(columns_dir, "text_hashes.npy"), hashes)
+    for name, array in zip(COUNT_ARRAYS, (counts.data, counts.indices, counts.indptr)):
+        np.save(os.path.join(columns_dir, f"{name}.npy"), array.astype(np.int32))
+
+
+def vectorize(texts, hashes, previous=None):
+    """
+    TF–IDF vectors of `texts`, equal to TfidfVectorizer().fit_transform(texts).
+    Term counts of texts that `previous` (see load_term_counts) already has are
+    copied row by row; only the other texts are analyzed.
+    Returns (terms, idf, term counts, vectors, number of texts analyzed).
+    """
+    source = np.full(len(texts), -1, dtype=np.int64)  # row in `previous`, -1 = analyze
+    if previous is not None and len(previous[0]):
+        old_hashes, old_terms, old_counts = previous
+        order = np.argsort(old_hashes, kind="stable")
+        pos = np.minimum(np.searchsorted(old_hashes, hashes, sorter=order), len(order) - 1)
+        found = old_hashes[order[pos]] == hashes
+        source[found] = order[pos[found]]
+    reused, fresh = np.flatnonzero(source >= 0), np.flatnonzero(source < 0)
+
+    parts = []  # (rows, terms, counts)
+    if reused.size:
+        parts.append((reused, old_terms, old_counts[source[reused]]))
+    if fresh.size:
+        counter = CountVectorizer()  # same tokens as TfidfVectorizer
+        counts = counter.fit_transform([texts[row] for row in fresh])
+        parts.append((fresh, counter.get_feature_names_out().tolist(), counts))
+
+    # one sorted vocabulary for both parts, without terms no text uses any more
+    terms = sorted({t for _, part_terms, _ in parts for t in part_terms})
+    column = {t: i for i, t in enumerate(terms)}
+    stacked = vstack([
+        csr_matrix((counts.data, np.array([column[t] for t in part_terms], dtype=np.int32)[counts.indices],
+                    counts.indptr), shape=(counts.shape[0], len(terms)))
+        for _, part_terms, counts in parts
+    ], format="csr")
+    counts = stacked[np.argsort(np.concatenate([rows for rows, _, _ in parts]), kind="stable")]
+    df = np.bincount(counts.indices, minlength=len(terms))
+    if (df == 0).any():
+        used = df > 0
+        counts = csr_matrix((counts.data, (np.cumsum(used) - 1)[counts.indices], counts.indptr),
+                            shape=(counts.shape[0], int(used.sum())))
+        terms = [t for t, keep in zip(terms, used) if keep]
+        df = df[used]
+    counts.sort_indices()
+
+    # smoothed IDF and L2 norm, as TfidfVectorizer's defaults
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1
+    vectors = counts.astype(np.float64)
+    vectors.data *= idf[vectors.indices]
+    return terms, idf, counts, normalize(vectors), int(fresh.size)
+
+
+def link_or_copy(source, target):
+    # version directories are never modified after publishing, so sharing files is safe
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def build(catalog_path=CATALOG_PATH, vectorizer_dir=VECTORIZER_DIR):
+    """
+    Build a new index version if the catalog changed; returns the current version.
+    (`vectorizer_dir` is only changed by the benchmarks, which build synthetic catalogs.)
+    """
+    index_dir = os.path.join(vectorizer_dir, "index")
+    with open(catalog_path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    if version == current_version(index_dir) and os.path.exists(os.path.join(index_dir, version, "columns", "vocabulary.json")):
+        print(f"Index {version} is already up to date.")
+        return version
+
+    # Load restaurant data from JSON file
+    restaurants = json.loads(raw)
+    texts = [restaurant_text(r) for r in restaurants]
+    hashes = text_hashes(texts)
+    previous = current_version(index_dir)
+    previous_dir = os.path.join(index_dir, previous) if previous else None
+    previous_counts = load_term_counts(os.path.join(previous_dir, "columns")) if previous_dir else None
+
+    # write the new version next to the old one, then publish it
+    version_dir = os.path.join(index_dir, version)
+    tmp_dir = f"{version_dir}.tmp"
+    columns_dir = os.path.join(tmp_dir, "columns")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(columns_dir)
+    with open(os.path.join(tmp_dir, "restaurants.json"), "wb") as f:
+        f.write(raw)  # exact snapshot the vectors were built from
+
+    vectorizer = vectors = None
+    if previous_counts is not None and np.array_equal(hashes, previous_counts[0]):
+        # same texts in the same order (e.g. only availability changed): same vectors
+        for name in VECTOR_FILES:
+            link_or_copy(os.path.join(previous_dir, "columns", name), os.path.join(columns_dir, name))
+        analyzed = 0
+    else:
+        terms, idf, counts, vectors, analyzed = vectorize(texts, hashes, previous_counts)
+        save_vectors(vectors, columns_dir)
+        QueryVectorizer(terms, idf).save(columns_dir)  # query TF–IDF without scikit-learn
+        save_term_counts(hashes, counts, columns_dir)
+        vectorizer = TfidfVectorizer(vocabulary={t: i for i, t in enumerate(terms)})
+        vectorizer.idf_ = idf
+
+    # columnar index: only rows that differ from this process's last build are built again
+    last_version, last_restaurants, last_index = _last_build.get(index_dir, (None, None, None))
+    if last_version is not None and last_version == previous and len(restaurants) >= len(last_restaurants):
+        changed = [row for row, r in enumerate(restaurants)
+                   if row >= len(last_restaurants) or r != last_restaurants[row]]
+        index = last_index.updated(restaurants, changed)
+        if len(restaurants) == len(last_restaurants) and all(
+            {**restaurants[row], "availability": None} == {**last_restaurants[row], "availability": None}
+            for row in changed
+        ):
+            # only availability changed: embedded descriptions are the same
+            for path in glob.glob(os.path.join(previous_dir, "embeddings-*.npy")):
+                link_or_copy(path, os.path.join(tmp_dir, os.path.basename(path)))
+    else:
+        changed = range(len(restaurants))
+        index = RestaurantIndex.from_restaurants(restaurants)
+    index.save(columns_dir)
+
+    shutil.rmtree(version_dir, ignore_errors=True)
+    os.replace(tmp_dir, version_dir)
+    publish(version, index_dir)
+    _last_build[index_dir] = (version, restaurants, index)
+
+    # keep the flat files for tools that still read them (only rewritten when the vectors changed)
+    if vectorizer is not None:
+        dump(vectorizer, os.path.join(vectorizer_dir, "vectorizer.joblib"))
+        dump(vectors, os.path.join(vectorizer_dir, "restaurant_vectors.joblib"))
+    prune_versions(keep=version, index_dir=index_dir)
+
+    print(f"Index {version} published: {len(restaurants)} restaurants, {analyzed} texts (re)vectorized, "
+          f"{len(changed)} index rows rebuilt.")
+    return version
+
+
+def precompute_embeddings(version):
+    """Embed every restaurant of `version` once, so the action server finds them on disk."""
+    from actions.scorers import EmbeddingScorer  # needs sentence-transformers
+
+    model_name = os.environ.get("ALICE_EMBEDDING_MODEL")
+    scorer = EmbeddingScorer(model_name) if model_name else EmbeddingScorer()
+    catalog = Catalog.from_version_dir(version, os.path.join(INDEX_DIR, version))
+    scorer.restaurant_embeddings(catalog)
+    print(f"Embeddings saved to {scorer.cache_path(catalog)}")
+
 
-# Preprocessed restaurant verctors to reduce computation time
+def publish(version, index_dir=INDEX_DIR):
+    """Atomically point CURRENT at `version`."""
+    current_file = os.path.join(index_dir, "CURRENT")
+    tmp_path = f"{current_file}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, current_file)
 
-# Load restaurant data from JSON file
-with open("data/restaurants.json") as f:
-    restaurants = json.load(f)
 
-# Create and save preprocessed texts
-# creates a query string for each restaurant e.g. "La Bella Italia Italian Vegetarian Gluten-Free Omnivore..."
-restaurant_texts = [
-    f"{r['name']} {r['cuisine']} {' '.join(r.get('dietary_options', []))}"
-    for r in restaurants
-]
-dump(restaurant_texts, "restaurant_texts.pkl")
+def prune_versions(keep, index_dir=INDEX_DIR):
+    versions = [
+        d for d in os.listdir(index_dir)
+        if os.path.isdir(os.path.join(index_dir, d)) and not d.endswith(".tmp")
+    ]
+    versions.sort(key=lambda d: os.path.getmtime(os.path.join(index_dir, d)), reverse=True)
+    for old in versions[KEEP_VERSIONS:]:
+        if old != keep:
+            shutil.rmtree(os.path.join(index_dir, old), ignore_errors=True)
 
-# Fit and save TF-IDF vectorizer and vectors for comparison with user input
-# Initialize the vectorizer and fit/transform the data
-vectorizer = TfidfVectorizer()
-vectors = vectorizer.fit_transform(restaurant_texts)
 
-# Save the vectorizer and the transformed vectors
-dump(vectorizer, "vectorizer/vectorizer.joblib")
-dump(vectors, "vectorizer/restaurant_vectors.joblib")
+def watch(catalog_path=CATALOG_PATH, interval=1.0):
+    """Rebuild whenever the catalog file changes (e.g. availability updates)."""
+    last_mtime = None
+    while True:
+        try:
+            mtime = os.path.getmtime(catalog_path)
+            if mtime != last_mtime:
+                last_mtime = mtime
+                build(catalog_path)
+        except (OSError, ValueError) as e:
+            # e.g. the file is being rewritten right now -> retry next tick
+            print(f"Could not rebuild index: {e}")
+            last_mtime = None
+        time.sleep(interval)
 
-print("Vectorizer and restaurant vectors saved successfully.")
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the restaurant TF–IDF index.")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--watch", action="store_true", help="keep running and rebuild on changes")
+    parser.add_argument("--embeddings", action="store_true",
+                        help="precompute sentence embeddings (needs sentence-transformers)")
+    args = parser.parse_args()
 
+    if args.watch:
+        watch(args.catalog)
+    else:
+        version = build(args.catalog)
+        if args.embeddings:
+            precompute_embeddings(version)
+        print("Vectorizer and restaurant vectors saved successfully.")
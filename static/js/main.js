@@ -1,13 +1,34 @@
 let recognition;
+// When the user stopped speaking, to report the recognition time (stt_ms)
+let speechEndedAt = null;
+
+// Each browser keeps its own session ID, so it gets its own Rasa conversation
+const SESSION_KEY = 'alice_session';
+let sessionId = localStorage.getItem(SESSION_KEY);
+if (!sessionId) {
+  sessionId = crypto.randomUUID().replace(/-/g, '');
+  localStorage.setItem(SESSION_KEY, sessionId);
+}
 
 // Check if browser supports  Web Speech API
 const SpeechRecognition =
     window.SpeechRecognition || window.webkitSpeechRecognition;
 
-if (!SpeechRecognition) {
-  // If the browser does not support voice input, show alert
-  alert(
-      'Your browser does not support Speech Recognition. Please use Chrome or Edge.');
+// Server-side recognition over the /stt WebSocket (see stt.py): used when the
+// browser has no Speech Recognition, or with ?stt=server /
+// localStorage.alice_stt = 'server'
+const USE_SERVER_STT = !SpeechRecognition ||
+    new URLSearchParams(location.search).get('stt') === 'server' ||
+    localStorage.getItem('alice_stt') === 'server';
+
+if (USE_SERVER_STT) {
+  document.getElementById('record-btn').addEventListener('click', () => {
+    // Same start() interface as SpeechRecognition, so playback can restart it
+    if (!recognition) {
+      recognition = new ServerSpeechRecognizer('ws://127.0.0.1:5000/stt');
+    }
+    recognition.start();
+  });
 } else {
   // Create a new instance of the Speech Recognition API
   recognition = new SpeechRecognition();
@@ -24,8 +45,10 @@ if (!SpeechRecognition) {
     const transcript = event.results[0][0].transcript.trim();
     // Show the user's message in the chat
     addChatMessage('You:', transcript);
+    const sttMs = speechEndedAt === null ? null : performance.now() - speechEndedAt;
+    speechEndedAt = null;
     // Send the text to the backend for processing by Rasa
-    sendTextToBackend(transcript);
+    sendTextToBackend(transcript, sttMs);
   };
 
   // Handles error during speech recognition
@@ -37,6 +60,7 @@ if (!SpeechRecognition) {
 
   // HAndles if the user stops speaking
   recognition.onspeechend = () => {
+    speechEndedAt = performance.now();
     // Stop recognition to prepare for next message
     recognition.stop();
     console.log('Speech recognition has stopped.');
@@ -52,35 +76,187 @@ if (!SpeechRecognition) {
 // --------------------------------------------
 // Send the user's spoken text to the Flask backend
 // --------------------------------------------
-async function sendTextToBackend(text) {
+async function sendTextToBackend(text, sttMs = null) {
   try {
-    // Send user's message to  Flask backend via POST request
-    const response = await fetch('http://127.0.0.1:5000/process', {
+    // Send user's message to Flask backend; the reply is streamed back as
+    // newline-delimited JSON: first the text, then one audio segment per line
+    const response = await fetch('http://127.0.0.1:5000/process_stream', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
+        'X-Session-ID': sessionId,
       },
-      body: JSON.stringify({text})
+      body: JSON.stringify({text, stt_ms: sttMs})
     });
 
-    // Get  reply from the backend (includes both text + audio)
-    const data = await response.json();
+    const player = new StreamingAudioPlayer();
+    let buffered = '';
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
 
-    // Display the bot's text response in the chat
-    addChatMessage('Alice:', data.response);
+    // Read the stream line by line as it arrives
+    while (true) {
+      const {value, done} = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, {stream: true});
 
-    // If there's an audio response, play it
-    if (data.audioUrl) {
-      playAudio(data.audioUrl);
-    } else {
-      // If there's no audio, start listening again
-      recognition.start();
+      let newline;
+      while ((newline = buffered.indexOf('\n')) >= 0) {
+        const line = buffered.slice(0, newline).trim();
+        buffered = buffered.slice(newline + 1);
+        if (line) handleStreamMessage(JSON.parse(line), player);
+      }
     }
+    player.finish();
   } catch (error) {
     console.error('Error sending text to backend:', error);
   }
 }
 
+function handleStreamMessage(message, player) {
+  if (message.type === 'text') {
+    // Display the bot's text response in the chat
+    addChatMessage('Alice:', message.response);
+  } else if (message.type === 'audio') {
+    // Play each segment as soon as it arrives (queued after the previous one)
+    player.enqueue(message.data);
+  }
+}
+
+
+// --------------------------------------------
+// Plays audio segments back-to-back while more are still arriving
+// --------------------------------------------
+class StreamingAudioPlayer {
+  constructor() {
+    this.context = StreamingAudioPlayer.sharedContext();
+    this.playhead = 0;        // time at which the next segment should start
+    this.pending = Promise.resolve();
+    this.scheduled = 0;       // number of segments queued for playback
+  }
+
+  static sharedContext() {
+    if (!StreamingAudioPlayer.context) {
+      StreamingAudioPlayer.context =
+          new (window.AudioContext || window.webkitAudioContext)();
+    }
+    return StreamingAudioPlayer.context;
+  }
+
+  enqueue(base64Wav) {
+    // Decode in arrival order so segments never play out of order
+    this.pending = this.pending.then(async () => {
+      const bytes = Uint8Array.from(atob(base64Wav), c => c.charCodeAt(0));
+      const buffer = await this.context.decodeAudioData(bytes.buffer);
+      if (this.context.state === 'suspended') await this.context.resume();
+
+      const source = this.context.createBufferSource();
+      source.buffer = buffer;
+      source.connect(this.context.destination);
+      const startAt = Math.max(this.context.currentTime, this.playhead);
+      source.start(startAt);
+      this.playhead = startAt + buffer.duration;
+      this.scheduled += 1;
+    }).catch(error => console.error('Audio playback error:', error));
+  }
+
+  finish() {
+    // When the last segment is done playing, restart listening
+    this.pending.then(() => {
+      if (!this.scheduled) {
+        recognition.start();
+        return;
+      }
+      const remaining = Math.max(0, this.playhead - this.context.currentTime);
+      setTimeout(() => recognition.start(), remaining * 1000);
+    });
+  }
+}
+
+
+// --------------------------------------------
+// Streams the microphone to the server, which recognizes the speech,
+// decides when the user is done and answers on the same socket
+// --------------------------------------------
+class ServerSpeechRecognizer {
+  constructor(url) {
+    this.url = url;
+    this.socket = null;
+    this.listening = false;   // audio is only sent between start() and the final result
+    this.player = null;
+    this.partialElement = null;
+  }
+
+  async start() {
+    try {
+      if (!this.context) await this.openMicrophone();
+      if (!this.socket || this.socket.readyState > WebSocket.OPEN) this.connect();
+      await this.opened;
+      this.socket.send(JSON.stringify(
+          {type: 'start', sample_rate: this.context.sampleRate, session_id: sessionId}));
+      this.listening = true;
+    } catch (error) {
+      console.error('Server speech recognition error:', error);
+    }
+  }
+
+  async openMicrophone() {
+    const stream = await navigator.mediaDevices.getUserMedia(
+        {audio: {channelCount: 1, echoCancellation: true, noiseSuppression: true}});
+    // Native sample rate; the server resamples to 16 kHz
+    this.context = new (window.AudioContext || window.webkitAudioContext)();
+    const source = this.context.createMediaStreamSource(stream);
+    const processor = this.context.createScriptProcessor(4096, 1, 1);
+
+    processor.onaudioprocess = (event) => {
+      if (!this.listening || this.socket.readyState !== WebSocket.OPEN) return;
+      // Float32 samples -> 16-bit PCM
+      const input = event.inputBuffer.getChannelData(0);
+      const pcm = new Int16Array(input.length);
+      for (let i = 0; i < input.length; i++) {
+        pcm[i] = Math.max(-1, Math.min(1, input[i])) * 0x7fff;
+      }
+      this.socket.send(pcm.buffer);
+    };
+    source.connect(processor);
+    processor.connect(this.context.destination);
+  }
+
+  connect() {
+    this.socket = new WebSocket(this.url);
+    this.opened = new Promise((resolve, reject) => {
+      this.socket.addEventListener('open', resolve, {once: true});
+      this.socket.addEventListener('error', reject, {once: true});
+    });
+    this.socket.onmessage = (event) => this.handleMessage(JSON.parse(event.data));
+    this.socket.onclose = () => {
+      this.listening = false;
+    };
+  }
+
+  handleMessage(message) {
+    if (message.type === 'partial') {
+      // Show what has been recognized so far, replaced by the final text
+      if (!this.partialElement) this.partialElement = addChatMessage('You:', '');
+      this.partialElement.innerText = message.text;
+    } else if (message.type === 'final') {
+      this.listening = false;
+      if (this.partialElement) {
+        this.partialElement.parentElement.remove();
+        this.partialElement = null;
+      }
+      if (message.text) addChatMessage('You:', message.text);
+      this.player = new StreamingAudioPlayer();
+    } else if (message.type === 'end') {
+      this.player.finish();
+    } else if (message.type === 'error') {
+      console.error('Server speech recognition error:', message.message);
+    } else {
+      handleStreamMessage(message, this.player);
+    }
+  }
+}
+
 
 // --------------------------------------------
 // Add messages to the chat area on the page
@@ -106,6 +282,7 @@ function addChatMessage(sender, message) {
 
   // Scroll chat to the latest message
   chatBox.scrollTop = chatBox.scrollHeight;
+  return messageElement;
 }
 
 
@@ -115,8 +292,9 @@ function addChatMessage(sender, message) {
 function playAudio(url) {
   if (!url) return;  // Don't do anything if there's no audio
 
-  // Create a new audio object, adding a timestamp to prevent caching
-  const audio = new Audio(url + '?t=' + new Date().getTime());
+  // Every reply has its own short-lived URL (or inline data URL), so no
+  // cache-busting is needed
+  const audio = new Audio(url);
 
   audio.play()
       .then(() => {
@@ -0,0 +1,171 @@
+import json
+import time
+
+import numpy as np
+
+# Optional server-side speech recognition for the /stt WebSocket.
+#
+# The browser streams 16-bit mono PCM; every 30 ms frame goes through a
+# voice-activity detector (webrtcvad, or a simple energy threshold if it is
+# not installed) and into a streaming Vosk recognizer, which yields partial
+# hypotheses while the user is talking. The utterance is finished
+# (endpointing) as soon as
+#   - the user has been silent for `silence_ms`, or
+#   - early: silent for at least `min_silence_ms` and the partial hypothesis
+#     has not changed for `stable_ms` (the words are already decoded), or
+#   - it is longer than `max_utterance_s`.
+# The final transcript is then dispatched to Rasa right away, instead of
+# waiting for the browser's recognizer to give up.
+#
+# Needs `pip install vosk` (webrtcvad optional) and a Vosk model directory,
+# see ALICE_STT_MODEL in app.py.
+
+SAMPLE_RATE = 16000
+FRAME_MS    = 30
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * 2  # 16-bit samples
+
+
+class EnergyVAD:
+    """Fallback voice-activity detector: RMS of a frame above a fixed level."""
+
+    def __init__(self, threshold=500.0):
+        self.threshold = threshold
+
+    def is_speech(self, frame, sample_rate):
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return bool(samples.size) and float(np.sqrt(np.mean(samples * samples))) > self.threshold
+
+
+def create_vad(aggressiveness=2):
+    try:
+        import webrtcvad
+    except ImportError:
+        return EnergyVAD()
+    return webrtcvad.Vad(aggressiveness)
+
+
+def resample_pcm(pcm, sample_rate):
+    """16-bit mono PCM at `sample_rate` -> 16 kHz (linear interpolation)."""
+    if sample_rate == SAMPLE_RATE or not pcm:
+        return pcm
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    n_out = int(round(len(samples) * SAMPLE_RATE / sample_rate))
+    positions = np.linspace(0, len(samples) - 1, n_out)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16).tobytes()
+
+
+class SpeechRecognizer:
+    """Loads the Vosk model once; every WebSocket gets its own StreamingTranscriber."""
+
+    def __init__(self, model_path, vad_aggressiveness=2, silence_ms=600, min_silence_ms=240,
+                 stable_ms=300, max_utterance_s=15.0):
+        from vosk import Model, SetLogLevel  # optional dependency
+
+        SetLogLevel(-1)
+        self.model              = Model(model_path)
+        self.vad_aggressiveness = vad_aggressiveness
+        self.silence_ms         = silence_ms
+        self.min_silence_ms     = min_silence_ms
+        self.stable_ms          = stable_ms
+        self.max_utterance_s    = max_utterance_s
+
+    def transcriber(self, sample_rate=SAMPLE_RATE):
+        from vosk import KaldiRecognizer
+
+        return StreamingTranscriber(
+            KaldiRecognizer(self.model, SAMPLE_RATE), create_vad(self.vad_aggressiveness),
+            sample_rate=sample_rate, silence_ms=self.silence_ms, min_silence_ms=self.min_silence_ms,
+            stable_ms=self.stable_ms, max_utterance_s=self.max_utterance_s,
+        )
+
+
+class StreamingTranscriber:
+    """
+    Incremental recognition of one audio stream with endpointing.
+
+    feed() takes PCM in any chunk size and returns events:
+      {"type": "partial", "text": ...}
+      {"type": "final", "text": ..., "endpoint_ms": ..., "decode_ms": ...}
+    endpoint_ms is the silence waited before finishing (audio time),
+    decode_ms the time the final decoding took. All timings are measured on
+    the audio itself, so replaying a recording gives the same endpoints.
+    """
+
+    def __init__(self, recognizer, vad, sample_rate=SAMPLE_RATE, silence_ms=600, min_silence_ms=240,
+                 stable_ms=300, max_utterance_s=15.0):
+        self.recognizer      = recognizer
+        self.vad             = vad
+        self.sample_rate     = sample_rate
+        self.silence_ms      = silence_ms
+        self.min_silence_ms  = min_silence_ms
+        self.stable_ms       = stable_ms
+        self.max_utterance_s = max_utterance_s
+        self._buffer  = b""
+        self.audio_ms = 0  # audio fed so far (whole stream)
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance (after a final result)."""
+        self.recognizer.Reset()
+        self._speech_start  = None
+        self._last_speech   = None
+        self._partial       = ""
+        self._partial_since = 0
+
+    def feed(self, pcm):
+        self._buffer += resample_pcm(pcm, self.sample_rate)
+        events = []
+        while len(self._buffer) >= FRAME_BYTES:
+            frame, self._buffer = self._buffer[:FRAME_BYTES], self._buffer[FRAME_BYTES:]
+            event = self._feed_frame(frame)
+            if event:
+                events.append(event)
+        return events
+
+    def finish(self):
+        """End of the stream (user pressed stop): final result of what was said, if anything."""
+        if self._speech_start is None:
+            return None
+        return self._final(endpoint_ms=0)
+
+    def _feed_frame(self, frame):
+        self.audio_ms += FRAME_MS
+        if self.vad.is_speech(frame, SAMPLE_RATE):
+            if self._speech_start is None:
+                self._speech_start = self.audio_ms - FRAME_MS
+            self._last_speech = self.audio_ms
+        elif self._speech_start is None:
+            return None  # leading silence: nothing to recognize yet
+
+        if self.recognizer.AcceptWaveform(frame):
+            # the recognizer found an endpoint itself
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            if text:
+                return self._done(text, endpoint_ms=self.audio_ms - self._last_speech, decode_ms=0.0)
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        if partial != self._partial:
+            self._partial, self._partial_since = partial, self.audio_ms
+            return {"type": "partial", "text": partial}
+
+        silence = self.audio_ms - self._last_speech
+        stable = self.audio_ms - self._partial_since
+        if (
+            (self._partial and silence >= self.silence_ms)
+            or (self._partial and silence >= self.min_silence_ms and stable >= self.stable_ms)
+            or self.audio_ms - self._speech_start >= self.max_utterance_s * 1000
+        ):
+            return self._final(endpoint_ms=silence)
+        if not self._partial and silence >= self.silence_ms:
+            # only noise: start over
+            self.reset()
+        return None
+
+    def _final(self, endpoint_ms):
+        start = time.perf_counter()
+        text = json.loads(self.recognizer.FinalResult()).get("text", "") or self._partial
+        return self._done(text, endpoint_ms, decode_ms=(time.perf_counter() - start) * 1000)
+
+    def _done(self, text, endpoint_ms, decode_ms):
+        event = {"type": "final", "text": text, "endpoint_ms": endpoint_ms, "decode_ms": round(decode_ms, 2)}
+        self.reset()
+        return event
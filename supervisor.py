@@ -0,0 +1,288 @@
+import os
+import json
+import time
+import signal
+import argparse
+import threading
+import subprocess
+from datetime import datetime, timedelta
+
+import requests
+
+# Starts and watches all services of the assistant:
+#   rasa     rasa run --enable-api       (NLU + dialogue, port 5005)
+#   actions  rasa run actions            (custom actions, port 5055)
+#   gateway  gunicorn app:app            (web UI, TTS, port 5000)
+#
+# The services don't depend on each other to boot, so all of them start at
+# once. A service counts as up when its HTTP health check answers (instead
+# of grepping its log), and is then warmed with a synthetic request before
+# the supervisor reports it ready:
+#   rasa     one POST /model/parse (loads the NLU pipeline's lazy parts)
+#   actions  action_readiness_probe + one action_suggest_restaurant call
+#            (catalog, booking store, scorer, ranking cache)
+#   gateway  every gunicorn worker synthesizes a phrase before it takes
+#            requests (gunicorn.conf.py); /health answers 200 after that
+# Boot times per service are printed and written to logs/boot.json.
+#
+# Afterwards the services are checked every few seconds; one that exited or
+# failed its health check several times in a row is restarted (with
+# backoff). Ctrl+C / SIGTERM stops everything.
+#
+#   python3 supervisor.py
+#   python3 supervisor.py --services actions gateway   # Rasa runs elsewhere
+
+RASA_API_URL = os.environ.get('ALICE_RASA_API_URL', 'http://localhost:5005')
+ACTIONS_URL  = os.environ.get('ALICE_ACTIONS_URL', 'http://localhost:5055')
+GATEWAY_URL  = 'http://' + os.environ.get('ALICE_GATEWAY_BIND', '127.0.0.1:5000')
+
+HEALTH_TIMEOUT = 2.0   # seconds per health request
+POLL_INTERVAL  = 0.5   # while booting
+MAX_BACKOFF    = 60.0  # seconds between restarts of a service that keeps crashing
+
+
+def warm_up_rasa():
+    response = requests.post(f"{RASA_API_URL}/model/parse",
+                             json={"text": "I want to book a table for two tomorrow at 7 pm"}, timeout=60)
+    response.raise_for_status()
+    return {"intent": (response.json().get("intent") or {}).get("name")}
+
+
+def warm_up_actions():
+    def call(action, slots):
+        response = requests.post(f"{ACTIONS_URL}/webhook", json={
+            "next_action": action,
+            "sender_id": "supervisor-warmup",
+            "tracker": {"sender_id": "supervisor-warmup", "slots": slots, "latest_message": {}, "events": []},
+            "domain": {},
+        }, timeout=120)
+        response.raise_for_status()
+        return response.json().get("responses") or []
+
+    probe = call("action_readiness_probe", {})
+    tomorrow = (datetime.now() + timedelta(days=1)).replace(hour=19, minute=0, second=0, microsecond=0)
+    call("action_suggest_restaurant", {
+        "past_bookings": False,
+        "cuisine_preferences": ["italian"],
+        "dietary_preferences": [],
+        "date_and_time": tomorrow.isoformat(),
+        "num_of_guests": 2,
+    })
+    report = next((r.get("custom") for r in probe if r.get("custom", {}).get("ready")), None) or {}
+    return {"boot": report.get("boot"), "restaurants": report.get("restaurants")}
+
+
+def gateway_details():
+    # the TTS warm-up already happened in the workers before /health answered 200
+    health = requests.get(f"{GATEWAY_URL}/health", timeout=HEALTH_TIMEOUT).json()
+    return {"tts_warmup_seconds": health.get("tts_warmup_seconds")}
+
+
+class Service:
+    """One supervised process: start, health check, warm-up, stop."""
+
+    def __init__(self, name, command, health_url, warm_up=None, log_path=None, boot_timeout=600.0):
+        self.name         = name
+        self.command      = command
+        self.health_url   = health_url
+        self.warm_up      = warm_up
+        self.log_path     = log_path or os.path.join("logs", f"{name}.log")
+        self.boot_timeout = boot_timeout
+
+        self.process  = None
+        self.ready    = False
+        self.restarts = 0
+        self.boot     = {}  # timings of the last boot
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "ab") as log:
+            # own process group, so stop() also reaches gunicorn/rasa workers
+            self.process = subprocess.Popen(self.command, stdout=log, stderr=subprocess.STDOUT,
+                                            start_new_session=True)
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def healthy(self):
+        try:
+            return requests.get(self.health_url, timeout=HEALTH_TIMEOUT).ok
+        except requests.RequestException:
+            return False
+
+    def start_and_warm_up(self, stopping=None):
+        """Starts the process and waits until it is healthy and warm; returns True on success."""
+        self.ready = False
+        started = time.perf_counter()
+        self.start()
+        self.boot = {"pid": self.process.pid}
+
+        while not self.healthy():
+            if not self.alive():
+                self.boot["error"] = f"exited with code {self.process.returncode} (see {self.log_path})"
+                return False
+            if stopping is not None and stopping.is_set():
+                self.boot["error"] = "cancelled"
+                return False
+            if time.perf_counter() - started > self.boot_timeout:
+                self.boot["error"] = f"not healthy after {self.boot_timeout:.0f} s"
+                return False
+            time.sleep(POLL_INTERVAL)
+        healthy = time.perf_counter()
+        self.boot["healthy_s"] = round(healthy - started, 3)
+
+        if self.warm_up:
+            try:
+                self.boot["warmup"] = self.warm_up()
+            except Exception as e:
+                # the service is up; it just starts cold
+                self.boot["warmup_error"] = str(e)
+        self.boot["warmup_s"] = round(time.perf_counter() - healthy, 3)
+        self.boot["total_s"] = round(time.perf_counter() - started, 3)
+        self.ready = True
+        return True
+
+    def stop(self, timeout=10.0):
+        self.ready = False
+        if not self.alive():
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+
+
+class Supervisor:
+    def __init__(self, services, check_interval=5.0, max_failures=3, restart=True):
+        self.services       = services
+        self.check_interval = check_interval
+        self.max_failures   = max_failures
+        self.restart        = restart
+        self._stopping      = threading.Event()
+        self._restarting    = set()  # names of services being restarted (in the background)
+        self._lock          = threading.Lock()
+
+    def boot(self, report_path):
+        """Starts all services in parallel; returns True if every one came up."""
+        started = time.perf_counter()
+        threads = [threading.Thread(target=s.start_and_warm_up, args=(self._stopping,), name=f"boot-{s.name}")
+                   for s in self.services]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        print(f"Boot finished in {wall:.1f} s (services started in parallel):")
+        for s in self.services:
+            if s.ready:
+                warning = f"  (warm-up failed: {s.boot['warmup_error']})" if "warmup_error" in s.boot else ""
+                print(f"  {s.name:<8} healthy {s.boot['healthy_s']:>7.1f} s   warm-up {s.boot['warmup_s']:>6.1f} s"
+                      f"   total {s.boot['total_s']:>7.1f} s{warning}")
+            else:
+                print(f"  {s.name:<8} FAILED: {s.boot.get('error')}")
+
+        if report_path:
+            os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+            with open(report_path, "w") as f:
+                json.dump({
+                    "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime()),
+                    "wall_s": round(wall, 3),
+                    "services": {s.name: s.boot for s in self.services},
+                }, f, indent=2)
+        return all(s.ready for s in self.services)
+
+    def watch(self):
+        """Restarts services that exited or stopped answering, until stop() is called."""
+        failures = {s.name: 0 for s in self.services}
+        while not self._stopping.wait(self.check_interval):
+            for s in self.services:
+                with self._lock:
+                    if s.name in self._restarting:
+                        continue
+                if not s.alive():
+                    reason = f"exited with code {s.process.returncode}"
+                elif s.healthy():
+                    failures[s.name] = 0
+                    continue
+                else:
+                    failures[s.name] += 1
+                    if failures[s.name] < self.max_failures:
+                        continue
+                    reason = f"failed {failures[s.name]} health checks"
+                failures[s.name] = 0
+                print(f"{s.name} {reason}" + ("; restarting" if self.restart else ""))
+                if self.restart:
+                    with self._lock:
+                        self._restarting.add(s.name)
+                    threading.Thread(target=self._restart, args=(s,), name=f"restart-{s.name}", daemon=True).start()
+
+    def _restart(self, service):
+        # 1 s, 2 s, 4 s, ... between attempts while it keeps failing
+        delay = 1.0
+        try:
+            while not self._stopping.is_set():
+                service.stop()
+                service.restarts += 1
+                if service.start_and_warm_up(self._stopping):
+                    print(f"{service.name} restarted in {service.boot['total_s']:.1f} s "
+                          f"(restart #{service.restarts})")
+                    return
+                print(f"{service.name} restart failed: {service.boot.get('error')}; retrying in {delay:.0f} s")
+                if self._stopping.wait(delay):
+                    return
+                delay = min(delay * 2, MAX_BACKOFF)
+        finally:
+            with self._lock:
+                self._restarting.discard(service.name)
+
+    def stop(self, *_):
+        self._stopping.set()
+
+    def shutdown(self):
+        for s in self.services:
+            s.stop()
+
+
+def default_services():
+    return [
+        Service("rasa", ["rasa", "run", "--enable-api", "--cors", "*"], f"{RASA_API_URL}/", warm_up_rasa),
+        Service("actions", ["rasa", "run", "actions"], f"{ACTIONS_URL}/health", warm_up_actions),
+        Service("gateway", ["gunicorn", "-c", "gunicorn.conf.py", "app:app"], f"{GATEWAY_URL}/health",
+                gateway_details, log_path=os.path.join("logs", "app.log")),
+    ]
+
+
+if __name__ == "__main__":
+    services = default_services()
+    parser = argparse.ArgumentParser(description="Start, warm up and watch all services of the assistant.")
+    parser.add_argument("--services", nargs="+", choices=[s.name for s in services],
+                        default=[s.name for s in services], help="services to run (default: all)")
+    parser.add_argument("--check-interval", type=float, default=5.0, help="seconds between health checks")
+    parser.add_argument("--max-failures", type=int, default=3,
+                        help="failed health checks in a row before a service is restarted")
+    parser.add_argument("--no-restart", action="store_true", help="only report crashed services")
+    parser.add_argument("--report", default=os.path.join("logs", "boot.json"),
+                        help="path for the boot time report ('' to skip)")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    supervisor = Supervisor([s for s in services if s.name in args.services],
+                            check_interval=args.check_interval, max_failures=args.max_failures,
+                            restart=not args.no_restart)
+    signal.signal(signal.SIGINT, supervisor.stop)
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    try:
+        if supervisor.boot(args.report):
+            print(f"All services are ready. Open {GATEWAY_URL} in your browser (Ctrl+C stops everything).")
+        else:
+            print("Some services did not start; they will be retried." if not args.no_restart
+                  else "Some services did not start.")
+        supervisor.watch()
+    finally:
+        print("Stopping services...")
+        supervisor.shutdown()
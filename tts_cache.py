@@ -0,0 +1,201 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Content-addressed cache for synthesized phrases.
+# Most of Alice's replies are fixed templates from domain.yml, so the same
+# (text, voice, speed) is synthesized over and over. The cache keeps the audio
+# in an in-memory LRU and, optionally, in a directory of .npy files so it
+# survives restarts.
+
+
+def normalize_text(text):
+    """Collapse whitespace; case & punctuation are kept because they change prosody."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# Replies are cached per sentence/clause, so templated replies such as
+# "Based on your preferences, I recommend {name}. ... Shall I book it?" reuse
+# the audio of their fixed parts. Commas only split clauses that are long
+# enough to be spoken on their own (splitting "Sorry," off sounds choppy).
+SENTENCE_SPLIT   = re.compile(r"(?<=[.!?])\s+|\n+")
+CLAUSE_SPLIT     = re.compile(r"(?<=[,;:])\s+")
+MIN_CLAUSE_WORDS = 3
+
+
+def split_segments(text):
+    """Split a reply into the sentence/clause segments that are cached & synthesized."""
+    segments = []
+    for sentence in SENTENCE_SPLIT.split(text):
+        clauses = []
+        for clause in CLAUSE_SPLIT.split(sentence):
+            if clauses and (len(clauses[-1].split()) < MIN_CLAUSE_WORDS
+                            or len(clause.split()) < MIN_CLAUSE_WORDS):
+                clauses[-1] = f"{clauses[-1]} {clause}"
+            else:
+                clauses.append(clause)
+        for clause in clauses:
+            clause = normalize_text(clause)
+            if not clause:
+                continue
+            # glue pieces without any words (e.g. ":-)") to the previous segment
+            if segments and not re.search(r"\w", clause):
+                segments[-1] = f"{segments[-1]} {clause}"
+            else:
+                segments.append(clause)
+    return segments
+
+
+def cache_key(text, voice, speed):
+    raw = f"{normalize_text(text)}\x1f{voice}\x1f{speed}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AudioBundle:
+    """
+    Read-only, memory-mapped bundle of precomputed phrases (see precompute_tts.py).
+    Layout of the bundle directory:
+      audio.f32      all clips as raw float32 samples, back to back
+      manifest.json  {"entries": {cache_key: {"text", "offset", "length"}}, ...}
+    """
+
+    AUDIO_FILE    = "audio.f32"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, bundle_dir):
+        with open(os.path.join(bundle_dir, self.MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        self.entries = self.manifest.get("entries", {})
+        audio_path = os.path.join(bundle_dir, self.AUDIO_FILE)
+        # the OS shares these pages between all gunicorn workers
+        if self.entries and os.path.getsize(audio_path):
+            self.audio = np.memmap(audio_path, dtype=np.float32, mode="r")
+        else:
+            self.audio = np.zeros(0, dtype=np.float32)
+
+    @classmethod
+    def load(cls, bundle_dir):
+        """Returns the bundle or None if it hasn't been built yet."""
+        if not bundle_dir or not os.path.exists(os.path.join(bundle_dir, cls.MANIFEST_FILE)):
+            return None
+        try:
+            return cls(bundle_dir)
+        except (OSError, ValueError) as e:
+            print(f"Could not load TTS bundle from {bundle_dir}: {e}")
+            return None
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return self.audio[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TTSCache:
+    def __init__(self, max_bytes=128 * 1024 * 1024, disk_dir=None, bundle=None):
+        self.max_bytes = max_bytes
+        self.disk_dir  = disk_dir
+        self.bundle    = bundle  # optional precomputed AudioBundle, checked first
+        self._memory   = OrderedDict()  # key -> float32 array (LRU order)
+        self._bytes    = 0
+        self._lock     = threading.Lock()
+        # counters exposed via stats()
+        self.bundle_hits = 0
+        self.memory_hits = 0
+        self.disk_hits   = 0
+        self.misses      = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, text, voice, speed):
+        """Return cached audio for this phrase or None."""
+        key = cache_key(text, voice, speed)
+        if self.bundle is not None:
+            audio = self.bundle.get(key)
+            if audio is not None:
+                with self._lock:
+                    self.bundle_hits += 1
+                return audio
+
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return audio
+
+        audio = self._load_from_disk(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, text, voice, speed, audio):
+        key = cache_key(text, voice, speed)
+        audio = np.asarray(audio, dtype=np.float32)
+        with self._lock:
+            self._remember(key, audio)
+        self._save_to_disk(key, audio)
+
+    def stats(self):
+        with self._lock:
+            hits = self.bundle_hits + self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "bundle_entries": len(self.bundle) if self.bundle is not None else 0,
+                "memory_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "bundle_hits": self.bundle_hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    # --- memory tier (caller holds the lock) ---
+    def _remember(self, key, audio):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        self._memory[key] = audio
+        self._bytes += audio.nbytes
+        # evict least recently used phrases until we're under the cap
+        while self._bytes > self.max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    # --- optional disk tier ---
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.npy")
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            return np.load(self._disk_path(key))
+        except (OSError, ValueError):
+            return None
+
+    def _save_to_disk(self, key, audio):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, audio)
+            os.replace(tmp_path, path)  # atomic, so readers never see half a file
+        except OSError as e:
+            print(f"Could not write TTS cache entry: {e}")
@@ -0,0 +1,169 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+# Bounded TTS scheduler: a fixed number of model workers, each holding its own
+# Kokoro pipeline, fed from one queue.
+#
+# - backpressure: submit() waits at most `submit_timeout` for a free queue slot
+#   and then raises TTSQueueFull instead of piling up work
+# - one utterance per get(): KPipeline has no batched inference, so taking
+#   several items at once would only make them wait behind each other on one
+#   worker while another worker may already be free (no micro-batching)
+# - coalescing: identical texts that are queued or being synthesized share
+#   one Future, so a popular phrase is synthesized only once
+# - metrics: queue depth, coalesced/rejected counts (see stats())
+# - warm-up: each worker synthesizes `warmup_text` once after loading its
+#   model, so the first real request doesn't pay for the first inference;
+#   wait_ready() blocks until all workers are through
+
+
+class TTSQueueFull(Exception):
+    """Raised when the TTS queue stays full for longer than the submit timeout."""
+
+
+class TTSScheduler:
+    def __init__(self, pipeline_factory, voice, speed, num_workers=2,
+                 max_queue=64, submit_timeout=2.0, warmup_text=None):
+        self.pipeline_factory = pipeline_factory
+        self.voice          = voice
+        self.speed          = speed
+        self.num_workers    = num_workers
+        self.submit_timeout = submit_timeout
+        self.warmup_text    = warmup_text
+
+        self._queue    = queue.Queue(maxsize=max_queue)
+        self._inflight = {}  # text -> Future (queued or being synthesized)
+        self._lock     = threading.Lock()
+        self._ready    = threading.Event()  # set once every worker has loaded (and warmed) its model
+
+        # counters exposed via stats()
+        self.submitted       = 0
+        self.coalesced       = 0
+        self.rejected        = 0
+        self.completed       = 0
+        self.failed          = 0
+        self.busy_workers    = 0
+        self.max_queue_depth = 0
+        self.synth_seconds   = 0.0
+        self.ready_workers   = 0
+        self.warmup_seconds  = 0.0  # slowest worker: model load + warm-up inference
+
+        limit_torch_threads(num_workers)
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"tts-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, text):
+        """Queue `text` for synthesis; returns a Future with a float32 array (or None)."""
+        with self._lock:
+            future = self._inflight.get(text)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = Future()
+            self._inflight[text] = future
+
+        try:
+            self._queue.put((text, future), timeout=self.submit_timeout)
+        except queue.Full:
+            with self._lock:
+                self._inflight.pop(text, None)
+                self.rejected += 1
+            raise TTSQueueFull(f"TTS queue is full ({self._queue.maxsize} pending)")
+
+        with self._lock:
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future
+
+    def wait_ready(self, timeout=None):
+        """Blocks until every worker has loaded and warmed its model; False on timeout."""
+        return self._ready.wait(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.num_workers,
+                "ready_workers": self.ready_workers,
+                "warmup_seconds": self.warmup_seconds,
+                "busy_workers": self.busy_workers,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "queue_capacity": self._queue.maxsize,
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_synth_seconds": self.synth_seconds / self.completed if self.completed else 0.0,
+            }
+
+    # --- worker side ---
+    def _worker_loop(self):
+        start = time.perf_counter()
+        pipeline = self.pipeline_factory()  # each worker owns its own model instance
+        if self.warmup_text:
+            try:
+                for _ in pipeline(self.warmup_text, voice=self.voice, speed=self.speed):
+                    pass
+            except Exception as e:
+                print(f"TTS warm-up failed: {e}")
+        with self._lock:
+            self.ready_workers += 1
+            self.warmup_seconds = max(self.warmup_seconds, time.perf_counter() - start)
+            if self.ready_workers == self.num_workers:
+                self._ready.set()
+
+        while True:
+            text, future = self._queue.get()  # one at a time, see the module comment
+            with self._lock:
+                self.busy_workers += 1
+            self._synthesize(pipeline, text, future)
+            with self._lock:
+                self.busy_workers -= 1
+
+    def _synthesize(self, pipeline, text, future):
+        if not future.set_running_or_notify_cancel():
+            with self._lock:
+                self._inflight.pop(text, None)
+            return
+
+        start = time.perf_counter()
+        try:
+            chunks = [np.asarray(audio, dtype=np.float32)
+                      for _, _, audio in pipeline(text, voice=self.voice, speed=self.speed)
+                      if audio is not None and len(audio)]
+            result = np.concatenate(chunks) if chunks else None
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(text, None)
+                self.failed += 1
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._inflight.pop(text, None)
+            self.completed += 1
+            self.synth_seconds += time.perf_counter() - start
+        future.set_result(result)
+
+
+def limit_torch_threads(num_workers):
+    """
+    Split the CPU cores between the model workers, so N workers don't each
+    start one intra-op thread per core and thrash.
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+    per_worker = max(1, (os.cpu_count() or 1) // max(1, num_workers))
+    torch.set_num_threads(per_worker)